@@ -0,0 +1,283 @@
+"""Benchmark and regression check for the FinLitFun simulation core.
+
+Times turns, random events, saves, data loading and the dashboard draw
+path on synthetic players and catalogs of increasing size, with fixed
+seeds, and compares ops/sec and peak memory against a baseline file:
+
+    python game/bench/bench_core.py --update-baseline    # record this machine's baseline
+    python game/bench/bench_core.py --threshold 1.5      # exit 1 if anything is 1.5x worse
+
+Baselines are per machine; record one on the machine that runs the check.
+Without one the check cannot pass, so it exits 2 before running anything.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(BENCH_DIR, os.pardir, "src")
+sys.path.insert(0, os.path.abspath(SRC))
+
+import numpy as np
+import pygame
+
+import player as player_module
+import utils
+from catalog import Catalog, get_catalog, reload_catalog
+from loans import take_loan
+from portfolio import Portfolio
+from store import PlayerStore
+from utils import DataPath, load_json
+
+SEED = 20240601
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline_core.json")
+
+# Memory regressions smaller than this are noise, whatever the ratio.
+MEMORY_SLACK_KIB = 64
+
+
+def synthetic_catalog(scale):
+    """The real catalog with every event repeated scale times at 1/scale the probability."""
+    base = get_catalog()
+    events = [
+        {**event, "event_id": f"{event['event_id']}-{i}", "probability": event["probability"] / scale}
+        for i in range(scale) for event in base.events
+    ]
+    return Catalog(base.education, base.occupations, events, base.investments, base.assets, base.liabilities)
+
+
+def synthetic_player(holdings, seed=SEED):
+    """A working player with holdings assets and every catalog loan."""
+    catalog = get_catalog()
+    rng = random.Random(seed)
+    p = player_module.create_player(f"Bench {holdings}")
+    p["seed"] = seed
+    p["age"] = 30
+    p["skills"]["education"] = "University/College"
+    p["occupation"] = "Software Engineer"
+    p["income"] = 90000.0
+    portfolio = Portfolio.of(p)
+    for _ in range(holdings):
+        portfolio.buy_asset(rng.choice(catalog.assets), 25)
+    for liability in catalog.liabilities:
+        take_loan(p, liability, age=25)
+    return p
+
+
+class Benchmark:
+    """One timed operation. run() is called repeatedly; finish() once per timed round."""
+
+    def __init__(self, name, case, run, finish=None):
+        self.name = name
+        self.case = case
+        self.run = run
+        self.finish = finish or (lambda: None)
+
+    @property
+    def key(self):
+        return f"{self.name}[{self.case}]"
+
+
+def build_benchmarks(scales, holdings):
+    import handle
+    import phases
+    from ui import dashboard
+
+    store = player_module.get_store()
+    benchmarks = []
+
+    for scale in scales:
+        catalog = synthetic_catalog(scale)
+        table = catalog.event_table
+        for size in holdings:
+            p = synthetic_player(size)
+
+            def turn(p=p, catalog=catalog):
+                p["age"] = 30
+                handle.handle_turn(p, catalog)
+            benchmarks.append(Benchmark("handle_turn", f"events={len(table.events)},holdings={size}", turn, store.flush))
+
+        rng = np.random.default_rng(SEED)
+        p = synthetic_player(0)
+
+        def events(p=p, table=table, rng=rng):
+            p["age"] = 30
+            phases.trigger_random_events(p, table, rng)
+        benchmarks.append(Benchmark("trigger_random_events", f"events={len(table.events)}", events))
+
+    for size in holdings:
+        p = synthetic_player(size)
+        benchmarks.append(Benchmark("preview", f"years=50,holdings={size}", lambda p=p: handle.preview(p, 50)))
+
+    benchmarks.append(Benchmark("create_player", "default", lambda: player_module.create_player("Bench"), store.flush))
+    for size in holdings:
+        p = synthetic_player(size)
+
+        def save(p=p):
+            p["bank"] += 1.0
+            player_module.save_player(p)
+        benchmarks.append(Benchmark("save_player", f"holdings={size}", save, store.flush))
+
+    for path in (DataPath.EVENTS, DataPath.OCCUPATIONS):
+        benchmarks.append(Benchmark("load_json", os.path.basename(path.value), lambda path=path: load_json(path)))
+    large = _write_large_json(max(scales))
+    benchmarks.append(Benchmark("load_json", f"events x{max(scales)}", lambda: load_json(large)))
+
+    def parse(path=large):
+        utils._json_cache.pop(path.value, None)
+        load_json(path)
+    benchmarks.append(Benchmark("load_json", f"events x{max(scales)},uncached", parse))
+    get_catalog()
+    benchmarks.append(Benchmark("reload_catalog", "unchanged", reload_catalog))
+
+    win = pygame.display.set_mode((800, 600))
+    view = dashboard.get_dashboard_view(win, 800, 600, (111, 128, 145))
+    for size in holdings:
+        p = synthetic_player(size)
+
+        def draw(p=p):
+            p["age"] += 1
+            p["bank"] += 1.0
+            pygame.display.update(view.draw(p))
+        benchmarks.append(Benchmark("DashboardView.draw", f"holdings={size}", draw))
+        benchmarks.append(Benchmark(
+            "draw_dashboard_screen", f"holdings={size}",
+            lambda p=p: dashboard.draw_dashboard_screen(win, 800, 600, (111, 128, 145), p),
+        ))
+    return benchmarks
+
+
+def _write_large_json(scale):
+    path = os.path.join(tempfile.mkdtemp(prefix="finlitfun-bench-"), "events.json")
+    with open(path, "w") as file:
+        json.dump(synthetic_catalog(scale).events, file)
+    return types.SimpleNamespace(value=path)  # load_json only needs .value
+
+
+def measure(benchmark, min_time, rounds, memory_ops):
+    """Best ops/sec over rounds of at least min_time seconds, and peak KiB over memory_ops calls."""
+    benchmark.run()
+    best = 0.0
+    for _ in range(rounds):
+        ops = 0
+        start = time.perf_counter()
+        while True:
+            benchmark.run()
+            ops += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        benchmark.finish()
+        best = max(best, ops / (time.perf_counter() - start))
+
+    benchmark.finish()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    for _ in range(memory_ops):
+        benchmark.run()
+    benchmark.finish()
+    peak = tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return {"ops_per_sec": round(best, 2), "peak_kib": round(peak / 1024, 1)}
+
+
+def compare(results, baseline, threshold):
+    """Returns a message per benchmark that got more than threshold times slower or bigger."""
+    previous = {r["key"]: r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        old = previous.get(result["key"])
+        if old is None:
+            continue
+        slowdown = old["ops_per_sec"] / max(result["ops_per_sec"], 1e-9)
+        if slowdown > threshold:
+            regressions.append(f"{result['key']}: {slowdown:.2f}x slower "
+                               f"({old['ops_per_sec']:,.0f} -> {result['ops_per_sec']:,.0f} ops/s)")
+        if result["peak_kib"] > old["peak_kib"] * threshold + MEMORY_SLACK_KIB:
+            regressions.append(f"{result['key']}: peak memory {old['peak_kib']:,.0f} -> {result['peak_kib']:,.0f} KiB")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare with or update")
+    parser.add_argument("--update-baseline", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=1.5, help="fail when ops/sec or memory is this many times worse")
+    parser.add_argument("--scales", default="1,10,100", help="catalog sizes, as multiples of the real event list")
+    parser.add_argument("--holdings", default="0,10,1000", help="player portfolio sizes")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timed round")
+    parser.add_argument("--rounds", type=int, default=3, help="timed rounds per benchmark (best is kept)")
+    parser.add_argument("--memory-ops", type=int, default=50, help="calls traced for peak memory")
+    parser.add_argument("--only", help="run only benchmarks whose name contains this")
+    args = parser.parse_args(argv)
+    baseline_path = args.baseline
+    if not args.update_baseline and not os.path.exists(baseline_path):
+        print(f"No baseline at {baseline_path}; run with --update-baseline to record one")
+        return 2
+
+    pygame.display.init()
+    pygame.font.init()
+    tmp = tempfile.mkdtemp(prefix="finlitfun-bench-")
+    player_module._store = PlayerStore(os.path.join(tmp, "players.db"))  # never touch the real saves
+
+    results = []
+    try:
+        with open(os.devnull, "w") as devnull:
+            for benchmark in build_benchmarks(_ints(args.scales), _ints(args.holdings)):
+                if args.only and args.only not in benchmark.name:
+                    continue
+                with contextlib.redirect_stdout(devnull):
+                    result = {"key": benchmark.key, "name": benchmark.name, "case": benchmark.case,
+                              **measure(benchmark, args.min_time, args.rounds, args.memory_ops)}
+                results.append(result)
+                print(f"{benchmark.name:24} {benchmark.case:28} {result['ops_per_sec']:>12,.0f} ops/s  "
+                      f"peak {result['peak_kib']:>10,.1f} KiB")
+    finally:
+        player_module._store.close()
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "seed": SEED,
+            "timestamp": time.time(),
+        },
+        "results": results,
+    }
+
+    if args.update_baseline:
+        with open(baseline_path, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Wrote baseline {baseline_path}")
+        return 0
+
+    with open(baseline_path) as file:
+        regressions = compare(results, json.load(file), args.threshold)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    print(f"{len(regressions)} regressions past {args.threshold}x")
+    return 1 if regressions else 0
+
+
+def _ints(text):
+    return [int(part) for part in text.split(",") if part]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""Load test for the FinLitFun game server, on localhost only.
+
+Starts server.py on a free port with a throwaway database, then plays
+many concurrent sessions against it (create, every decision, turns to the
+target age) and reports request latency percentiles, throughput and how
+the server batched turns:
+
+    python game/bench/bench_server.py --sessions 300 --end-age 40
+    python game/bench/bench_server.py --batch-window-ms 0     # one turn at a time
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVER = os.path.join(BENCH_DIR, os.pardir, "src", "server.py")
+HOST = "127.0.0.1"
+
+
+class Session:
+    """One simulated player on its own connection."""
+
+    def __init__(self, reader, writer, latencies, think):
+        self.reader = reader
+        self.writer = writer
+        self.latencies = latencies
+        self.think = think
+        self.next_id = 0
+
+    async def call(self, op, **args):
+        if self.think:
+            await asyncio.sleep(self.think * random.uniform(0.5, 1.5))
+        self.next_id += 1
+        start = time.perf_counter()
+        self.writer.write(json.dumps({"id": self.next_id, "op": op, **args}).encode() + b"\n")
+        await self.writer.drain()
+        response = json.loads(await self.reader.readline())
+        self.latencies.setdefault(op, []).append(time.perf_counter() - start)
+        if not response["ok"]:
+            raise RuntimeError(f"{op} failed: {response['error']}")
+        return response["result"]
+
+    async def play(self, name, end_age, years):
+        state = await self.call("create", name=name)
+        player_id = state["player"]["player_id"]
+        while state["player"]["age"] < end_age:
+            decision = state["decision"]
+            if decision is not None:
+                state = await self.call("decide", player_id=player_id,
+                                        option=decision["options"][self.next_id % len(decision["options"])])
+            else:
+                state = await self.call("turn", player_id=player_id, years=years)
+        await self.call("close", player_id=player_id)
+
+
+async def run_load(port, sessions, end_age, years, think):
+    latencies = {}
+    connections = [await asyncio.open_connection(HOST, port, limit=1 << 20) for _ in range(sessions)]
+    start = time.perf_counter()
+    await asyncio.gather(*(Session(reader, writer, latencies, think).play(f"Load {i}", end_age, years)
+                           for i, (reader, writer) in enumerate(connections)))
+    elapsed = time.perf_counter() - start
+    stats = await Session(*connections[0], {}, 0).call("stats")
+    for _, writer in connections:
+        writer.close()
+    return latencies, elapsed, stats
+
+
+def start_server(db, batch_window_ms):
+    server = subprocess.Popen([sys.executable, SERVER, "--host", HOST, "--port", "0", "--db", db,
+                               "--batch-window-ms", str(batch_window_ms)],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    line = server.stderr.readline()
+    if "server on" not in line:
+        server.kill()
+        raise RuntimeError(f"Server did not start: {line}{server.stderr.read()}")
+    return server, int(line.rsplit(":", 1)[1])
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=300, help="concurrent sessions, one connection each")
+    parser.add_argument("--end-age", type=int, default=40, help="age each session plays to")
+    parser.add_argument("--years", type=int, default=1, help="turns per turn request")
+    parser.add_argument("--think-ms", type=float, default=0.0,
+                        help="mean pause before each request, like a player reading the screen (0: flat out)")
+    parser.add_argument("--batch-window-ms", type=float, default=2.0, help="server turn batching window (0: off)")
+    args = parser.parse_args(argv)
+    random.seed(0)
+
+    db = os.path.join(tempfile.mkdtemp(prefix="finlitfun-server-"), "players.db")
+    server, port = start_server(db, args.batch_window_ms)
+    try:
+        latencies, elapsed, stats = asyncio.run(run_load(port, args.sessions, args.end_age, args.years, args.think_ms / 1000))
+    finally:
+        server.terminate()
+        server.wait()
+
+    total = sum(len(v) for v in latencies.values())
+    print(f"{args.sessions} sessions, {total:,} requests in {elapsed:.2f} s ({total / elapsed:,.0f} req/s)")
+    print(f"batch window {stats['window_ms']:g} ms: {stats['batches']:,} batches, mean {stats['mean_batch']} turns, "
+          f"largest {stats['largest_batch']}, mean wait {stats['mean_wait_ms']} ms")
+    for op, values in sorted(latencies.items()):
+        print(f"{op:8} {len(values):>8,}  p50 {percentile(values, 0.5) * 1000:7.2f} ms  "
+              f"p95 {percentile(values, 0.95) * 1000:7.2f} ms  p99 {percentile(values, 0.99) * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Headless rendering benchmark for the FinLitFun UI.
+
+Runs the draw functions under SDL's dummy video driver, so it needs no
+display or GPU, and reports per-function frame times and surface
+allocations:
+
+    python game/bench/render_bench.py --frames 300 --out render_bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src")
+sys.path.insert(0, os.path.abspath(SRC))
+
+import numpy as np
+import pygame
+
+
+class AllocationCounter:
+    """Counts surfaces created through pygame while installed.
+
+    Covers Surface construction and copy, Font.render, image loads and the
+    transform functions the UI uses. Fonts opened before install() are not
+    wrapped, so the shared font registry is cleared on install.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._saved = []
+
+    def install(self):
+        counter = self
+
+        class CountingSurface(pygame.Surface):
+            def __init__(self, *args, **kwargs):
+                counter.count += 1
+                super().__init__(*args, **kwargs)
+
+            def copy(self):
+                counter.count += 1
+                return super().copy()
+
+        class CountingFont(pygame.font.Font):
+            def render(self, *args, **kwargs):
+                counter.count += 1
+                return super().render(*args, **kwargs)
+
+        def counting(func):
+            def wrapper(*args, **kwargs):
+                counter.count += 1
+                return func(*args, **kwargs)
+            return wrapper
+
+        self._patch(pygame, "Surface", CountingSurface)
+        self._patch(pygame.font, "Font", CountingFont)
+        self._patch(pygame.image, "load", counting(pygame.image.load))
+        for name in ("scale", "smoothscale"):
+            self._patch(pygame.transform, name, counting(getattr(pygame.transform, name)))
+
+        from ui import text
+        text._fonts.clear()
+        text.text_cache().clear()
+
+    def uninstall(self):
+        while self._saved:
+            module, name, value = self._saved.pop()
+            setattr(module, name, value)
+
+    def _patch(self, module, name, value):
+        self._saved.append((module, name, getattr(module, name)))
+        setattr(module, name, value)
+
+
+def synthetic_player(size):
+    """Builds a player whose displayed values get longer with size."""
+    from model import Player
+
+    return Player.from_dict({
+        "player_id": f"bench-{size}",
+        "name": "Bench " * size,
+        "age": 16 + size,
+        "health": 90,
+        "happiness": 50,
+        "bank": 200.0 * 10 ** size,
+        "income": 1000.0 * size,
+        "skills": {"education": "University/College", "work_experience": size},
+        "occupation": "Human Resources Specialist" if size > 2 else "Barista",
+        "assets": [{"id": f"Asset {i}", "current_value": 1000.0 * i, "rate": 0.03, "volatility": 0.01} for i in range(10 * size)],
+        "liabilities": [],
+        "status_effects": [],
+        "game_progress": {},
+    })
+
+
+def build_cases():
+    import main
+    from ui import dashboard, guide
+
+    win = main.WIN or main.init_display()
+    width, height, bg = main.WIDTH, main.HEIGHT, main.BG_BLUE
+    logo = main.load_logo()
+    cases = [
+        ("draw_title_screen", "default", lambda: main.draw_title_screen(logo)),
+        ("draw_guide_screen", "default", lambda: guide.draw_guide_screen(win, width, height, bg)),
+        ("draw_phases_screen", "default", lambda: guide.draw_phases_screen(win, width, height, bg)),
+        ("draw_status_screen", "default", lambda: guide.draw_status_screen(win, width, height, bg)),
+    ]
+
+    for size in (1, 3, 5):
+        player = synthetic_player(size)
+        cases.append((
+            "draw_dashboard_screen", f"player_size={size}",
+            lambda player=player: dashboard.draw_dashboard_screen(win, width, height, bg, player),
+        ))
+
+        def changing_turn(player=player):
+            player["age"] += 1
+            player["bank"] += 1.0
+            player["history"].record(player)
+            pygame.display.update(dashboard.get_dashboard_view(win, width, height, bg).draw(player))
+        cases.append(("DashboardView.draw", f"player_size={size}", changing_turn))
+
+    from catalog import get_catalog
+    options = [o for group in get_catalog().occupations for o in group["occupations"]]
+    for count in (3, 6, 10):
+        cases.append((
+            "draw_prompt_menu", f"options={count}",
+            lambda count=count: dashboard.draw_prompt_menu(win, width, height, 20, "Choose your career path:", options[:count], None),
+        ))
+    return cases
+
+
+def measure(func, frames, warmup, counter):
+    start = time.perf_counter()
+    func()
+    first_ms = (time.perf_counter() - start) * 1000
+    for _ in range(warmup):
+        func()
+
+    samples = np.empty(frames)
+    counter.count = 0
+    for i in range(frames):
+        start = time.perf_counter()
+        func()
+        samples[i] = time.perf_counter() - start
+    samples *= 1000
+
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {
+        "frames": frames,
+        "first_ms": round(first_ms, 4),
+        "mean_ms": round(float(samples.mean()), 4),
+        "p50_ms": round(float(p50), 4),
+        "p95_ms": round(float(p95), 4),
+        "p99_ms": round(float(p99), 4),
+        "allocations_per_frame": counter.count / frames,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=200, help="measured frames per case")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured frames before measuring")
+    parser.add_argument("--only", help="run only cases whose function name contains this")
+    parser.add_argument("--out", default="render_bench.json", help="JSON results file ('-' for stdout only)")
+    args = parser.parse_args(argv)
+    out = args.out if args.out == "-" else args.out
+
+    counter = AllocationCounter()
+    counter.install()
+    try:
+        results = []
+        for name, case, func in build_cases():
+            if args.only and args.only not in name:
+                continue
+            result = {"name": name, "case": case, **measure(func, args.frames, args.warmup, counter)}
+            results.append(result)
+            print(f"{name:24} {case:16} p50 {result['p50_ms']:8.3f} ms  p95 {result['p95_ms']:8.3f} ms  "
+                  f"p99 {result['p99_ms']:8.3f} ms  allocs/frame {result['allocations_per_frame']:.1f}")
+    finally:
+        counter.uninstall()
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "sdl": ".".join(map(str, pygame.get_sdl_version())),
+            "video_driver": pygame.display.get_driver(),
+            "machine": platform.machine(),
+            "timestamp": time.time(),
+        },
+        "results": results,
+    }
+    if out != "-":
+        with open(out, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Wrote {out}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
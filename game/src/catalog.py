@@ -0,0 +1,186 @@
+from numbers import Real
+from utils import load_json, DataPath
+from event_table import EventTable
+import datapack
+
+
+# Catalog fields and the data files they are loaded from.
+FILES = {
+    "education": DataPath.EDUCATION,
+    "occupations": DataPath.OCCUPATIONS,
+    "events": DataPath.EVENTS,
+    "investments": DataPath.INVESTMENTS,
+    "assets": DataPath.ASSETS,
+    "liabilities": DataPath.LIABILITIES,
+}
+
+
+class CatalogError(Exception):
+    """Raised when a game data file is missing or malformed."""
+
+
+class Catalog:
+    """All game data, validated once and indexed for constant-time lookups."""
+
+    def __init__(self, education, occupations, events, investments, assets, liabilities, tables=None):
+        _check_list(DataPath.EDUCATION, education, {"id": str, "Cost": Real})
+        _check_list(DataPath.OCCUPATIONS, occupations, {"id": str, "occupations": list})
+        for group in occupations:
+            _check_list(DataPath.OCCUPATIONS, group["occupations"], {"id": str, "Income": dict})
+            for occ in group["occupations"]:
+                _check_fields(DataPath.OCCUPATIONS, occ["Income"], {"Starting": Real, "Increase_Rate": Real, "Cap": Real}, occ["id"])
+        _check_list(DataPath.EVENTS, events, {"event_id": str, "impact": dict, "probability": Real, "age_range": list}, key="event_id")
+        for event in events:
+            _check_event(event)
+        _check_list(DataPath.INVESTMENTS, investments, {"id": str, "cost": Real, "time": Real})
+        _check_list(DataPath.ASSETS, assets, {"id": str, "initial_value": Real, "rate": Real, "volatility": Real})
+        _check_list(DataPath.LIABILITIES, liabilities, {"id": str, "initial_balance": Real, "interest_rate": Real, "monthly_payment": Real})
+
+        self.education = education
+        self.occupations = occupations
+        self.events = events
+        self.investments = investments
+        self.assets = assets
+        self.liabilities = liabilities
+
+        self._education = {e["id"]: e for e in education}
+        self._occupation_groups = {g["id"]: g["occupations"] for g in occupations}
+        self._occupations = {
+            (g["id"], occ["id"]): occ for g in occupations for occ in g["occupations"]
+        }
+        self._investments = {i["id"]: i for i in investments}
+        self._assets = {a["id"]: a for a in assets}
+        self._liabilities = {l["id"]: l for l in liabilities}
+
+        # Numeric columns per file, one row per entry (see datapack.TABLES); mapped from the pack when loaded from it.
+        self.tables = tables if tables is not None else datapack.build_tables(
+            {"education": education, "occupations": occupations, "events": events,
+             "investments": investments, "assets": assets, "liabilities": liabilities})
+
+        self.event_table = EventTable(events, self.tables["events"])
+
+    @classmethod
+    def load(cls, content=None):
+        """Load and validate every game data file, or the result of load_files() if given."""
+        content = load_files() if content is None else content
+        for name, path in FILES.items():
+            if content[name] is None:
+                raise CatalogError(f"{path.value}: could not be loaded")
+        pack = datapack.get_pack()
+        return cls(**content, tables=pack.tables if pack is not None else None)
+
+    def education_path(self, education_id):
+        return self._education.get(education_id)
+
+    def occupation(self, education_id, occupation_id):
+        """Return the occupation entry for an education path, or None."""
+        return self._occupations.get((education_id, occupation_id))
+
+    def occupations_for(self, education_id):
+        """Return the occupations open to an education path."""
+        return self._occupation_groups.get(education_id, [])
+
+    def events_for_age(self, age):
+        """Return the events whose age range covers age, in file order."""
+        return self.event_table.events_for_age(age)
+
+    def investment(self, investment_id):
+        return self._investments.get(investment_id)
+
+    def investment_payout(self, investment):
+        """Total paid back at maturity: a fixed "return", or the cost plus "profit" percent."""
+        if "return" in investment:
+            return investment["return"]
+        return investment["cost"] * (1 + investment.get("profit", 0) / 100)
+
+    def asset(self, asset_id):
+        return self._assets.get(asset_id)
+
+    def liability(self, liability_id):
+        return self._liabilities.get(liability_id)
+
+
+def load_files():
+    """Every catalog file through the cached loader, by field; None for a file that failed to load."""
+    return {name: load_json(path) for name, path in FILES.items()}
+
+
+_catalog = None
+_listeners = []
+_rejected = None
+
+
+def get_catalog():
+    """Return the process-wide catalog, loading it on first use."""
+    global _catalog
+    if _catalog is None:
+        _catalog = Catalog.load()
+    return _catalog
+
+
+def on_reload(listener):
+    """Calls listener(catalog) with the new catalog each time reload_catalog replaces it."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def reload_catalog():
+    """Replaces the process-wide catalog if a data file changed since it was loaded.
+
+    Costs a stat call per file when nothing changed. Returns the new catalog,
+    or None if nothing changed or the changed files are invalid; an invalid
+    edit is reported once and the current catalog is kept, so a half-saved
+    file does not stop a running game.
+    """
+    global _catalog, _rejected
+    if _catalog is None:
+        return None
+    content = load_files()
+    if all(content[name] is getattr(_catalog, name) for name in FILES):
+        return None
+    attempt = tuple(id(value) for value in content.values())
+    if attempt == _rejected:
+        return None
+    try:
+        catalog = Catalog.load(content)
+    except CatalogError as e:
+        _rejected = attempt
+        print(f"Game data not reloaded: {e}")
+        return None
+    _catalog = catalog
+    for listener in list(_listeners):
+        listener(catalog)
+    return catalog
+
+
+def _check_list(path, entries, fields, key="id"):
+    if not isinstance(entries, list):
+        raise CatalogError(f"{path.value}: expected a list of entries")
+    seen = set()
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise CatalogError(f"{path.value}: entry {i} is not an object")
+        _check_fields(path, entry, fields, entry.get(key, f"#{i}"))
+        if entry[key] in seen:
+            raise CatalogError(f"{path.value}: duplicate {key} {entry[key]!r}")
+        seen.add(entry[key])
+
+
+def _check_fields(path, entry, fields, name):
+    for field, kind in fields.items():
+        if field not in entry:
+            raise CatalogError(f"{path.value}: {name!r} is missing {field!r}")
+        if not isinstance(entry[field], kind) or isinstance(entry[field], bool):
+            raise CatalogError(f"{path.value}: {name!r} has invalid {field!r}: {entry[field]!r}")
+
+
+def _check_event(event):
+    name = event["event_id"]
+    age_range = event["age_range"]
+    if len(age_range) != 2 or not all(isinstance(a, int) for a in age_range) or age_range[0] > age_range[1]:
+        raise CatalogError(f"{DataPath.EVENTS.value}: {name!r} has invalid 'age_range': {age_range!r}")
+    if not 0 <= event["probability"] <= 1:
+        raise CatalogError(f"{DataPath.EVENTS.value}: {name!r} has probability outside [0, 1]")
+    for key, value in event["impact"].items():
+        if not isinstance(value, Real):
+            raise CatalogError(f"{DataPath.EVENTS.value}: {name!r} has non-numeric impact on {key!r}")
@@ -0,0 +1,70 @@
+import json
+import socket
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7421
+
+
+class ServerError(Exception):
+    """Raised when the game server answers a request with an error."""
+
+
+class GameClient:
+    """Blocking client for server.py's JSON-lines protocol.
+
+    Needs nothing but the standard library, so the pygame UI or a script
+    can drive games hosted elsewhere. One request is in flight at a time.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=10.0):
+        self._socket = socket.create_connection((host, port), timeout=timeout)
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._file = self._socket.makefile("rwb")
+        self._next_id = 0
+
+    def call(self, op, **args):
+        """Sends one request and returns its result; raises ServerError if it failed."""
+        self._next_id += 1
+        self._file.write(json.dumps({"id": self._next_id, "op": op, **args}, separators=(",", ":")).encode() + b"\n")
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Server closed the connection")
+        response = json.loads(line)
+        if not response["ok"]:
+            raise ServerError(response["error"])
+        return response["result"]
+
+    def create(self, name):
+        return self.call("create", name=name)
+
+    def load(self, player_id):
+        return self.call("load", player_id=player_id)
+
+    def list_players(self, limit=50, offset=0):
+        return self.call("list", limit=limit, offset=offset)
+
+    def state(self, player_id):
+        return self.call("state", player_id=player_id)
+
+    def decide(self, player_id, option):
+        return self.call("decide", player_id=player_id, option=option)
+
+    def turn(self, player_id, years=1):
+        return self.call("turn", player_id=player_id, years=years)
+
+    def preview(self, player_id, years):
+        return self.call("preview", player_id=player_id, years=years)
+
+    def close_session(self, player_id):
+        return self.call("close", player_id=player_id)
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
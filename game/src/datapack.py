@@ -0,0 +1,216 @@
+"""Compile game/data into one memory-mapped pack, and read it back.
+
+    python datapack.py            # writes game/data/catalog.pack
+
+The pack holds every catalog JSON file as a marshal stream with its
+strings interned (so each distinct key or id is stored and loaded once),
+plus fixed-layout numeric tables (one row per entry, in file order) that
+are used straight from the mapping. Every process maps the same file, so
+the OS shares its pages between game, workers and cold starts instead of
+each parsing the JSON.
+
+load_json uses the pack when it exists, was built by this pack version
+and Python version, and is newer than every JSON file it was built from;
+otherwise it reads the JSON, so editing game data during development
+needs no rebuild.
+"""
+import json
+import marshal
+import mmap
+import os
+import struct
+import sys
+
+import numpy as np
+
+from utils import DataPath
+
+MAGIC = b"FLPK"
+VERSION = 1
+
+# Catalog files stored in the pack, by DataPath member.
+DOCUMENTS = ("EDUCATION", "OCCUPATIONS", "EVENTS", "INVESTMENTS", "ASSETS", "LIABILITIES")
+
+# Event impacts with a column in the events table.
+IMPACT_KEYS = ("bank", "income", "health", "happiness")
+
+TABLES = {
+    "education": np.dtype([("cost", "<f8"), ("years", "<f8")]),
+    "occupations": np.dtype([("group", "<i4"), ("index", "<i4"), ("starting", "<f8"),
+                             ("increase_rate", "<f8"), ("cap", "<f8")]),
+    "events": np.dtype([("low", "<i8"), ("high", "<i8"), ("probability", "<f8")]
+                       + [(key, "<f8") for key in IMPACT_KEYS]),
+    "investments": np.dtype([("cost", "<f8"), ("time", "<f8"), ("payout", "<f8")]),
+    "assets": np.dtype([("initial_value", "<f8"), ("rate", "<f8"), ("volatility", "<f8")]),
+    "liabilities": np.dtype([("initial_balance", "<f8"), ("interest_rate", "<f8"), ("monthly_payment", "<f8")]),
+}
+
+_HEADER = struct.Struct("<4sIIBBxxI")  # magic, version, marshal version, python major, minor, sections
+_SECTION = struct.Struct("<24sQQ")  # name, offset, size
+
+
+class PackError(Exception):
+    """Raised when a pack file is not a valid pack of this version."""
+
+
+def build_tables(content):
+    """The numeric tables for catalog content (lists keyed like Catalog's arguments)."""
+    tables = {}
+    tables["education"] = _table("education", [
+        (e["Cost"], e.get("Duration (Years)", 0)) for e in content["education"]])
+    tables["occupations"] = _table("occupations", [
+        (g, i, occ["Income"]["Starting"], occ["Income"]["Increase_Rate"], occ["Income"]["Cap"])
+        for g, group in enumerate(content["occupations"]) for i, occ in enumerate(group["occupations"])])
+    tables["events"] = _table("events", [
+        (e["age_range"][0], e["age_range"][1], e["probability"], *(e["impact"].get(key, 0) for key in IMPACT_KEYS))
+        for e in content["events"]])
+    tables["investments"] = _table("investments", [
+        (i["cost"], i["time"], i["return"] if "return" in i else i["cost"] * (1 + i.get("profit", 0) / 100))
+        for i in content["investments"]])
+    tables["assets"] = _table("assets", [
+        (a["initial_value"], a["rate"], a["volatility"]) for a in content["assets"]])
+    tables["liabilities"] = _table("liabilities", [
+        (l["initial_balance"], l["interest_rate"], l["monthly_payment"]) for l in content["liabilities"]])
+    return tables
+
+
+def _table(name, rows):
+    return np.array(rows, dtype=TABLES[name]) if rows else np.zeros(0, TABLES[name])
+
+
+class Pack:
+    """A read-only view of a pack file. Tables are NumPy arrays over the mapping itself."""
+
+    def __init__(self, path):
+        self.path = path
+        self.built = os.path.getmtime(path)
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        data = memoryview(self._map)
+        try:
+            magic, version, marshal_version, major, minor, count = _HEADER.unpack_from(data)
+        except struct.error:
+            raise PackError(f"{path}: truncated header") from None
+        if magic != MAGIC:
+            raise PackError(f"{path}: not a data pack")
+        if version != VERSION:
+            raise PackError(f"{path}: pack version {version}, expected {VERSION}")
+        if (marshal_version, major, minor) != (marshal.version, *sys.version_info[:2]):
+            raise PackError(f"{path}: built by Python {major}.{minor}; rebuild it with this Python")
+        self._sections = {}
+        for i in range(count):
+            name, offset, size = _SECTION.unpack_from(data, _HEADER.size + i * _SECTION.size)
+            if offset + size > len(data):
+                raise PackError(f"{path}: section {name!r} runs past the end of the file")
+            self._sections[name.rstrip(b"\0").decode()] = data[offset:offset + size]
+
+        self.tables = {}
+        for name, dtype in TABLES.items():
+            section = self._section(f"table.{name}")
+            self.tables[name] = np.frombuffer(section, dtype, len(section) // dtype.itemsize)
+
+    def _section(self, name):
+        if name not in self._sections:
+            raise PackError(f"{self.path}: missing section {name!r}")
+        return self._sections[name]
+
+    def document(self, name):
+        """The JSON content of a DataPath member's file, e.g. "EVENTS", decoded afresh on each call."""
+        return marshal.loads(self._section(f"doc.{name}"))
+
+
+def write_pack(path, content):
+    """Writes a pack for content, a dict of DataPath member name to decoded JSON."""
+    sections = [(f"doc.{name}", marshal.dumps(_intern(content[name]))) for name in DOCUMENTS]
+    tables = build_tables({name.lower(): content[name] for name in DOCUMENTS})
+    sections += [(f"table.{name}", table.tobytes()) for name, table in tables.items()]
+
+    offset = _align(_HEADER.size + len(sections) * _SECTION.size)
+    index, body = [], []
+    for name, data in sections:
+        index.append(_SECTION.pack(name.encode(), offset, len(data)))
+        padded = data + b"\0" * (_align(len(data)) - len(data))
+        body.append(padded)
+        offset += len(padded)
+    head = _HEADER.pack(MAGIC, VERSION, marshal.version, *sys.version_info[:2], len(sections)) + b"".join(index)
+    head += b"\0" * (_align(len(head)) - len(head))
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as file:
+        file.write(head)
+        file.writelines(body)
+    os.replace(tmp, path)
+    return path
+
+
+def _align(n):
+    return (n + 7) & ~7
+
+
+def _intern(value):
+    # Interned strings are written once and referenced after, and are interned again on load.
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return [_intern(item) for item in value]
+    if isinstance(value, dict):
+        return {sys.intern(key): _intern(item) for key, item in value.items()}
+    return value
+
+
+def is_fresh(path):
+    """True if the pack at path exists and is newer than every JSON file it packs."""
+    try:
+        built = os.path.getmtime(path)
+    except OSError:
+        return False
+    return all(not os.path.exists(DataPath[name].value) or os.path.getmtime(DataPath[name].value) <= built
+               for name in DOCUMENTS)
+
+
+_pack = None
+_failed = None  # mtime of a pack that could not be opened, so it is reported once
+
+
+def get_pack():
+    """The process-wide pack, or None when it is missing, stale or unreadable (use the JSON).
+
+    Costs a stat call per packed file, so a pack rebuilt or made stale while
+    the game runs is picked up or dropped on the next call.
+    """
+    global _pack, _failed
+    path = DataPath.PACK.value
+    if not is_fresh(path):
+        return None
+    built = os.path.getmtime(path)
+    if _pack is None or _pack.built != built:
+        _pack = None
+        if _failed == built:
+            return None
+        try:
+            _pack = Pack(path)
+        except PackError as e:
+            _failed = built
+            print(f"Ignoring data pack: {e}")
+    return _pack
+
+
+def build(path=None):
+    """Compiles the catalog JSON files into a pack at path (DataPath.PACK by default)."""
+    content = {}
+    for name in DOCUMENTS:
+        with open(DataPath[name].value) as file:
+            content[name] = json.load(file)
+    from catalog import Catalog
+    Catalog(**{name.lower(): value for name, value in content.items()})  # refuse to pack invalid data
+    return write_pack(path or DataPath.PACK.value, content)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile game/data into a memory-mapped data pack.")
+    parser.add_argument("--out", help="pack to write (default: game/data/catalog.pack)")
+    args = parser.parse_args()
+    path = build(args.out and os.path.abspath(args.out))
+    print(f"Wrote {path} ({os.path.getsize(path):,} bytes)")
@@ -0,0 +1,86 @@
+import numpy as np
+
+
+class EventTable:
+    """Per-age cumulative outcome table for the first-match random event rule.
+
+    Events are tried in file order and the first one whose roll succeeds fires,
+    so event i fires with probability p_i * prod(1 - p_j) over the earlier
+    eligible events j. Storing the running sum of those probabilities per age
+    lets one uniform draw pick the outcome with a binary search.
+    """
+
+    def __init__(self, events, columns=None):
+        """columns, if given, is the catalog's events table (datapack.TABLES["events"]) for events."""
+        self.events = tuple(events)
+        if columns is None:
+            low = np.array([e["age_range"][0] for e in self.events], dtype=np.int64)
+            high = np.array([e["age_range"][1] for e in self.events], dtype=np.int64)
+            probability = np.array([e["probability"] for e in self.events], dtype=np.float64)
+        else:
+            low, high, probability = columns["low"], columns["high"], columns["probability"]
+        self.min_age = int(low.min()) if len(low) else 0
+        self.max_age = int(high.max()) if len(high) else -1
+
+        self._indices = []
+        self._cumulative = []
+        for age in range(self.min_age, self.max_age + 1):
+            indices = np.flatnonzero((low <= age) & (age <= high))
+            self._indices.append(indices)
+            self._cumulative.append(1.0 - np.cumprod(1.0 - probability[indices]))
+
+        self._impacts = {}
+
+    def events_for_age(self, age):
+        """Return the events whose age range covers age, in file order."""
+        if self.min_age <= age <= self.max_age:
+            return tuple(self.events[i] for i in self._indices[age - self.min_age])
+        return ()
+
+    def probabilities(self, age):
+        """Return (event indices, chance each one is the event that fires) at age."""
+        if not self.min_age <= age <= self.max_age:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        row = age - self.min_age
+        return self._indices[row], np.diff(self._cumulative[row], prepend=0.0)
+
+    def sample(self, age, u):
+        """Return the event that fires at age for the uniform draw u, or None."""
+        if not self.min_age <= age <= self.max_age:
+            return None
+        row = age - self.min_age
+        k = int(np.searchsorted(self._cumulative[row], u, side="right"))
+        if k == len(self._indices[row]):
+            return None
+        return self.events[self._indices[row][k]]
+
+    def sample_many(self, ages, u):
+        """Vectorized sample: event index per player, or -1 where nothing fires."""
+        ages = np.asarray(ages)
+        fired = np.full(ages.shape, -1, dtype=np.int64)
+        in_range = (ages >= self.min_age) & (ages <= self.max_age)
+        for age in np.unique(ages[in_range]):
+            row = age - self.min_age
+            mask = ages == age
+            k = np.searchsorted(self._cumulative[row], u[mask], side="right")
+            hit = k < len(self._indices[row])
+            picked = np.full(k.shape, -1, dtype=np.int64)
+            picked[hit] = self._indices[row][k[hit]]
+            fired[mask] = picked
+        return fired
+
+    def impact_matrix(self, keys):
+        """Return an (events + 1, keys) matrix of impacts; row -1 is all zeros.
+
+        Indexing it with the output of sample_many gives every player's impact.
+        """
+        keys = tuple(keys)
+        if keys not in self._impacts:
+            matrix = np.zeros((len(self.events) + 1, len(keys)))
+            for i, event in enumerate(self.events):
+                for key, value in event["impact"].items():
+                    if key not in keys:
+                        raise ValueError(f"Event {event['event_id']} impacts unsupported field {key!r}")
+                    matrix[i, keys.index(key)] = value
+            self._impacts[keys] = matrix
+        return self._impacts[keys]
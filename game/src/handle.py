@@ -1,32 +1,35 @@
-import random
-from player import save_player
+import copy
+import numpy as np
+from player import save_player, get_store
 from phases import trigger_random_events
+from catalog import get_catalog
+from rng import player_streams
+from portfolio import Portfolio
+from loans import debt_service, debt_service_years
+from profiling import get_profiler, timed
+from simulation import STATS, income_path, raise_income
 
 
-def handle_turn(player, events, occupations):
+@timed("turn")
+def handle_turn(player, catalog=None):
     """Handles the logic for each turn (year) in the game."""
+    catalog = get_catalog() if catalog is None else catalog
     player["age"] += 1
 
-    
-    # TODO - Fix this putrid code || Agreed!
-    i = 0
-    while i < 4:
-        if player["skills"]["education"] == occupations[i]["id"]:
-            possible_occupations = occupations[i]["occupations"]
-            i = 0
-            while i < len(possible_occupations):
-                if possible_occupations[i]["id"] == player["occupation"]:
-                    player["income"] += player["income"] * possible_occupations[i]["Income"]["Increase_Rate"]
-                    break
-                i += 1
-            break
-        i += 1
+    occupation = catalog.occupation(player["skills"]["education"], player["occupation"])
+    if occupation is not None:
+        income = player["income"]
+        player["income"] = float(min(income + income * occupation["Income"]["Increase_Rate"],
+                                     max(occupation["Income"]["Cap"], income)))
     player["bank"] += player["income"]
+    player["bank"] -= debt_service(player)
 
-    for asset in player["assets"]:
-        asset["current_value"] += asset["current_value"] * (asset["rate"] + (asset["volatility"] * random.uniform(-1.0, 1.0)))
+    streams = player_streams(player)
+    player["bank"] += Portfolio.of(player).step(player["age"], streams.market)
 
-    player = trigger_random_events(player, events)
+    player = trigger_random_events(player, catalog.event_table, streams.events)
+    player["history"].record(player)
+    get_profiler().count("turns")
     
     # if player["age"] < 23:
     #     player = early_life_phase(player)
@@ -37,4 +40,149 @@ def handle_turn(player, events, occupations):
     
     save_player(player)
     
-    return player
\ No newline at end of file
+    return player
+
+
+@timed("turn.batch")
+def handle_turns(players, catalog=None):
+    """handle_turn for many players at once, with exactly the same results.
+
+    Income growth, asset updates and event sampling run as array operations
+    over every player. Each player still draws from their own streams for
+    the year, so nobody's turn depends on who else is in the batch. The
+    players must be distinct; they are saved together. Everything is worked
+    out before any player is changed, so if this raises, nobody has moved.
+    """
+    catalog = get_catalog() if catalog is None else catalog
+    n = len(players)
+    if n == 0:
+        return players
+
+    age = np.fromiter((p["age"] for p in players), np.int64, n) + 1
+    income = np.fromiter((p["income"] for p in players), np.float64, n)
+    bank = np.fromiter((p["bank"] for p in players), np.float64, n)
+    rate = np.zeros(n)
+    cap = np.full(n, np.inf)
+    for i, p in enumerate(players):
+        occupation = catalog.occupation(p["skills"]["education"], p["occupation"])
+        if occupation is not None:
+            rate[i] = occupation["Income"]["Increase_Rate"]
+            cap[i] = occupation["Income"]["Cap"]
+    income = raise_income(income, rate, cap)
+    bank += income
+    bank -= np.fromiter((debt_service(p, year) for p, year in zip(players, age.tolist())), np.float64, n)
+
+    streams = [player_streams(p, year) for p, year in zip(players, age.tolist())]
+    portfolios = [Portfolio.of(p) for p in players]
+    values, cash = _step_portfolios(portfolios, age, streams)
+    bank += cash
+
+    table = catalog.event_table
+    fired = table.sample_many(age, np.fromiter((s.events.random() for s in streams), np.float64, n))
+    impact = table.impact_matrix(STATS)[fired]
+    columns = {"bank": bank, "income": income,
+               "health": np.fromiter((p["health"] for p in players), np.float64, n),
+               "happiness": np.fromiter((p["happiness"] for p in players), np.float64, n)}
+    for j, field in enumerate(STATS):
+        columns[field] += impact[:, j]
+
+    for i, value in values.items():
+        portfolios[i].value = value
+        portfolios[i].mature(int(age[i]))
+    for p, year in zip(players, age.tolist()):
+        p["age"] = year
+    for field, column in columns.items():
+        for p, value in zip(players, column.tolist()):
+            p[field] = value
+    for p in players:
+        p["history"].record(p)
+    profiler = get_profiler()
+    profiler.count("turns", n)
+    profiler.count("events.fired", int((fired >= 0).sum()))
+
+    get_store().save_many(players)
+    return players
+
+
+@timed("turn.forward")
+def fast_forward(player, years, catalog=None, save=True):
+    """Plays years turns in one call; the result matches calling handle_turn years times, up to rounding.
+
+    Income growth (held at the occupation's cap), loan payments and
+    holdings without volatility follow closed forms. Only the random parts
+    are sampled: each year's life-event draw, and market shocks for volatile
+    holdings, from the same per-year streams a turn uses. Events are not
+    printed. Every year is added to the player's history. The player is
+    saved once at the end, unless save is False.
+    """
+    catalog = get_catalog() if catalog is None else catalog
+    if years < 1:
+        return player
+    ages = player["age"] + np.arange(1, years + 1)
+
+    table = catalog.event_table
+    draws = np.array([player_streams(player, age).events.random() for age in ages.tolist()])
+    fired = table.sample_many(ages, draws)
+    impact = table.impact_matrix(STATS)[fired]
+    bank_impact, income_impact, health_impact, happiness_impact = impact.T
+
+    occupation = catalog.occupation(player["skills"]["education"], player["occupation"])
+    rate, cap = 0.0, np.inf
+    if occupation is not None:
+        rate, cap = occupation["Income"]["Increase_Rate"], occupation["Income"]["Cap"]
+    # Closed form between events that change income; each one restarts the curve from the new income.
+    pay = np.empty(years)
+    start, income = 0, player["income"]
+    for end in np.flatnonzero(income_impact).tolist() + [years - 1]:
+        if end < start:
+            continue
+        pay[start:end + 1] = income_path(income, rate, cap, end + 1 - start)
+        start, income = end + 1, float(pay[end] + income_impact[end])
+
+    cash, assets = Portfolio.of(player).forward(ages, lambda age: player_streams(player, age).market)
+    bank = player["bank"] + np.cumsum(pay - debt_service_years(player, ages) + cash + bank_impact)
+    health = player["health"] + np.cumsum(health_impact)
+    happiness = player["happiness"] + np.cumsum(happiness_impact)
+    player["history"].extend(np.column_stack([ages, bank, pay + income_impact, health, happiness, assets]))
+
+    player["age"] = int(ages[-1])
+    player["income"] = income
+    player["bank"] = float(bank[-1])
+    player["health"] = float(health[-1])
+    player["happiness"] = float(happiness[-1])
+    if save:  # a preview is not play
+        profiler = get_profiler()
+        profiler.count("turns", years)
+        profiler.count("events.fired", int((fired >= 0).sum()))
+        save_player(player)
+    return player
+
+
+def preview(player, years, catalog=None):
+    """Where the player will be after years more turns, if they make no decisions; player is left as it is."""
+    return fast_forward(copy.deepcopy(player), years, catalog, save=False)
+
+
+def _step_portfolios(portfolios, age, streams):
+    """Portfolio.step for every player's holdings as one array update, without changing them.
+
+    Returns ({player index: new holding values}, each player's cash from
+    maturities); writing the values and then calling mature(age) applies the step.
+    """
+    cash = np.zeros(len(portfolios))
+    held = [i for i, portfolio in enumerate(portfolios) if len(portfolio)]
+    if not held:
+        return {}, cash
+    sizes = [len(portfolios[i]) for i in held]
+    value = np.concatenate([portfolios[i].value for i in held])
+    rate = np.concatenate([portfolios[i].rate for i in held])
+    volatility = np.concatenate([portfolios[i].volatility for i in held])
+    shock = np.concatenate([streams[i].market.uniform(-1.0, 1.0, size=k) for i, k in zip(held, sizes)])
+    value += value * (rate + volatility * shock)
+
+    matures = np.concatenate([portfolios[i].matures for i in held])
+    due = (matures >= 0) & (matures <= np.repeat(age[held], sizes))
+    for i in np.unique(np.repeat(held, sizes)[due]).tolist():
+        portfolio = portfolios[i]
+        cash[i] = float(portfolio.payout[(portfolio.matures >= 0) & (portfolio.matures <= age[i])].sum())
+    return dict(zip(held, np.split(value, np.cumsum(sizes)[:-1]))), cash
@@ -0,0 +1,146 @@
+import struct
+
+import numpy as np
+
+from portfolio import Portfolio
+
+# Recorded once a year, in column order. "assets" is the total value of the player's holdings.
+FIELDS = ("age", "bank", "income", "health", "happiness", "assets")
+
+# Years kept; a full life from 16 fits with room to spare.
+CAPACITY = 128
+
+_HEADER = struct.Struct("<II")  # capacity, rows
+
+
+class History:
+    """The last capacity years of a player's numbers, in a fixed-size NumPy ring buffer.
+
+    Appending a year writes one row in place, so it costs the same at 17 as
+    at 97; once full, the oldest year is overwritten. total counts every year
+    ever appended, which lets a chart tell which rows it has not drawn yet.
+    A save after a turn records only the new rows (see appended_since).
+    """
+
+    def __init__(self, capacity=CAPACITY):
+        self.rows = np.zeros((capacity, len(FIELDS)))
+        self.start = 0
+        self.count = 0
+        self.total = 0
+
+    def __len__(self):
+        return self.count
+
+    def __eq__(self, other):
+        if not isinstance(other, History):
+            return NotImplemented
+        return self.count == other.count and np.array_equal(self.to_array(), other.to_array())
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    @property
+    def capacity(self):
+        return len(self.rows)
+
+    def copy(self):
+        history = History.__new__(History)
+        history.rows = self.rows.copy()
+        history.start, history.count, history.total = self.start, self.count, self.total
+        return history
+
+    def with_rows(self, rows):
+        """A copy with rows (a few, as lists) appended."""
+        history = self.copy()
+        for row in rows:
+            history.append(row)
+        return history
+
+    def append(self, row):
+        """Adds one year, a sequence of FIELDS values."""
+        self.rows[(self.start + self.count) % self.capacity] = row
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+        self.total += 1
+
+    def extend(self, rows):
+        """Adds several years at once, an array with one row per year, oldest first."""
+        rows = np.asarray(rows, dtype=np.float64)
+        added = len(rows)
+        rows = rows[-self.capacity:]
+        end = (self.start + self.count) % self.capacity
+        index = (end + np.arange(len(rows))) % self.capacity
+        self.rows[index] = rows
+        overflow = max(0, self.count + len(rows) - self.capacity)
+        self.count = min(self.capacity, self.count + len(rows))
+        self.start = (self.start + overflow) % self.capacity
+        self.total += added
+
+    def record(self, player, assets=None):
+        """Appends the player's numbers as they are now; assets defaults to their holdings' total."""
+        if assets is None:
+            assets = Portfolio.of(player).total()
+        self.append((player["age"], player["bank"], player["income"], player["health"], player["happiness"], assets))
+
+    def tail(self, n):
+        """The newest n years (at most len(self)) as an array, oldest first."""
+        n = min(n, self.count)
+        first = (self.start + self.count - n) % self.capacity
+        if first + n <= self.capacity:
+            return self.rows[first:first + n].copy()
+        return np.concatenate([self.rows[first:], self.rows[:first + n - self.capacity]])
+
+    def to_array(self):
+        """Every kept year as an array, oldest first."""
+        return self.tail(self.count)
+
+    def column(self, name):
+        return self.to_array()[:, FIELDS.index(name)]
+
+    def appended_since(self, old):
+        """The rows added since old, an earlier copy of this history, as lists; None if it is not one.
+
+        Only the newest year old holds is compared, so this stays cheap however long the history is.
+        """
+        if not isinstance(old, History) or old.capacity != self.capacity or old.total > self.total:
+            return None
+        new = self.total - old.total
+        if self.count != min(self.capacity, old.count + new):
+            return None
+        if old.count and new < self.count:
+            last = old.rows[(old.start + old.count - 1) % self.capacity]
+            if last.tolist() != self.rows[(self.start + self.count - new - 1) % self.capacity].tolist():
+                return None
+        return self.tail(new).tolist()
+
+    def to_bytes(self):
+        return _HEADER.pack(self.capacity, self.count) + self.to_array().astype("<f8", copy=False).tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        capacity, count = _HEADER.unpack_from(data)
+        history = cls(capacity)
+        history.extend(np.frombuffer(data, "<f8", count * len(FIELDS), _HEADER.size).reshape(count, len(FIELDS)))
+        return history
+
+    def to_json(self):
+        return {"fields": list(FIELDS), "capacity": self.capacity, "rows": self.to_array().tolist()}
+
+    @classmethod
+    def from_json(cls, data):
+        """Builds a history from its saved form; saves from before histories existed start empty.
+
+        Columns are matched by name, so saves with fewer fields load with zeros in the rest.
+        """
+        if not data:
+            return cls()
+        history = cls(data.get("capacity", CAPACITY))
+        saved = np.array(data["rows"], dtype=np.float64).reshape(-1, len(data["fields"]))
+        rows = np.zeros((len(saved), len(FIELDS)))
+        for j, name in enumerate(data["fields"]):
+            if name in FIELDS:
+                rows[:, FIELDS.index(name)] = saved[:, j]
+        history.extend(rows)
+        return history
@@ -0,0 +1,148 @@
+import math
+from functools import lru_cache
+
+import numpy as np
+
+MONTHS = 12
+
+# Schedules of loans whose payment never covers the interest stop after this many years.
+MAX_YEARS = 100
+
+
+def _monthly(rate):
+    return np.asarray(rate, dtype=np.float64) / MONTHS
+
+
+def balance_after(principal, rate, payment, months):
+    """Balance after a number of monthly payments, in closed form (never below zero).
+
+    Works element-wise on arrays of loans as well as on single values.
+    """
+    principal, payment, months = np.broadcast_arrays(
+        np.asarray(principal, dtype=np.float64), np.asarray(payment, dtype=np.float64),
+        np.asarray(months, dtype=np.float64))
+    r = np.broadcast_to(_monthly(rate), principal.shape)
+    growth = (1.0 + r) ** months
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity = np.where(r > 0, (growth - 1.0) / np.where(r > 0, r, 1.0), months)
+    return np.maximum(principal * growth - payment * annuity, 0.0)
+
+
+def payoff_months(principal, rate, payment):
+    """Number of payments until the loan is repaid, the last one possibly smaller; inf if never."""
+    principal, payment = np.broadcast_arrays(np.asarray(principal, dtype=np.float64),
+                                             np.asarray(payment, dtype=np.float64))
+    r = np.broadcast_to(_monthly(rate), principal.shape)
+    interest = principal * r
+    with np.errstate(divide="ignore", invalid="ignore"):
+        amortizing = np.ceil(-np.log1p(-interest / payment) / np.log1p(r) - 1e-9)
+        interest_free = np.ceil(principal / payment - 1e-9)
+    months = np.where(r > 0, amortizing, interest_free)
+    months = np.where(payment > interest, months, np.inf)
+    return np.where(principal > 0, months, 0.0)
+
+
+def year_service(principal, rate, payment, year):
+    """(paid, interest, balance at year end) for year number year of the loan, counting from 0.
+
+    Exact to the month, including a smaller final payment, without looping
+    over months. Years before 0 (loan not taken yet) pay nothing. All
+    arguments may be arrays of loans.
+    """
+    principal, rate, payment, year = np.broadcast_arrays(
+        np.asarray(principal, dtype=np.float64), np.asarray(rate, dtype=np.float64),
+        np.asarray(payment, dtype=np.float64), np.asarray(year, dtype=np.float64))
+    r = _monthly(rate)
+    n = payoff_months(principal, rate, payment)
+    first = np.maximum(year, 0.0) * MONTHS
+    last = np.minimum(first + MONTHS, n)
+    count = np.clip(last - first, 0.0, MONTHS)
+
+    pays_off = (n > first) & (n <= first + MONTHS)
+    before_final = np.where(pays_off, n - 1.0, 0.0)
+    final = np.where(pays_off, balance_after(principal, rate, payment, before_final) * (1.0 + r), 0.0)
+    paid = (count - pays_off) * payment + final
+
+    start = np.where(first < n, balance_after(principal, rate, payment, first), 0.0)
+    end = np.where(pays_off | (first >= n), 0.0, balance_after(principal, rate, payment, last))
+    interest = paid - (start - end)
+    started = year >= 0
+    return (np.where(started, paid, 0.0), np.where(started, interest, 0.0),
+            np.where(started, end, principal))
+
+
+class Schedule:
+    """Yearly amortization of one loan: payment, interest and closing balance per year."""
+
+    def __init__(self, principal, rate, payment):
+        self.principal = principal
+        self.rate = rate
+        self.payment = payment
+        self.months = float(payoff_months(principal, rate, payment))
+        years = MAX_YEARS if math.isinf(self.months) else int(math.ceil(self.months / MONTHS))
+        self.paid, self.interest, self.balance = year_service(principal, rate, payment, np.arange(years))
+        for column in (self.paid, self.interest, self.balance):
+            column.flags.writeable = False
+
+    @property
+    def years(self):
+        """Years until the loan is repaid, or None if the payment never covers the interest."""
+        return None if math.isinf(self.months) else len(self.paid)
+
+    def year(self, year):
+        """(paid, interest, closing balance) for year number year; zeros once repaid."""
+        if 0 <= year < len(self.paid):
+            return float(self.paid[year]), float(self.interest[year]), float(self.balance[year])
+        if year < 0:
+            return 0.0, 0.0, float(self.principal)
+        return 0.0, 0.0, float(self.balance[-1]) if len(self.balance) else 0.0
+
+    def total_interest(self):
+        return float(self.interest.sum())
+
+
+@lru_cache(maxsize=1024)
+def schedule(principal, rate, payment):
+    """Returns the shared, read-only Schedule for a loan's terms."""
+    return Schedule(principal, rate, payment)
+
+
+def take_loan(player, liability, age=None):
+    """Adds a catalog liability (liabilities.json) to the player's loans, starting at age."""
+    loan = {
+        "id": liability["id"],
+        "name": liability["name"],
+        "principal": liability["initial_balance"],
+        "rate": liability["interest_rate"],
+        "payment": liability["monthly_payment"],
+        "taken": player["age"] if age is None else age,
+    }
+    player["liabilities"].append(loan)
+    return loan
+
+
+def loan_year(loan, age):
+    """(paid, interest, closing balance) of a player's loan for the year that ends at age."""
+    return schedule(loan["principal"], loan["rate"], loan["payment"]).year(age - loan["taken"] - 1)
+
+
+def debt_service(player, age=None):
+    """Total loan payments for the year the player has just finished (the one ending at age, if given)."""
+    age = player["age"] if age is None else age
+    return sum(loan_year(loan, age)[0] for loan in player["liabilities"])
+
+
+def debt_service_years(player, ages):
+    """debt_service for each year ending at ages, an array, straight from the loans' schedules."""
+    total = np.zeros(len(ages))
+    for loan in player["liabilities"]:
+        paid = schedule(loan["principal"], loan["rate"], loan["payment"]).paid
+        year = ages - loan["taken"] - 1
+        due = (year >= 0) & (year < len(paid))
+        total[due] += paid[year[due]]
+    return total
+
+
+def outstanding(player):
+    """Total balance still owed on the player's loans."""
+    return sum(loan_year(loan, player["age"])[2] for loan in player["liabilities"])
@@ -1,15 +1,20 @@
+from profiling import get_profiler
 import pygame
-import sys
-from player import create_player
-from pygame.locals import QUIT, KEYDOWN, MOUSEBUTTONDOWN, K_RETURN, K_BACKSPACE
-from ui.guide import guide_screen, phases_screen, status_screen
-from ui.dashboard import dashboard_screen
-from utils import load_json, DataPath
-pygame.init()
+from pygame.locals import KEYDOWN, MOUSEBUTTONDOWN, K_RETURN, K_BACKSPACE
+from ui.scenes import Scene, SceneManager
+from ui.text import get_font, render_text
+from ui.skin import Skin
+from preload import Preloader, PRELOAD_DONE
+from utils import DataPath
+
+# Only what the title screen needs is imported up front; the player store,
+# game data and dashboard are imported by the preloader while it is shown.
 
 WIDTH, HEIGHT = 800, 600
-WIN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("FinLitFun")
+WIN = None
+
+LOGO_PATH = DataPath.LOGO.value
+LOGO_SIZE = (400, 400)
 
 # Colors
 WHITE = (255, 255, 255)
@@ -20,36 +25,34 @@ BLACK = (0, 0, 0)
 BG_BLUE = (111, 128, 145)
 ORANGE = (255, 111, 0)
 
-def draw_rounded_rect(surface, color, rect, corner_radius):
-    """Draws a rectangle with rounded corners."""
-    pygame.gfxdraw.aacircle(surface, rect.x + corner_radius, rect.y + corner_radius, corner_radius, color)
-    pygame.gfxdraw.aacircle(surface, rect.right - corner_radius - 1, rect.y + corner_radius, corner_radius, color)
-    pygame.gfxdraw.aacircle(surface, rect.x + corner_radius, rect.bottom - corner_radius - 1, corner_radius, color)
-    pygame.gfxdraw.aacircle(surface, rect.right - corner_radius - 1, rect.bottom - corner_radius - 1, corner_radius, color)
+PLAY_BUTTON_SKIN = Skin(ORANGE, radius=20)
+
+
+def init_display():
+    """Opens the game window, starting only the pygame modules the game uses."""
+    global WIN
+    pygame.display.init()
+    pygame.font.init()
+    WIN = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("FinLitFun")
+    return WIN
 
-    pygame.gfxdraw.filled_circle(surface, rect.x + corner_radius, rect.y + corner_radius, corner_radius, color)
-    pygame.gfxdraw.filled_circle(surface, rect.right - corner_radius - 1, rect.y + corner_radius, corner_radius, color)
-    pygame.gfxdraw.filled_circle(surface, rect.x + corner_radius, rect.bottom - corner_radius - 1, corner_radius, color)
-    pygame.gfxdraw.filled_circle(surface, rect.right - corner_radius - 1, rect.bottom - corner_radius - 1, corner_radius, color)
 
-    pygame.draw.rect(surface, color, rect.inflate(-2*corner_radius, 0))
-    pygame.draw.rect(surface, color, rect.inflate(0, -2*corner_radius))
+def load_logo():
+    """Loads the title logo and scales it to its display size, once (safe off the main thread)."""
+    return pygame.transform.smoothscale(pygame.image.load(LOGO_PATH), LOGO_SIZE)
 
-def draw_title_screen():
-    """Displays the title screen with a 'Play Now' button."""
+
+def draw_title_screen(logo=None):
+    """Displays the title screen with a 'Play Now' button, and the logo once it is loaded."""
     WIN.fill(BG_BLUE)  
-    
 
-    logo = pygame.image.load('../assets/logo.png')
-    logo = pygame.transform.scale(logo, (400, 400))  
-    
-    WIN.blit(logo, (WIDTH // 2 - logo.get_width() // 2, HEIGHT // 1.4 - logo.get_height()))
+    if logo is not None:
+        WIN.blit(logo, (WIDTH // 2 - logo.get_width() // 2, HEIGHT // 1.4 - logo.get_height()))
 
-    button_font = pygame.font.Font(None, 50)
-    button_text = button_font.render("Play Now", True, WHITE)
+    button_text = render_text("Play Now", 50, WHITE)
     button_rect = pygame.Rect(WIDTH // 2 - 100, HEIGHT // 2 + 90, 200, 60)
-    corner_radius = 20
-    draw_rounded_rect(WIN, ORANGE, button_rect, corner_radius)
+    PLAY_BUTTON_SKIN.draw(WIN, button_rect)
     WIN.blit(button_text, (button_rect.x + (button_rect.width - button_text.get_width()) // 2, 
                            button_rect.y + (button_rect.height - button_text.get_height()) // 2))
 
@@ -58,111 +61,158 @@ def draw_title_screen():
     return button_rect
 
 
-def title_screen():
+class TitleScene(Scene):
     """Handles the title screen logic."""
-    button_rect = draw_title_screen()
-    
-    while True:
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == MOUSEBUTTONDOWN:
-                if button_rect.collidepoint(event.pos):
-                    return  
 
-        pygame.display.update()
+    def __init__(self, next_scene, preloader):
+        self.next_scene = next_scene
+        self.preloader = preloader
 
+    def enter(self, win):
+        self.button_rect = draw_title_screen(self.preloader.get("logo"))
+        get_profiler().mark("first_frame")
 
-def get_player_name():
-    """Handles player name input after 'Play Now' is clicked."""
-    font = pygame.font.Font(None, 50)
-    button_font = pygame.font.Font(None, 40)
+    def handle_event(self, event):
+        if event.type == PRELOAD_DONE and event.task == "logo":
+            draw_title_screen(self.preloader.get("logo"))
+        if event.type == MOUSEBUTTONDOWN and self.button_rect.collidepoint(event.pos):
+            return self.next_scene()
+        return None
+
+
+def draw_name_entry(player_name, active, cursor_visible, input_box, submit_button):
+    """Draws the player name input screen."""
     color_inactive = pygame.Color('lightskyblue3')
     color_active = pygame.Color('dodgerblue2')
-    color = color_inactive
-    active = False
-    player_name = ''
-    cursor_visible = True
-    cursor_timer = pygame.time.get_ticks()
-
-    input_box = pygame.Rect(0, 0, 175, 50)
-    input_box.center = (WIDTH // 2, HEIGHT // 2)
-
-    submit_button = pygame.Rect(0, 0, 150, 60)
-    submit_button.center = (WIDTH // 2, HEIGHT // 2 + 90)
-
-    while True:
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == MOUSEBUTTONDOWN:
-                if input_box.collidepoint(event.pos):
-                    active = not active
-                else:
-                    active = False
-                color = color_active if active else color_inactive
-
-                if submit_button.collidepoint(event.pos):
-                    return player_name
-
-            if event.type == KEYDOWN:
-                if active:
-                    if event.key == K_RETURN:
-                        return player_name
-                    elif event.key == K_BACKSPACE:
-                        player_name = player_name[:-1]
-                    else:
-                        player_name += event.unicode
-
-        WIN.fill(BG_BLUE)
-
-        pygame.draw.rect(WIN, WHITE, input_box)
-        txt_surface = font.render(player_name, True, color)
-        width = max(200, txt_surface.get_width() + 10)
-        input_box.w = width
-        input_box.centerx = WIDTH // 2  
-        WIN.blit(txt_surface, (input_box.x + 5, input_box.y + 5))
-        pygame.draw.rect(WIN, color, input_box, 2)
-
-        pygame.draw.rect(WIN, color_inactive, submit_button)
-        button_text = button_font.render("Submit", True, BLACK)
-        WIN.blit(button_text, (submit_button.x + (submit_button.width - button_text.get_width()) // 2, 
-                               submit_button.y + (submit_button.height - button_text.get_height()) // 2))
-
-        if active:
+    color = color_active if active else color_inactive
+
+    WIN.fill(BG_BLUE)
+
+    pygame.draw.rect(WIN, WHITE, input_box)
+    txt_surface = render_text(player_name, 50, color)
+    width = max(200, txt_surface.get_width() + 10)
+    input_box.w = width
+    input_box.centerx = WIDTH // 2  
+    WIN.blit(txt_surface, (input_box.x + 5, input_box.y + 5))
+    pygame.draw.rect(WIN, color, input_box, 2)
+
+    pygame.draw.rect(WIN, color_inactive, submit_button)
+    button_text = render_text("Submit", 40, BLACK)
+    WIN.blit(button_text, (submit_button.x + (submit_button.width - button_text.get_width()) // 2, 
+                           submit_button.y + (submit_button.height - button_text.get_height()) // 2))
+
+    if active and cursor_visible:
+        cursor_surface = render_text('|', 50, color)
+        WIN.blit(cursor_surface, (input_box.x + 5 + txt_surface.get_width(), input_box.y + 5))
+
+    instruction_text = render_text("Enter your name:", 50, BLACK)
+    WIN.blit(instruction_text, (WIDTH // 2 - instruction_text.get_width() // 2, HEIGHT // 2 - 120))
+
+
+class NameEntryScene(Scene):
+    """Handles player name input after 'Play Now' is clicked."""
+
+    wake_ms = 500  # cursor blink
+
+    def __init__(self, on_submit):
+        self.on_submit = on_submit
+        self.active = False
+        self.player_name = ''
+        self.cursor_visible = True
+        self.cursor_timer = pygame.time.get_ticks()
+        self.changed = True
+
+        self.input_box = pygame.Rect(0, 0, 175, 50)
+        self.input_box.center = (WIDTH // 2, HEIGHT // 2)
+
+        self.submit_button = pygame.Rect(0, 0, 150, 60)
+        self.submit_button.center = (WIDTH // 2, HEIGHT // 2 + 90)
+
+    def enter(self, win):
+        self.changed = True
+
+    def handle_event(self, event):
+        if event.type == MOUSEBUTTONDOWN:
+            if self.input_box.collidepoint(event.pos):
+                self.active = not self.active
+            else:
+                self.active = False
+            self.changed = True
+
+            if self.submit_button.collidepoint(event.pos):
+                return self.on_submit(self.player_name)
+
+        if event.type == KEYDOWN and self.active:
+            if event.key == K_RETURN:
+                return self.on_submit(self.player_name)
+            elif event.key == K_BACKSPACE:
+                self.player_name = self.player_name[:-1]
+            else:
+                self.player_name += event.unicode
+            self.changed = True
+        return None
+
+    def update(self, win):
+        if self.active:
             current_time = pygame.time.get_ticks()
-            if current_time - cursor_timer > 500:
-                cursor_visible = not cursor_visible
-                cursor_timer = current_time
+            if current_time - self.cursor_timer >= 500:
+                self.cursor_visible = not self.cursor_visible
+                self.cursor_timer = current_time
+                self.changed = True
 
-            if cursor_visible:
-                cursor_surface = font.render('|', True, color)
-                WIN.blit(cursor_surface, (input_box.x + 5 + txt_surface.get_width(), input_box.y + 5))
+        if not self.changed:
+            return []
+        self.changed = False
+        draw_name_entry(self.player_name, self.active, self.cursor_visible, self.input_box, self.submit_button)
+        return [win.get_rect()]
 
-        instruction_text = font.render("Enter your name:", True, BLACK)
-        WIN.blit(instruction_text, (WIDTH // 2 - instruction_text.get_width() // 2, HEIGHT // 2 - 120))
 
-        pygame.display.flip()
+def preload_tasks():
+    """What the preloader gets ready while the title screen is up, most visible first."""
+    def modules():
+        import player, ui.guide, ui.dashboard
 
+    def store():
+        from player import get_store
+        return get_store()
 
-def main():
-    title_screen()
+    def catalog():
+        # Loaded and validated here so a bad data file fails before play starts.
+        from catalog import get_catalog
+        return get_catalog()
 
-    player_name = get_player_name()
+    def fonts():
+        for face, size in ((None, 30), (None, 40), (None, 50), (DataPath.FONT_VIRGIL.value, 24), (DataPath.FONT_VIRGIL.value, 32)):
+            get_font(face, size)
 
-    guide_screen(WIN, WIDTH, HEIGHT, BG_BLUE)
+    def dashboard():
+        # Renders while the title screen draws; the font, text and skin caches are locked for this.
+        from ui.dashboard import get_dashboard_view
+        return get_dashboard_view(WIN, WIDTH, HEIGHT, BG_BLUE)
 
-    phases_screen(WIN, WIDTH, HEIGHT, BG_BLUE)
-    
-    status_screen(WIN, WIDTH, HEIGHT, BG_BLUE)
+    return [("logo", load_logo), ("modules", modules), ("store", store), ("catalog", catalog), ("fonts", fonts), ("dashboard", dashboard)]
 
-    player = load_json(DataPath.PLAYER)
+
+def start_game(player_name, preloader):
+    """Loads or creates the named player and queues the guide pages before the dashboard."""
+    preloader.wait()
+    from player import create_player, find_player
+    from ui.guide import guide_scenes
+    from ui.dashboard import DashboardScene
+
+    player = find_player(player_name)
     if player is None:
         player = create_player(player_name)
-    
-    dashboard_screen(WIN, WIDTH, HEIGHT, BG_BLUE, player)
+    return guide_scenes(WIDTH, HEIGHT, BG_BLUE, DashboardScene(WIDTH, HEIGHT, BG_BLUE, player))
+
+
+def main():
+    init_display()
+    preloader = Preloader(preload_tasks()).start()
+    name_entry = lambda: NameEntryScene(lambda name: start_game(name, preloader))
+
+    SceneManager(WIN).run(TitleScene(name_entry, preloader))
+    pygame.quit()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,206 @@
+import json
+import struct
+from dataclasses import dataclass, field, fields
+from numbers import Real
+
+import numpy as np
+
+from history import History
+from portfolio import COLUMNS as PORTFOLIO_COLUMNS, Portfolio
+from rng import new_seed
+
+# Batch layout of the per-player numbers, one record per player. PlayerBatch
+# columns are views into an array of these, so packing or unpacking a batch
+# as records or raw bytes copies nothing.
+PLAYER_DTYPE = np.dtype([
+    ("age", "<i8"),
+    ("bank", "<f8"),
+    ("income", "<f8"),
+    ("health", "<f8"),
+    ("happiness", "<f8"),
+    ("income_rate", "<f8"),
+    ("income_cap", "<f8"),
+])
+
+MAGIC = b"FLP2"
+MAGIC_V1 = b"FLP1"  # before histories: the same layout without the history section
+_HEADER = struct.Struct("<4sqqddddqI")  # magic, seed, age, health, happiness, bank, income, work_experience, holdings
+_LENGTH = struct.Struct("<I")
+
+
+class PlayerError(ValueError):
+    """Raised when a player field is missing or has the wrong type."""
+
+
+@dataclass(slots=True, eq=False)
+class Player:
+    """One player's saved state, with typed fields.
+
+    Also answers player["age"] style access, which the phases, UI and save
+    code use, but only for its own fields, so a misspelled key in an event
+    file fails instead of silently adding a new one.
+    """
+
+    player_id: str
+    name: str
+    seed: int = field(default_factory=new_seed)  # saves from before seeds existed get a new one
+    age: int = 16
+    health: float = 90.0
+    happiness: float = 50.0
+    bank: float = 200.0
+    income: float = 0.0
+    skills: dict = field(default_factory=lambda: {"education": "High School", "work_experience": 0})
+    education_level: str = "None"
+    occupation: str = "None"
+    assets: Portfolio = field(default_factory=Portfolio)
+    liabilities: list = field(default_factory=list)
+    status_effects: list = field(default_factory=list)
+    game_progress: dict = field(default_factory=dict)
+    history: History = field(default_factory=History)
+    extra: dict = field(default_factory=dict)  # fields from newer saves, kept so they round-trip
+
+    def __getitem__(self, key):
+        if key in _FIELDS:
+            return getattr(self, key)
+        return self.extra[key]
+
+    def __setitem__(self, key, value):
+        if key not in _FIELDS:
+            raise KeyError(f"Player has no field {key!r}")
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in _FIELDS or key in self.extra
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def keys(self):
+        return list(_FIELDS) + list(self.extra)
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def validate(self):
+        """Checks every field's type, converting whole numbers to float where a float is expected."""
+        for f in fields(self):
+            value = getattr(self, f.name)
+            kind = _TYPES[f.name]
+            if kind is float and isinstance(value, Real) and not isinstance(value, bool):
+                setattr(self, f.name, float(value))
+            elif not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+                raise PlayerError(f"Player {self.player_id!r}: {f.name} has invalid value {value!r}")
+        if self.age < 0:
+            raise PlayerError(f"Player {self.player_id!r}: negative age {self.age}")
+        return self
+
+    def to_dict(self):
+        """The JSON-compatible form the save files use."""
+        return {key: (value.to_json() if key in ("assets", "history") else value) for key, value in self.items()}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Builds a player from a save or create_player dict, checking its fields."""
+        data = dict(data)
+        extra = {key: data.pop(key) for key in list(data) if key not in _FIELDS}
+        data["assets"] = Portfolio.from_json(data.get("assets") or [])
+        data["history"] = History.from_json(data.get("history"))
+        try:
+            player = cls(**data, extra=extra)
+        except TypeError as e:
+            raise PlayerError(f"Invalid player data: {e}") from None
+        return player.validate()
+
+    def to_bytes(self):
+        """Compact binary form: fixed numbers, length-prefixed strings, raw holding columns and history."""
+        self.validate()
+        portfolio = self.assets
+        parts = [_HEADER.pack(MAGIC, self.seed, self.age, self.health, self.happiness, self.bank, self.income,
+                              int(self.skills.get("work_experience", 0)), len(portfolio))]
+        for text in (self.player_id, self.name, self.education_level, str(self.occupation),
+                     self.skills.get("education", "")):
+            _put_bytes(parts, text.encode())
+        for holding_id in portfolio.ids:
+            _put_bytes(parts, holding_id.encode())
+        for name, dtype in PORTFOLIO_COLUMNS.items():
+            parts.append(getattr(portfolio, name).astype(np.dtype(dtype).newbyteorder("<"), copy=False).tobytes())
+        _put_bytes(parts, self.history.to_bytes())
+        rest = {"skills": {k: v for k, v in self.skills.items() if k not in ("education", "work_experience")},
+                "liabilities": self.liabilities, "status_effects": self.status_effects,
+                "game_progress": self.game_progress, "extra": self.extra}
+        _put_bytes(parts, json.dumps(rest, separators=(",", ":")).encode())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Decodes to_bytes output, or the older FLP1 form with an empty history.
+
+        Holding columns are copied, so the player owns them.
+        """
+        data = memoryview(data)
+        magic, seed, age, health, happiness, bank, income, work_experience, holdings = _HEADER.unpack_from(data)
+        if magic not in (MAGIC, MAGIC_V1):
+            raise PlayerError("Not an encoded player")
+        offset = _HEADER.size
+        texts = []
+        for _ in range(5 + holdings):
+            text, offset = _get_bytes(data, offset)
+            texts.append(bytes(text).decode())
+        player_id, name, education_level, occupation, education = texts[:5]
+
+        columns = {}
+        for column, dtype in PORTFOLIO_COLUMNS.items():
+            dtype = np.dtype(dtype).newbyteorder("<")
+            columns[column] = np.frombuffer(data, dtype, holdings, offset).astype(np.dtype(dtype).newbyteorder("="))
+            offset += holdings * dtype.itemsize
+        history = History()
+        if magic == MAGIC:
+            encoded, offset = _get_bytes(data, offset)
+            history = History.from_bytes(encoded)
+        rest, offset = _get_bytes(data, offset)
+        rest = json.loads(bytes(rest))
+
+        skills = {"education": education, "work_experience": work_experience, **rest["skills"]}
+        return cls(player_id, name, seed, age, health, happiness, bank, income, skills, education_level,
+                   occupation, Portfolio(texts[5:], **columns), rest["liabilities"], rest["status_effects"],
+                   rest["game_progress"], history, rest["extra"])
+
+
+_FIELDS = tuple(f.name for f in fields(Player) if f.name != "extra")
+_TYPES = {"player_id": str, "name": str, "seed": int, "age": int, "health": float, "happiness": float,
+          "bank": float, "income": float, "skills": dict, "education_level": str, "occupation": str,
+          "assets": Portfolio, "liabilities": list, "status_effects": list, "game_progress": dict,
+          "history": History, "extra": dict}
+
+
+def pack_records(players, records=None):
+    """Copies the players' numbers into a PLAYER_DTYPE array (new, or records); income_rate and income_cap are left alone."""
+    if records is None:
+        records = np.zeros(len(players), PLAYER_DTYPE)
+        records["income_cap"] = np.inf
+    for name in PLAYER_DTYPE.names:
+        if name not in ("income_rate", "income_cap"):
+            records[name] = [p[name] for p in players]
+    return records
+
+
+def unpack_records(records, players):
+    """Writes a PLAYER_DTYPE array's numbers back into the players it was packed from."""
+    ages = records["age"].tolist()
+    columns = {name: records[name].tolist() for name in ("bank", "income", "health", "happiness")}
+    for i, p in enumerate(players):
+        p["age"] = ages[i]
+        for name, values in columns.items():
+            p[name] = values[i]
+    return players
+
+
+def _put_bytes(parts, data):
+    parts.append(_LENGTH.pack(len(data)))
+    parts.append(data)
+
+
+def _get_bytes(data, offset):
+    (length,) = _LENGTH.unpack_from(data, offset)
+    offset += _LENGTH.size
+    return data[offset:offset + length], offset + length
@@ -0,0 +1,251 @@
+import copy
+import json
+import logging
+import os
+import queue
+import threading
+from profiling import get_profiler
+
+_STOP = object()
+
+log = logging.getLogger(__name__)
+
+
+def json_default(value):
+    """json.dump hook for save fields held in objects, such as a player's Portfolio."""
+    if hasattr(value, "to_json"):
+        return value.to_json()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def diff_player(old, new):
+    """Return the top-level fields of new that differ from old, deep-copied.
+
+    A field that only grew by rows at the end (its value has appended_since,
+    as a History does) is recorded as just those rows under "$append", so a
+    long history is not rewritten on every save.
+    """
+    delta = {}
+    for key, value in new.items():
+        if key in old and hasattr(value, "appended_since"):
+            rows = value.appended_since(old[key])
+            if rows is not None:
+                if rows:
+                    delta.setdefault("$append", {})[key] = rows
+                continue
+        if key not in old or old[key] != value:
+            delta[key] = copy.deepcopy(value)
+    removed = [key for key in old if key not in new]
+    if removed:
+        delta["$removed"] = removed
+    return delta
+
+
+def apply_delta(player, delta):
+    """Apply a delta produced by diff_player to player in place.
+
+    Appended rows make a new value rather than changing the old one, which
+    may be shared with a delta still waiting to be written.
+    """
+    for key in delta.get("$removed", ()):
+        player.pop(key, None)
+    for key, value in delta.items():
+        if key not in ("$removed", "$append"):
+            player[key] = value
+    for key, rows in delta.get("$append", {}).items():
+        player[key] = _append_rows(player[key], rows)
+    return player
+
+
+def _append_rows(value, rows):
+    """value with rows added: a live object's with_rows(), or a saved {"rows", "capacity"} form."""
+    if isinstance(value, dict):
+        return {**value, "rows": (value["rows"] + rows)[-value["capacity"]:]}
+    return value.with_rows(rows)
+
+
+class WriteBehind:
+    """Background writer thread that commits queued records in groups.
+
+    Everything queued while a commit is in progress is handed to the next
+    commit call together, so a burst of saves costs one flush to disk. If a
+    commit raises, the error is logged and failed() is told which records
+    were lost, so the caller side can write them again.
+    """
+
+    def __init__(self, name="write-behind"):
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, record):
+        self._queue.put(record)
+
+    def flush(self):
+        """Block until everything submitted so far has been committed.
+
+        Waits for a marker queued behind those records rather than for an
+        empty queue, so saves submitted meanwhile by other threads cannot
+        hold it up.
+        """
+        if not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        """Commit anything pending and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def commit(self, records):
+        raise NotImplementedError
+
+    def failed(self, records):
+        """Called on the writer thread with the records of a commit that raised."""
+
+    def _run(self):
+        while True:
+            records = [self._queue.get()]
+            while True:
+                try:
+                    records.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = _STOP in records
+            flushes = [r for r in records if isinstance(r, threading.Event)]
+            try:
+                pending = [r for r in records if r is not _STOP and not isinstance(r, threading.Event)]
+                if pending:
+                    self.commit(pending)
+                    get_profiler().count("save.records", len(pending))
+            except Exception:
+                log.exception("Error saving %d records", len(pending))
+                get_profiler().count("save.failed", len(pending))
+                self.failed(pending)
+            finally:
+                for done in flushes:
+                    done.set()
+            if stop:
+                return
+
+
+class SaveJournal(WriteBehind):
+    """A save kept as a compact snapshot plus an append-only journal of deltas.
+
+    record() only diffs the player against the last recorded state and queues
+    the changed fields; serialization, the journal append and the periodic
+    snapshot (written to a temp file and renamed into place) all happen on the
+    writer thread. Journal entries carry a sequence number so replay after a
+    crash between snapshot and journal truncation skips what the snapshot holds.
+    """
+
+    def __init__(self, snapshot_path, journal_path, compact_every=64):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.compact_every = compact_every
+
+        # Caller-side view, used for diffing. Set by the writer when a commit
+        # fails, so the next record writes every field again.
+        self._last = None
+        self._seq = 0
+        self._stale = False
+
+        # Writer-side view, used for snapshots.
+        self._state = {}
+        self._state_seq = 0
+        self._since_snapshot = 0
+
+        super().__init__(name="save-journal")
+
+    def record(self, player):
+        """Queue the changes to player since the previous record."""
+        if self._stale:
+            self._stale = False
+            self._last = None
+        delta = diff_player(self._last or {}, player)
+        if not delta:
+            return
+        self._last = apply_delta(dict(self._last or {}), delta)
+        self._seq += 1
+        self.submit((self._seq, delta))
+
+    def load(self):
+        """Rebuild the player from the snapshot and journal, or None if there is no save."""
+        self.flush()
+        player, seq = self._read_snapshot()
+        replayed = 0
+        for entry_seq, delta in self._read_journal():
+            if entry_seq > seq:
+                if player is None:
+                    player = {}
+                apply_delta(player, delta)
+                seq = entry_seq
+                replayed += 1
+
+        self._last = copy.deepcopy(player)
+        self._seq = seq
+        self._state = copy.deepcopy(player) or {}
+        self._state_seq = seq
+        self._since_snapshot = replayed
+        return player
+
+    def commit(self, records):
+        lines = [json.dumps({"seq": seq, "delta": delta}, separators=(",", ":"), default=json_default) for seq, delta in records]
+        with open(self.journal_path, "a") as file:
+            file.write("\n".join(lines) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+        for seq, delta in records:
+            apply_delta(self._state, delta)
+            self._state_seq = seq
+        self._since_snapshot += len(records)
+        if self._since_snapshot >= self.compact_every:
+            self.compact()
+
+    def failed(self, records):
+        self._stale = True
+
+    def compact(self):
+        """Write a fresh snapshot atomically and empty the journal (writer thread only)."""
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "w") as file:
+            json.dump({"seq": self._state_seq, "player": self._state}, file, separators=(",", ":"), default=json_default)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp, self.snapshot_path)
+        open(self.journal_path, "w").close()
+        self._since_snapshot = 0
+
+    def _read_snapshot(self):
+        try:
+            with open(self.snapshot_path, "r") as file:
+                content = json.load(file)
+        except FileNotFoundError:
+            return None, 0
+        except (OSError, json.JSONDecodeError) as e:
+            log.error("Error loading %s: %s", self.snapshot_path, e)
+            return None, 0
+
+        # Saves written before the journal existed are a bare player object.
+        if set(content) == {"seq", "player"}:
+            return content["player"], content["seq"]
+        return content, 0
+
+    def _read_journal(self):
+        try:
+            with open(self.journal_path, "r") as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn final line from a crash mid-append; nothing after it was committed.
+                return
+            yield entry["seq"], entry["delta"]
@@ -1,16 +1,32 @@
-import random
-from utils import prompt_user, load_json, DataPath
-
-
-def trigger_random_events(player_data, events):
-    """Trigger a random event based on probability and age range."""
-    for event in events:
-        if event['age_range'][0] <= player_data['age'] <= event['age_range'][1]:
-            if random.random() < event['probability']:
-                print(f"Random Event: {event['description']}")
-                for key, value in event['impact'].items():
-                    player_data[key] += value
-                break
+from utils import prompt_user
+from catalog import get_catalog
+from event_table import EventTable
+from rng import player_streams
+from portfolio import Portfolio
+from profiling import get_profiler, timed
+from simulation import EDUCATION_AGE, CAREER_AGE, INVESTMENT_AGE
+
+
+@timed("events")
+def trigger_random_events(player_data, events=None, rng=None):
+    """Trigger at most one random event for the player's age, using a single draw.
+
+    events is an EventTable (the catalog's by default) or a plain list of events;
+    rng defaults to the player's life-event stream for the current year.
+    """
+    if events is None:
+        events = get_catalog().event_table
+    elif not isinstance(events, EventTable):
+        events = EventTable(events)
+    if rng is None:
+        rng = player_streams(player_data).events
+
+    event = events.sample(player_data['age'], rng.random())
+    if event is not None:
+        get_profiler().count("events.fired")
+        print(f"Random Event: {event['description']}")
+        for key, value in event['impact'].items():
+            player_data[key] += value
 
     return player_data
 
@@ -22,7 +38,7 @@ def early_life_phase(player_data, *kwargs):
     if player_data['age'] == 18:
         # Educational decision at age 18
         # prompt = "Choose your educational path:"
-        options = load_json(DataPath.EDUCATION)
+        options = get_catalog().education
         # choice = prompt_user(prompt, options)
         
         choice = kwargs.items()[0]
@@ -37,8 +53,7 @@ def early_life_phase(player_data, *kwargs):
 
             case "High School":
                 """Start working immediately"""
-                occupations = load_json(DataPath.OCCUPATIONS)
-                occupation = prompt_user("Choose your career path:", occupations[0]["occupations"])
+                occupation = prompt_user("Choose your career path:", get_catalog().occupations_for("High School"))
                 player_data['occupation'] = occupation
                 player_data['income'] = occupation["Income"]["Starting"]
 
@@ -63,24 +78,9 @@ def young_adult_phase(player_data):
     if player_data["age"] == 23:
         # Career decision at age 23
         prompt = "Choose your career path:"
-        occupations = load_json(DataPath.OCCUPATIONS)
-
-        match player_data['skills']['education']:
-            case "High School":
-                choice = prompt_user(prompt, occupations[0]["occupations"])
+        choice = prompt_user(prompt, get_catalog().occupations_for(player_data['skills']['education']))
 
-            case "Trade School":
-                choice = prompt_user(prompt, occupations[1]["occupations"])
-                
-            case "University/College":
-                choice = prompt_user(prompt, occupations[2]["occupations"])
-
-            case "Bootcamp":
-                choice = prompt_user(prompt, occupations[3]["occupations"])
-            
-        player_data['occupation'] = choice["id"]
-        player_data['bank'] += choice["Income"]["Starting"]
-        player_data['income'] = choice["Income"]["Starting"]
+        choose_occupation(player_data, choice)
 
     print(f"Age: {player_data['age']}, "
           f"Bank: ${player_data['bank']}, "
@@ -96,13 +96,75 @@ def mid_life_phase(player_data):
     if player_data['age'] == 35:
         """Investment decision at age 35"""
 
-        investments = load_json(DataPath.INVESTMENT)
-        choice = prompt_user("Investment Opportunity: ", investments)
-        choice["current_value"] = choice["initial_value"]
-
-        player_data["assets"].append(choice)
+        catalog = get_catalog()
+        choice = prompt_user("Investment Opportunity: ", catalog.investments)
+        choose_investment(player_data, choice, catalog)
 
     print(f"Age: {player_data['age']}, "
           f"Bank: ${player_data['bank']}")
 
     return player_data
+
+
+# Decisions without prompts, for callers that already have the player's
+# choice, such as the game server. Each kind is recorded in game_progress
+# once made, so it is asked for only once.
+
+def pending_decision(player_data, catalog=None):
+    """The decision due at the player's age and not made yet, as (kind, options), or None."""
+    catalog = get_catalog() if catalog is None else catalog
+    made = player_data['game_progress']
+    age = player_data['age']
+    if age == EDUCATION_AGE and "education" not in made:
+        return "education", catalog.education
+    education = player_data['skills']['education']
+    job_age = EDUCATION_AGE if education == "High School" else CAREER_AGE
+    if age == job_age and "occupation" not in made:
+        return "occupation", catalog.occupations_for(education)
+    if age == INVESTMENT_AGE and "investment" not in made:
+        return "investment", catalog.investments
+    return None
+
+
+def decide(player_data, option_id, catalog=None):
+    """Applies the player's choice, by option id, for the pending decision.
+
+    The investment decision may be declined with option_id None. Raises
+    ValueError if no decision is due or option_id is not one of its options.
+    """
+    catalog = get_catalog() if catalog is None else catalog
+    pending = pending_decision(player_data, catalog)
+    if pending is None:
+        raise ValueError("No decision is due")
+    kind, options = pending
+    choice = next((option for option in options if option["id"] == option_id), None)
+    if choice is None and not (kind == "investment" and option_id is None):
+        raise ValueError(f"{option_id!r} is not one of the {kind} options")
+
+    if kind == "education":
+        choose_education(player_data, choice)
+    elif kind == "occupation":
+        choose_occupation(player_data, choice)
+    elif choice is not None:
+        choose_investment(player_data, choice, catalog)
+    player_data['game_progress'][kind] = option_id
+    return player_data
+
+
+def choose_education(player_data, path):
+    player_data['skills']['education'] = path["id"]
+    player_data['bank'] -= path["Cost"]
+
+
+def choose_occupation(player_data, occupation):
+    """Starts the job; graduates starting at 23 also get their first salary up front."""
+    player_data['occupation'] = occupation["id"]
+    player_data['income'] = occupation["Income"]["Starting"]
+    if player_data['age'] >= CAREER_AGE:
+        player_data['bank'] += occupation["Income"]["Starting"]
+
+
+def choose_investment(player_data, investment, catalog=None):
+    catalog = get_catalog() if catalog is None else catalog
+    Portfolio.of(player_data).buy_investment(investment, player_data['age'], catalog.investment_payout(investment))
+    player_data['bank'] -= investment["cost"]
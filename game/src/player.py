@@ -1,37 +1,72 @@
+import atexit
+import os
 import uuid
-import json
 from utils import DataPath
+from persistence import SaveJournal
+from store import PlayerStore
+from model import Player
+from profiling import timed
 
+_store = None
 
+
+def get_store():
+    """Return the shared player store, opening the database on first use."""
+    global _store
+    if _store is None:
+        _store = PlayerStore(DataPath.PLAYERS_DB.value)
+        atexit.register(_store.close)
+        _import_legacy_save(_store)
+    return _store
+
+
+def use_store(path):
+    """Switch to the player database at path, closing the current one; returns the new store."""
+    global _store
+    if _store is not None:
+        _store.close()
+    _store = PlayerStore(path)
+    atexit.register(_store.close)
+    return _store
+
+
+@timed("save")
 def save_player(player_data):
-    """Save the player profile to a JSON file."""
-    path = str(DataPath.PLAYER.value)
-    with open(path, "w") as file:
-        json.dump(player_data, file, indent=4)
+    """Queue the player's changes for the background save writer."""
+    get_store().record(player_data)
+
+
+def load_player(player_id):
+    """Load a saved player profile by id, or None if there is no such save."""
+    return get_store().load(player_id, build=Player.from_dict)
+
+
+def find_player(name):
+    """Load the most recently played profile with this name, or None."""
+    profiles = get_store().find_by_name(name)
+    if not profiles:
+        return None
+    return load_player(profiles[0][0])
 
 
 def create_player(name):
     """Create a new player profile."""
 
-    player_data = {
-        "player_id": str(uuid.uuid4()),  
-        "name": name,
-        "age": 16,
-        "health": 90,
-        "happiness": 50,
-        "bank": 200,
-        "income": 0,
-        "skills": {
-            "education": "High School",
-            "work_experience": 0
-        },
-        "education_level": "None",
-        "occupation": "None",
-        "assets": [],
-        "liabilities": [],
-        "status_effects": [],
-        "game_progress": {}
-    }
-
-    save_player(player_data)
+    player_data = Player(str(uuid.uuid4()), name)
+
+    get_store().record(player_data, new=True)
     return player_data
+
+
+def _import_legacy_save(store):
+    """Move the old single-file save (player.json plus journal) into the store once."""
+    path = DataPath.PLAYER.value
+    if not os.path.exists(path):
+        return
+    journal = SaveJournal(path, DataPath.PLAYER_JOURNAL.value)
+    player = journal.load()
+    journal.close()
+    if player and "player_id" in player and store.load(player["player_id"]) is None:
+        store.record(player)
+        store.flush()
+    os.replace(path, path + ".imported")
@@ -0,0 +1,145 @@
+import numpy as np
+
+# Column name in the save -> dtype. "matures" is -1 for holdings that never mature.
+COLUMNS = {
+    "value": np.float64,
+    "rate": np.float64,
+    "volatility": np.float64,
+    "bought": np.int64,
+    "matures": np.int64,
+    "payout": np.float64,
+}
+
+
+def implied_rate(cost, payout, years):
+    """Yearly growth rate that turns cost into payout over years."""
+    if cost <= 0 or years <= 0:
+        return 0.0
+    return (payout / cost) ** (1.0 / years) - 1.0
+
+
+class Portfolio:
+    """A player's holdings as parallel arrays, one row per position.
+
+    A year is one vectorized update of every holding, so a turn costs about
+    the same with one position or a thousand. Timed investments grow at the
+    rate implied by their payout and are paid out and removed when they
+    mature. Saved as one list per column rather than one dict per holding.
+    """
+
+    def __init__(self, ids=(), **columns):
+        self.ids = list(ids)
+        for name, dtype in COLUMNS.items():
+            setattr(self, name, np.asarray(columns.get(name, np.zeros(len(self.ids))), dtype=dtype))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __eq__(self, other):
+        if not isinstance(other, Portfolio):
+            return NotImplemented
+        return self.ids == other.ids and all(np.array_equal(getattr(self, n), getattr(other, n)) for n in COLUMNS)
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def copy(self):
+        return Portfolio(self.ids, **{name: getattr(self, name).copy() for name in COLUMNS})
+
+    def total(self):
+        """Current value of every holding together."""
+        return float(self.value.sum())
+
+    def add(self, holding_id, value, rate, volatility, age, matures=-1, payout=0.0):
+        """Appends one holding; matures is the age it pays out, or -1 for never."""
+        self.ids.append(holding_id)
+        row = {"value": value, "rate": rate, "volatility": volatility, "bought": age, "matures": matures, "payout": payout}
+        for name in COLUMNS:
+            setattr(self, name, np.append(getattr(self, name), row[name]).astype(COLUMNS[name]))
+
+    def buy_asset(self, asset, age):
+        """Adds a catalog asset (assets.json) at its initial value."""
+        self.add(asset["id"], asset["initial_value"], asset["rate"], asset["volatility"], age)
+
+    def buy_investment(self, investment, age, payout):
+        """Adds a catalog investment (investments.json) that pays payout after its "time" years."""
+        cost = investment["cost"]
+        years = investment.get("time", 0)
+        matures = age + years if years else -1
+        self.add(investment["id"], cost, implied_rate(cost, payout, years), 0.0, age, matures, payout)
+
+    def step(self, age, market):
+        """Moves every holding on by one year at age; returns the cash paid out by maturities.
+
+        Draws one uniform market shock per holding, in row order.
+        """
+        if not self.ids:
+            return 0.0
+        shock = market.uniform(-1.0, 1.0, size=len(self))
+        self.value += self.value * (self.rate + self.volatility * shock)
+        return self.mature(age)
+
+    def forward(self, ages, market):
+        """step at each of ages (consecutive) in one go; returns (cash paid out, value held) per year.
+
+        Holdings without volatility grow in closed form. market(age) must
+        return that year's market generator; it is only called for years in
+        which a volatile holding is held, and the shocks are the ones step
+        would draw, so the result matches stepping year by year up to rounding.
+        """
+        years = len(ages)
+        if not self.ids:
+            return np.zeros(years), np.zeros(years)
+        due = (self.matures >= 0) & (self.matures <= ages[:, None])
+        held = np.ones_like(due)
+        held[1:] = ~due[:-1]
+
+        path = self.value * (1.0 + self.rate) ** np.arange(1, years + 1)[:, None]
+        volatile = self.volatility != 0
+        if volatile.any():
+            factor = np.broadcast_to(1.0 + self.rate, held.shape).copy()
+            for k in np.flatnonzero((held & volatile).any(axis=1)).tolist():
+                shock = market(int(ages[k])).uniform(-1.0, 1.0, size=int(held[k].sum()))
+                factor[k, held[k]] += self.volatility[held[k]] * shock
+            path[:, volatile] = self.value[volatile] * np.cumprod(factor[:, volatile], axis=0)
+
+        cash = ((held & due) * self.payout).sum(axis=1)
+        value = np.where(due, 0.0, path).sum(axis=1)
+        self.value = path[-1]
+        self.mature(int(ages[-1]))
+        return cash, value
+
+    def mature(self, age):
+        """Removes the holdings due to pay out at age; returns the cash they pay."""
+        due = (self.matures >= 0) & (self.matures <= age)
+        if not due.any():
+            return 0.0
+        cash = float(self.payout[due].sum())
+        keep = ~due
+        self.ids = [holding_id for holding_id, kept in zip(self.ids, keep) if kept]
+        for name in COLUMNS:
+            setattr(self, name, getattr(self, name)[keep])
+        return cash
+
+    def to_json(self):
+        return {"ids": self.ids, **{name: getattr(self, name).tolist() for name in COLUMNS}}
+
+    @classmethod
+    def from_json(cls, data):
+        """Builds a portfolio from its saved form, or from the older list of holding dicts."""
+        if isinstance(data, dict):
+            return cls(data["ids"], **{name: data[name] for name in COLUMNS if name in data})
+
+        portfolio = cls()
+        for holding in data:
+            value = holding.get("current_value", holding.get("initial_value", holding.get("cost", 0.0)))
+            portfolio.add(holding["id"], value, holding.get("rate", 0.0), holding.get("volatility", 0.0), -1)
+        return portfolio
+
+    @classmethod
+    def of(cls, player):
+        """Returns the player's portfolio, converting a loaded save's assets in place."""
+        assets = player.get("assets")
+        if not isinstance(assets, cls):
+            assets = player["assets"] = cls.from_json(assets or [])
+        return assets
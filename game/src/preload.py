@@ -0,0 +1,48 @@
+import threading
+import pygame
+from profiling import get_profiler
+
+# Posted once per finished task, with the task's name in event.task.
+PRELOAD_DONE = pygame.event.custom_type()
+
+
+class Preloader:
+    """Runs startup tasks in order on a background thread while the title screen is up.
+
+    Each finished task posts a PRELOAD_DONE event, so a sleeping scene wakes
+    up to use the result. If a task fails the rest are skipped and wait()
+    raises the error, so bad game data still stops the game before play.
+    """
+
+    def __init__(self, tasks):
+        self.tasks = list(tasks)
+        self.results = {}
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="preload", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def get(self, name, default=None):
+        """Returns a finished task's result, or default if it has not finished."""
+        return self.results.get(name, default)
+
+    def wait(self):
+        """Blocks until every task has run; returns the results."""
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+        return self.results
+
+    def _run(self):
+        profiler = get_profiler()
+        for name, task in self.tasks:
+            try:
+                with profiler.timer(f"preload.{name}"):
+                    self.results[name] = task()
+            except Exception as e:
+                self.error = e
+                return
+            finally:
+                pygame.event.post(pygame.event.Event(PRELOAD_DONE, task=name))
@@ -0,0 +1,200 @@
+import cProfile
+import csv
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+# Reference point for startup marks: when the game first imported this module.
+ORIGIN = time.perf_counter()
+
+
+class Timer:
+    """Running totals for one named timer, plus its most recent samples."""
+
+    def __init__(self, window):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.recent = deque(maxlen=window)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.recent.append(seconds)
+
+    def stats(self):
+        recent = sorted(self.recent) or [0.0]
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total * 1000 / self.count, 4) if self.count else 0.0,
+            "last_ms": round(self.last * 1000, 4),
+            "recent_mean_ms": round(sum(recent) * 1000 / len(recent), 4),
+            "recent_p95_ms": round(recent[min(len(recent) - 1, int(0.95 * len(recent)))] * 1000, 4),
+            "max_ms": round(self.max * 1000, 4),
+        }
+
+
+class Profiler:
+    """Named timers and counters around the game's hot paths.
+
+    Cheap enough to stay on in normal play: a timed call costs two clock
+    reads, an uncontended lock and a dict lookup. A capture window
+    additionally runs cProfile and tracemalloc until it is stopped, and
+    writes both next to a trace of every timer. Timers and counters may be updated from any thread;
+    read them through stats() and counts(), which take consistent copies.
+    """
+
+    def __init__(self, window=240):
+        self.window = window
+        self.timers = {}
+        self.counters = {}
+        self.marks = {}
+        self.started = time.time()
+        self._profile = None
+        self._capture_started = None
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        with self._lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                timer = self.timers[name] = Timer(self.window)
+            timer.add(seconds)
+
+    def mark(self, name):
+        """Records seconds since startup the first time name is reached; later calls are ignored."""
+        if name not in self.marks:
+            self.marks[name] = time.perf_counter() - ORIGIN
+        return self.marks[name]
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def counts(self):
+        """A copy of the counters."""
+        with self._lock:
+            return dict(self.counters)
+
+    @contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timed(self, name):
+        """Decorator that records every call of the function under name."""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def stats(self):
+        with self._lock:
+            return {name: timer.stats() for name, timer in sorted(self.timers.items())}
+
+    def reset(self):
+        with self._lock:
+            self.timers.clear()
+            self.counters.clear()
+            self.started = time.time()
+
+    def export(self, path, extra=None):
+        """Writes the timers and counters to path, as CSV if it ends in .csv, otherwise JSON."""
+        with self._lock:
+            stats = {name: timer.stats() for name, timer in sorted(self.timers.items())}
+            samples = {name: list(timer.recent) for name, timer in self.timers.items()}
+            counters = dict(self.counters)
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as file:
+                writer = csv.writer(file)
+                columns = ["count", "total_ms", "mean_ms", "last_ms", "recent_mean_ms", "recent_p95_ms", "max_ms"]
+                writer.writerow(["name"] + columns)
+                for name, row in stats.items():
+                    writer.writerow([name] + [row[c] for c in columns])
+                for name, value in sorted(counters.items()):
+                    writer.writerow([name, value] + [""] * (len(columns) - 1))
+            return path
+
+        trace = {
+            "started": self.started,
+            "exported": time.time(),
+            "timers": stats,
+            "samples_ms": {name: [round(s * 1000, 4) for s in recent] for name, recent in samples.items()},
+            "counters": counters,
+            "marks_ms": {name: round(s * 1000, 3) for name, s in self.marks.items()},
+            **(extra or {}),
+        }
+        with open(path, "w") as file:
+            json.dump(trace, file, indent=2)
+        return path
+
+    @property
+    def capturing(self):
+        return self._profile is not None
+
+    def start_capture(self, memory=True):
+        """Starts cProfile (and tracemalloc if memory) until stop_capture."""
+        if self.capturing:
+            return
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._capture_started = time.time()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def stop_capture(self, directory, extra=None):
+        """Stops the capture window and writes <name>.prof, -memory.txt and .json; returns the paths."""
+        if not self.capturing:
+            return []
+        self._profile.disable()
+        os.makedirs(directory, exist_ok=True)
+        name = os.path.join(directory, time.strftime("capture-%Y%m%d-%H%M%S"))
+        paths = [name + ".prof"]
+        self._profile.dump_stats(paths[0])
+        self._profile = None
+
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            paths.append(name + "-memory.txt")
+            with open(paths[-1], "w") as file:
+                file.write(f"current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB\n\n")
+                for stat in snapshot.statistics("lineno")[:40]:
+                    file.write(f"{stat}\n")
+
+        seconds = time.time() - self._capture_started
+        paths.append(self.export(name + ".json", {"capture_seconds": round(seconds, 3), **(extra or {})}))
+        return paths
+
+
+_profiler = Profiler()
+
+
+def get_profiler():
+    """Returns the process-wide profiler."""
+    return _profiler
+
+
+def timed(name):
+    """Times every call of the decorated function under name on the process-wide profiler."""
+    return _profiler.timed(name)
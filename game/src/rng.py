@@ -0,0 +1,67 @@
+import secrets
+from functools import cached_property
+import numpy as np
+
+# Spawn-key components. Saved seeds depend on these values: only ever append.
+PLAYER = 0
+SHARD = 1
+
+MARKET = 0
+EVENTS = 1
+DECISIONS = 2
+
+
+def new_seed():
+    """Returns a fresh random seed for a new player or simulation run."""
+    return secrets.randbits(63)
+
+
+def ensure_seed(player):
+    """Returns the player's seed, giving profiles saved before seeds existed one."""
+    if "seed" not in player:
+        player["seed"] = new_seed()
+    return player["seed"]
+
+
+def stream(seed, *key):
+    """Returns the generator for one child stream of seed, identified by key."""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=key))
+
+
+class Streams:
+    """Independent market, life-event and decision generators derived from one seed.
+
+    Children are addressed by spawn key rather than spawned in order, so the
+    same (seed, key) always yields the same numbers no matter how many other
+    streams were created first, in which process, or by how many workers.
+    """
+
+    def __init__(self, seed, *key):
+        self.seed = seed
+        self.key = key
+
+    # Built on first use: a game turn never needs the decision stream.
+    @cached_property
+    def market(self):
+        return stream(self.seed, *self.key, MARKET)
+
+    @cached_property
+    def events(self):
+        return stream(self.seed, *self.key, EVENTS)
+
+    @cached_property
+    def decisions(self):
+        return stream(self.seed, *self.key, DECISIONS)
+
+
+def player_streams(player, age=None):
+    """Streams for the year the player is currently in (or the year at age), keyed by seed and age.
+
+    Replaying a year (for example after reloading a save) draws the same numbers.
+    """
+    return Streams(ensure_seed(player), PLAYER, player["age"] if age is None else age)
+
+
+def shard_streams(seed, shard):
+    """Streams for one fixed-size shard of a batch simulation run."""
+    return Streams(seed, SHARD, shard)
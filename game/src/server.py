@@ -0,0 +1,342 @@
+"""Host many FinLitFun games from one process over a local socket.
+
+    python server.py --port 7421
+
+The protocol is JSON lines over TCP: each request is one line,
+{"id": 1, "op": "turn", "player_id": "...", "years": 1}, and gets one
+response line, {"id": 1, "ok": true, "result": {...}} or
+{"id": 1, "ok": false, "error": "..."}. Responses on a connection come
+back in request order. Ops:
+
+    create   name                 new player
+    load     player_id            saved player
+    list     limit, offset        saved profiles, most recent first
+    state    player_id            player and pending decision
+    decide   player_id, option    choose an option id for the pending decision
+    turn     player_id, years     play up to years turns, stopping at a decision
+    preview  player_id, years     the player years from now if no decisions are made; nothing changes
+    close    player_id            forget the session (the save is kept)
+    stats                         turn batching and profiler counters
+    ping
+
+Player results are {"player": {...}, "decision": null or {"kind", "options"}}.
+client.GameClient speaks this protocol. The turn engine is the same one
+the pygame UI runs; every op is short and runs on the event loop, and
+saves go through the player store's background writer. Reads from the
+store (load, list) wait for queued saves, so they run in a worker thread.
+
+Turns from all sessions that arrive within --batch-window-ms of each other
+are played as one vectorized batch (handle.handle_turns). A longer window
+makes bigger batches and more turns per second under load, at the cost
+of up to that much added latency per turn; 0 plays each turn on its own.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+from collections import OrderedDict
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import player as player_module
+from catalog import get_catalog
+from client import DEFAULT_HOST, DEFAULT_PORT
+from handle import handle_turns, preview
+from persistence import json_default
+from phases import decide, pending_decision
+from profiling import get_profiler
+
+# Longest request line accepted, in bytes.
+MAX_REQUEST = 64 * 1024
+
+# Turns one request may play.
+MAX_YEARS = 100
+
+DEFAULT_BATCH_WINDOW = 0.002
+
+log = logging.getLogger(__name__)
+
+
+class TurnScheduler:
+    """Collects turn requests for window seconds and plays them as one batch.
+
+    The first request after a quiet spell opens a window; everything that
+    arrives before it closes (or before max_batch requests are waiting) is
+    played by one handle_turns call. A player asked for twice in one window
+    is played twice, in order, in consecutive batches.
+    """
+
+    def __init__(self, catalog, window=DEFAULT_BATCH_WINDOW, max_batch=1024):
+        self.catalog = catalog
+        self.window = window
+        self.max_batch = max_batch
+        self._waiting = []
+        self._timer = None
+        self.batches = 0
+        self.turns = 0
+        self.largest = 0
+        self.waited = 0.0
+
+    async def turn(self, player):
+        """Plays one turn for player in the next batch; returns when it has been played."""
+        if self.window <= 0:
+            handle_turns([player], self.catalog)
+            self._count(1, 0.0)
+            return player
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._waiting.append((player, future, loop.time()))
+        if len(self._waiting) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def stats(self):
+        return {
+            "window_ms": self.window * 1000,
+            "batches": self.batches,
+            "turns": self.turns,
+            "mean_batch": round(self.turns / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest,
+            "mean_wait_ms": round(self.waited * 1000 / self.turns, 3) if self.turns else 0.0,
+        }
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        waiting, self._waiting = self._waiting, []
+        now = asyncio.get_running_loop().time()
+        while waiting:
+            batch, seen, later = [], set(), []
+            for entry in waiting:
+                if id(entry[0]) in seen:
+                    later.append(entry)
+                else:
+                    seen.add(id(entry[0]))
+                    batch.append(entry)
+            self._play(batch)
+            self._count(len(batch), sum(now - queued for _, _, queued in batch))
+            waiting = later
+
+    def _play(self, batch):
+        """Plays one batch; if it fails, plays its turns one by one so only the failing ones fail.
+
+        handle_turns changes nobody when it raises, so a retried turn is not played twice.
+        """
+        try:
+            handle_turns([player for player, _, _ in batch], self.catalog)
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+            for entry in batch:
+                self._play([entry])
+        else:
+            for player, future, _ in batch:
+                future.set_result(player)
+
+    def _count(self, turns, waited):
+        self.batches += 1
+        self.turns += turns
+        self.largest = max(self.largest, turns)
+        self.waited += waited
+
+
+class GameServer:
+    """Sessions (loaded players, by id) and the ops that act on them.
+
+    At most max_sessions players stay loaded; the least recently used is
+    dropped after that and loaded again from its save when next asked for.
+    """
+
+    def __init__(self, catalog=None, max_sessions=5000, batch_window=DEFAULT_BATCH_WINDOW):
+        self.catalog = get_catalog() if catalog is None else catalog
+        self.max_sessions = max_sessions
+        self.sessions = OrderedDict()
+        self.scheduler = TurnScheduler(self.catalog, batch_window)
+        self.profiler = get_profiler()
+        self.ops = {
+            "create": self.create,
+            "load": self.load,
+            "list": self.list,
+            "state": self.state,
+            "decide": self.decide,
+            "turn": self.turn,
+            "preview": self.preview,
+            "close": self.close,
+            "stats": self.stats,
+            "ping": lambda: "pong",
+        }
+
+    async def handle(self, request):
+        """Runs one decoded request and returns its response."""
+        request_id = request.get("id") if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("Request must be an object")
+            args = dict(request)
+            args.pop("id", None)
+            op = self.ops.get(args.pop("op", None))
+            if op is None:
+                raise ValueError(f"Unknown op {request.get('op')!r}")
+            with self.profiler.timer(f"server.{request['op']}"):
+                result = op(**args)
+                if asyncio.iscoroutine(result):
+                    result = await result
+        except (ValueError, KeyError) as e:
+            return {"id": request_id, "ok": False, "error": str(e.args[0]) if e.args else type(e).__name__}
+        except TypeError as e:
+            return {"id": request_id, "ok": False, "error": f"Bad arguments: {e}"}
+        except Exception:
+            log.exception("Request %r failed", request)
+            return {"id": request_id, "ok": False, "error": "Internal error"}
+        return {"id": request_id, "ok": True, "result": result}
+
+    def create(self, name):
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("A player needs a name")
+        return self._result(self._open(player_module.create_player(name.strip())))
+
+    async def load(self, player_id):
+        return self._result(await self._session(player_id))
+
+    async def list(self, limit=50, offset=0):
+        rows = await asyncio.to_thread(player_module.get_store().list_profiles, min(int(limit), 500), int(offset))
+        return [{"player_id": player_id, "name": name, "age": age, "updated_at": updated}
+                for player_id, name, age, updated in rows]
+
+    async def state(self, player_id):
+        return self._result(await self._session(player_id))
+
+    async def decide(self, player_id, option):
+        player = await self._session(player_id)
+        decide(player, option, self.catalog)
+        player_module.save_player(player)
+        return self._result(player)
+
+    async def turn(self, player_id, years=1):
+        player = await self._session(player_id)
+        _check_years(years)
+        if pending_decision(player, self.catalog) is not None:
+            raise ValueError("Decide first: a decision is pending")
+        for _ in range(int(years)):
+            await self.scheduler.turn(player)
+            if pending_decision(player, self.catalog) is not None:
+                break
+        return self._result(player)
+
+    async def preview(self, player_id, years):
+        player = await self._session(player_id)
+        _check_years(years)
+        return self._result(preview(player, int(years), self.catalog))
+
+    def close(self, player_id):
+        if self.sessions.pop(player_id, None) is None:
+            return False
+        player_module.get_store().forget(player_id)
+        return True
+
+    def stats(self):
+        return {**self.scheduler.stats(), "counters": self.profiler.counts()}
+
+    async def _session(self, player_id):
+        player = self.sessions.get(player_id)
+        if player is None:
+            loaded = await asyncio.to_thread(player_module.load_player, player_id)
+            # Another request may have loaded it while this one waited.
+            player = self.sessions.get(player_id)
+            if player is None:
+                if loaded is None:
+                    raise ValueError(f"No player {player_id!r}")
+                player = self._open(loaded)
+        self.sessions.move_to_end(player_id)
+        return player
+
+    def _open(self, player):
+        self.sessions[player["player_id"]] = player
+        while len(self.sessions) > self.max_sessions:
+            dropped, _ = self.sessions.popitem(last=False)
+            player_module.get_store().forget(dropped)
+        return player
+
+    def _result(self, player):
+        pending = pending_decision(player, self.catalog)
+        decision = None
+        if pending is not None:
+            kind, options = pending
+            decision = {"kind": kind, "options": [option["id"] for option in options]}
+        return {"player": player.to_dict(), "decision": decision}
+
+    async def serve_client(self, reader, writer):
+        """Answers one connection's requests in order until it closes."""
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # longer than MAX_REQUEST
+                    response = {"id": None, "ok": False, "error": "Request too long"}
+                    writer.write(_encode(response))
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response = {"id": None, "ok": False, "error": "Request is not valid JSON"}
+                else:
+                    response = await self.handle(request)
+                writer.write(_encode(response))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Starts listening; returns the asyncio server (port 0 picks a free port)."""
+        return await asyncio.start_server(self.serve_client, host, port, limit=MAX_REQUEST)
+
+
+def _check_years(years):
+    if not 1 <= int(years) <= MAX_YEARS:
+        raise ValueError(f"years must be between 1 and {MAX_YEARS}")
+
+
+def _encode(response):
+    return json.dumps(response, separators=(",", ":"), default=json_default).encode() + b"\n"
+
+
+async def serve(host, port, max_sessions, batch_window):
+    server = await GameServer(max_sessions=max_sessions, batch_window=batch_window).start(host, port)
+    address = server.sockets[0].getsockname()
+    print(f"FinLitFun server on {address[0]}:{address[1]}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Host FinLitFun games over a local socket.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address to listen on (default: localhost only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--db", help="player database to use instead of game/data/players.db")
+    parser.add_argument("--max-sessions", type=int, default=5000, help="players kept loaded at once")
+    parser.add_argument("--batch-window-ms", type=float, default=DEFAULT_BATCH_WINDOW * 1000,
+                        help="how long turns wait to be batched with other sessions' turns (0: no batching)")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        player_module.use_store(os.path.abspath(args.db))
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_sessions, args.batch_window_ms / 1000))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        player_module.get_store().close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""Simulate many FinLitFun lifetimes on every CPU core and stream the results.
+
+    python simulate.py --lives 1000000 --education random --investment Stocks --out lives.csv
+
+Lives are split into fixed-size shards, each with its own random streams,
+so a given --seed and --shard-size give the same lives for any --workers.
+Results are written in life order as shards finish, and never held in
+memory all at once.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # keep stdout clean for --out -
+
+from catalog import get_catalog
+from rng import new_seed
+from simulation import RANDOM, RETIREMENT_TARGET, Policy, simulate_shard
+
+COLUMNS = ("life", "education", "occupation", "investment", "retire_age",
+           "bank", "net_worth", "income", "health", "happiness")
+
+
+class CsvWriter:
+    def __init__(self, file):
+        self.file = file
+        self.writer = csv.writer(file)
+        self.writer.writerow(COLUMNS)
+
+    def write(self, columns):
+        rows = zip(*(columns[name].tolist() for name in COLUMNS))
+        self.writer.writerows(rows)
+
+    def close(self):
+        if self.file is sys.stdout:
+            self.file.flush()
+        else:
+            self.file.close()
+
+
+class JsonlWriter:
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, columns):
+        values = [columns[name].tolist() for name in COLUMNS]
+        self.file.writelines(json.dumps(dict(zip(COLUMNS, row)), separators=(",", ":")) + "\n"
+                             for row in zip(*values))
+
+    def close(self):
+        if self.file is sys.stdout:
+            self.file.flush()
+        else:
+            self.file.close()
+
+
+class NpzWriter:
+    """Writes each shard as a compressed .npz chunk in a directory."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.chunks = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, columns):
+        path = os.path.join(self.directory, f"lives-{self.chunks:06d}.npz")
+        np.savez_compressed(path, **{name: columns[name] for name in COLUMNS})
+        self.chunks += 1
+
+    def close(self):
+        pass
+
+
+def _init_worker():
+    get_catalog()
+
+
+def _run_shard(args):
+    return simulate_shard(*args)
+
+
+def shards(lives, shard_size):
+    """Yields (shard, size, first_life) covering lives in shard_size pieces."""
+    for shard, first in enumerate(range(0, lives, shard_size)):
+        yield shard, min(shard_size, lives - first), first
+
+
+def simulate(policy, lives, seed, shard_size, workers, end_age=99, target=RETIREMENT_TARGET):
+    """Yields the result columns of each shard in order, running up to workers shards at once."""
+    jobs = ((policy, seed, shard, size, first, 16, end_age, target) for shard, size, first in shards(lives, shard_size))
+    if workers <= 1:
+        for job in jobs:
+            yield _run_shard(job)
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+        pending = {}
+        done = {}
+        next_shard = 0
+        for shard, job in enumerate(jobs):
+            pending[pool.submit(_run_shard, job)] = shard
+            # Keep a bounded window in flight so memory stays flat for any --lives. Finished
+            # shards waiting on an earlier, slower one count too, or they could pile up in done.
+            while len(pending) + len(done) >= 2 * workers:
+                next_shard = yield from _collect(pending, done, next_shard)
+        while pending:
+            next_shard = yield from _collect(pending, done, next_shard)
+
+
+def _collect(pending, done, next_shard):
+    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in finished:
+        done[pending.pop(future)] = future.result()
+    while next_shard in done:
+        yield done.pop(next_shard)
+        next_shard += 1
+    return next_shard
+
+
+def open_writer(fmt, out):
+    if fmt == "npz":
+        if out == "-":
+            raise SystemExit("--format npz needs --out DIRECTORY")
+        return NpzWriter(out)
+    file = sys.stdout if out == "-" else open(out, "w", newline="")
+    return CsvWriter(file) if fmt == "csv" else JsonlWriter(file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lives", type=int, default=100_000, help="number of lifetimes to simulate")
+    parser.add_argument("--seed", type=int, help="run seed (random, and printed, if omitted)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (1 runs in-process)")
+    parser.add_argument("--shard-size", type=int, default=8192, help="lives per shard; changing it changes the results")
+    parser.add_argument("--education", default=RANDOM, help="education id, or 'random'")
+    parser.add_argument("--occupation", default=RANDOM, help="occupation id, or 'random'")
+    parser.add_argument("--investment", help="investment id, or 'random' (default: never invest)")
+    parser.add_argument("--policy", help="JSON file with education/occupation/investment keys (overrides the flags)")
+    parser.add_argument("--end-age", type=int, default=99, help="age every life is simulated to")
+    parser.add_argument("--target", type=float, default=RETIREMENT_TARGET, help="net worth that counts as retired")
+    parser.add_argument("--format", choices=("csv", "jsonl", "npz"), default="csv")
+    parser.add_argument("--out", default="-", help="output file ('-' for stdout), or directory for npz")
+    args = parser.parse_args(argv)
+
+    if args.policy:
+        with open(args.policy) as file:
+            policy = Policy.from_dict(json.load(file))
+    else:
+        policy = Policy(args.education, args.occupation, args.investment)
+    try:
+        policy.validate(get_catalog())
+    except ValueError as e:
+        parser.error(str(e))
+
+    seed = new_seed() if args.seed is None else args.seed
+    print(f"seed {seed}", file=sys.stderr)
+
+    writer = open_writer(args.format, args.out)
+    start = time.perf_counter()
+    written = 0
+    retired = 0
+    try:
+        for columns in simulate(policy, args.lives, seed, args.shard_size, args.workers, args.end_age, args.target):
+            writer.write(columns)
+            written += len(columns["life"])
+            retired += int((columns["retire_age"] >= 0).sum())
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"{written} lives in {elapsed:.2f} s ({written / elapsed:,.0f} lives/s, {args.workers} workers); "
+          f"{retired / max(written, 1):.1%} reached {args.target:,.0f}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+import numpy as np
+from catalog import get_catalog
+from portfolio import Portfolio
+from model import PLAYER_DTYPE, pack_records, unpack_records
+from loans import year_service
+from profiling import timed
+from rng import new_seed, shard_streams
+
+# Player fields an event's "impact" is allowed to touch in a batch.
+STATS = ("bank", "income", "health", "happiness")
+
+# Ages at which the phase functions ask for each decision.
+EDUCATION_AGE = 18
+CAREER_AGE = 23
+INVESTMENT_AGE = 35
+
+# Net worth (bank plus assets) at which a simulated life counts as retired.
+RETIREMENT_TARGET = 1_000_000
+
+# Value of a decision meaning "pick uniformly at random for each life".
+RANDOM = "random"
+
+
+class PlayerBatch:
+    """Struct-of-arrays state for N players, one row per player."""
+
+    def __init__(self, n, age=16, bank=200.0, income=0.0, health=90.0, happiness=50.0, income_rate=0.0,
+                 income_cap=np.inf):
+        records = np.empty(n, PLAYER_DTYPE)
+        records["age"] = age
+        records["bank"] = bank
+        records["income"] = income
+        records["health"] = health
+        records["happiness"] = happiness
+        records["income_rate"] = income_rate
+        records["income_cap"] = income_cap
+        self._bind(records)
+
+    def _bind(self, records):
+        # The per-player columns are views into one PLAYER_DTYPE array, so the
+        # batch converts to and from records (or their raw bytes) without copying.
+        self.records = records
+        for name in PLAYER_DTYPE.names:
+            setattr(self, name, records[name])
+
+        # One column per asset slot; empty slots hold zeros and never move. A
+        # holding pays asset_payout and empties its slot after the year it
+        # reaches age asset_matures (-1: never), as Portfolio.mature does.
+        self.asset_value = np.zeros((len(records), 0))
+        self.asset_rate = np.zeros((len(records), 0))
+        self.asset_volatility = np.zeros((len(records), 0))
+        self.asset_matures = np.zeros((len(records), 0), dtype=np.int64)
+        self.asset_payout = np.zeros((len(records), 0))
+
+        # One column per loan slot, with the age it was taken; zero principal means no loan.
+        self.loan_principal = np.zeros((len(records), 0))
+        self.loan_rate = np.zeros((len(records), 0))
+        self.loan_payment = np.zeros((len(records), 0))
+        self.loan_taken = np.zeros((len(records), 0), dtype=np.int64)
+
+    @classmethod
+    def from_records(cls, records):
+        """A batch whose columns are views into records, a PLAYER_DTYPE array; nothing is copied.
+
+        Works on np.frombuffer(data, PLAYER_DTYPE) of a writable buffer, such as a bytearray.
+        """
+        if records.dtype != PLAYER_DTYPE:
+            raise ValueError(f"Expected records of dtype {PLAYER_DTYPE}, got {records.dtype}")
+        batch = cls.__new__(cls)
+        batch._bind(records)
+        return batch
+
+    def __len__(self):
+        return self.age.shape[0]
+
+    def net_worth(self):
+        return self.bank + self.asset_value.sum(axis=1)
+
+    def add_asset(self, value, rate, volatility, matures=-1, payout=0.0):
+        """Append an asset column; scalars broadcast, zero value means no holding."""
+        n = len(self)
+        self.asset_value = np.hstack([self.asset_value, _column(value, n)])
+        self.asset_rate = np.hstack([self.asset_rate, _column(rate, n)])
+        self.asset_volatility = np.hstack([self.asset_volatility, _column(volatility, n)])
+        self.asset_matures = np.hstack([self.asset_matures, _column(matures, n).astype(np.int64)])
+        self.asset_payout = np.hstack([self.asset_payout, _column(payout, n)])
+
+    def add_loan(self, principal, rate, payment, taken):
+        """Append a loan column; scalars broadcast, zero principal means no loan."""
+        n = len(self)
+        self.loan_principal = np.hstack([self.loan_principal, _column(principal, n)])
+        self.loan_rate = np.hstack([self.loan_rate, _column(rate, n)])
+        self.loan_payment = np.hstack([self.loan_payment, _column(payment, n)])
+        self.loan_taken = np.hstack([self.loan_taken, _column(taken, n).astype(np.int64)])
+
+    @classmethod
+    def from_players(cls, players, catalog=None):
+        """Pack a list of players (Player objects or save dicts) into a batch.
+
+        Holdings keep their value, rate, volatility, maturity age and payout.
+        """
+        catalog = get_catalog() if catalog is None else catalog
+        batch = cls(len(players))
+        pack_records(players, batch.records)
+        for i, p in enumerate(players):
+            occupation = catalog.occupation(p["skills"]["education"], p["occupation"])
+            if occupation is not None:
+                batch.income_rate[i] = occupation["Income"]["Increase_Rate"]
+                batch.income_cap[i] = occupation["Income"]["Cap"]
+
+        portfolios = [Portfolio.of(p) for p in players]
+        width = max(map(len, portfolios), default=0)
+        batch.asset_value = np.zeros((len(players), width))
+        batch.asset_rate = np.zeros((len(players), width))
+        batch.asset_volatility = np.zeros((len(players), width))
+        batch.asset_matures = np.full((len(players), width), -1, dtype=np.int64)
+        batch.asset_payout = np.zeros((len(players), width))
+        for i, portfolio in enumerate(portfolios):
+            k = len(portfolio)
+            batch.asset_value[i, :k] = portfolio.value
+            batch.asset_rate[i, :k] = portfolio.rate
+            batch.asset_volatility[i, :k] = portfolio.volatility
+            batch.asset_matures[i, :k] = portfolio.matures
+            batch.asset_payout[i, :k] = portfolio.payout
+
+        width = max((len(p["liabilities"]) for p in players), default=0)
+        batch.loan_principal = np.zeros((len(players), width))
+        batch.loan_rate = np.zeros((len(players), width))
+        batch.loan_payment = np.zeros((len(players), width))
+        batch.loan_taken = np.zeros((len(players), width), dtype=np.int64)
+        for i, p in enumerate(players):
+            for j, loan in enumerate(p["liabilities"]):
+                batch.loan_principal[i, j] = loan["principal"]
+                batch.loan_rate[i, j] = loan["rate"]
+                batch.loan_payment[i, j] = loan["payment"]
+                batch.loan_taken[i, j] = loan["taken"]
+        return batch
+
+    def to_players(self, players):
+        """Write the batch state back into the players it was packed from; matured holdings are removed."""
+        unpack_records(self.records, players)
+        for i, p in enumerate(players):
+            portfolio = Portfolio.of(p)
+            portfolio.value[:] = self.asset_value[i, :len(portfolio)]
+            portfolio.mature(p["age"])
+        return players
+
+
+@timed("events.batch")
+def apply_random_events(batch, table, rng):
+    """Vectorized trigger_random_events: one draw per player, at most one event each."""
+    fired = table.sample_many(batch.age, rng.random(len(batch)))
+    impact = table.impact_matrix(STATS)[fired]
+    for j, field in enumerate(STATS):
+        getattr(batch, field)[:] += impact[:, j]
+    return batch
+
+
+def raise_income(income, rate, cap):
+    """A year's pay rise: income grows by rate but not past cap; an income already above cap stays put."""
+    return np.minimum(income + income * rate, np.maximum(cap, income))
+
+
+def income_path(income, rate, cap, years):
+    """Income after each of the next years pay rises, in closed form: income * (1 + rate)**k, held at cap.
+
+    Agrees with applying raise_income years times up to rounding.
+    """
+    k = np.arange(1, years + 1)
+    return np.minimum(income * (1.0 + rate) ** k, max(cap, income))
+
+
+def grow(batch, market):
+    """The part of a year that does not depend on events: age, income, debt service, bank and assets."""
+    batch.age += 1
+    batch.income[:] = raise_income(batch.income, batch.income_rate, batch.income_cap)
+    batch.bank += batch.income
+
+    if batch.loan_principal.shape[1]:
+        year = batch.age[:, None] - batch.loan_taken - 1
+        paid, _, _ = year_service(batch.loan_principal, batch.loan_rate, batch.loan_payment, year)
+        batch.bank -= paid.sum(axis=1)
+
+    if batch.asset_value.shape[1]:
+        shock = market.uniform(-1.0, 1.0, size=batch.asset_value.shape)
+        batch.asset_value += batch.asset_value * (batch.asset_rate + batch.asset_volatility * shock)
+        settle(batch)
+    return batch
+
+
+def settle(batch):
+    """Pays out the holdings that mature at each player's age and empties their slots."""
+    due = (batch.asset_matures >= 0) & (batch.asset_matures <= batch.age[:, None])
+    if due.any():
+        batch.bank += np.where(due, batch.asset_payout, 0.0).sum(axis=1)
+        for column in (batch.asset_value, batch.asset_rate, batch.asset_volatility, batch.asset_payout):
+            column[due] = 0.0
+        batch.asset_matures[due] = -1
+    return batch
+
+
+def step(batch, table, streams):
+    """Advance every player in the batch by one year, mirroring handle_turn."""
+    grow(batch, streams.market)
+    return apply_random_events(batch, table, streams.events)
+
+
+def run(batch, end_age, table, streams):
+    """Step the batch until every player has reached end_age."""
+    while batch.age.min() < end_age:
+        active = batch.age < end_age
+        if active.all():
+            step(batch, table, streams)
+        else:
+            sub = _take(batch, active)
+            step(sub, table, streams)
+            _put(batch, active, sub)
+    return batch
+
+
+def simulate_lifetimes(n, education, occupation, start_age=16, end_age=99, seed=None, catalog=None):
+    """Simulate n lifetimes of one education/occupation path from start_age to end_age."""
+    catalog = get_catalog() if catalog is None else catalog
+    entry = catalog.occupation(education, occupation)
+    if entry is None:
+        raise KeyError(f"No occupation {occupation!r} for education {education!r}")
+
+    income = entry["Income"]
+    batch = PlayerBatch(n, age=start_age, income=income["Starting"], income_rate=income["Increase_Rate"],
+                        income_cap=income["Cap"])
+    seed = new_seed() if seed is None else seed
+    return run(batch, end_age, catalog.event_table, shard_streams(seed, 0))
+
+
+class Policy:
+    """The decisions every simulated life makes, by catalog id or RANDOM.
+
+    investment may also be None, for lives that never invest. A fixed
+    occupation needs a fixed education, since occupations are per path.
+    """
+
+    def __init__(self, education=RANDOM, occupation=RANDOM, investment=None):
+        self.education = education
+        self.occupation = occupation
+        self.investment = investment
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{key: data[key] for key in ("education", "occupation", "investment") if key in data})
+
+    def validate(self, catalog):
+        """Raises ValueError if a decision names something the catalog does not have."""
+        if self.education != RANDOM and catalog.education_path(self.education) is None:
+            raise ValueError(f"Unknown education {self.education!r}")
+        if self.occupation != RANDOM:
+            if self.education == RANDOM:
+                raise ValueError("A fixed occupation needs a fixed education")
+            if catalog.occupation(self.education, self.occupation) is None:
+                raise ValueError(f"No occupation {self.occupation!r} for education {self.education!r}")
+        if self.investment not in (None, RANDOM) and catalog.investment(self.investment) is None:
+            raise ValueError(f"Unknown investment {self.investment!r}")
+
+    def plan(self, n, catalog, rng):
+        """Resolves the policy into a LifePlan for n lives, drawing random choices from rng."""
+        return LifePlan(self, n, catalog, rng)
+
+
+class LifePlan:
+    """Per-life decisions of a Policy, resolved to arrays applied by age.
+
+    Mirrors the phase functions: education is paid for at 18, high school
+    leavers start work straight away, everyone else starts at 23 with a
+    first-year bonus, and the investment is bought at 35 and grows at the
+    yearly rate implied by its payout.
+    """
+
+    def __init__(self, policy, n, catalog, rng):
+        paths = catalog.education
+        groups = [catalog.occupations_for(path["id"]) for path in paths]
+        investments = catalog.investments
+
+        if policy.education == RANDOM:
+            self.education = rng.integers(len(paths), size=n)
+        else:
+            self.education = np.full(n, [p["id"] for p in paths].index(policy.education))
+
+        self.occupation = np.zeros(n, dtype=np.int64)
+        if policy.occupation == RANDOM:
+            sizes = np.array([len(group) for group in groups])
+            self.occupation[:] = (rng.random(n) * sizes[self.education]).astype(np.int64)
+        else:
+            group = groups[self.education[0]]
+            self.occupation[:] = [o["id"] for o in group].index(policy.occupation)
+
+        if policy.investment is None:
+            self.investment = np.full(n, -1)
+        elif policy.investment == RANDOM:
+            self.investment = rng.integers(len(investments), size=n)
+        else:
+            self.investment = np.full(n, [i["id"] for i in investments].index(policy.investment))
+
+        self.education_ids = np.array([p["id"] for p in paths])
+        self.occupation_ids = [np.array([o["id"] for o in group]) for group in groups]
+        self.investment_ids = np.array([i["id"] for i in investments] + [""])
+
+        # Flatten (education, occupation) into one index for the income tables.
+        offsets = np.cumsum([0] + [len(group) for group in groups])
+        flat = offsets[self.education] + self.occupation
+        jobs = [o for group in groups for o in group]
+        self.education_cost = np.array([p["Cost"] for p in paths], dtype=np.float64)[self.education]
+        self.starting_income = np.array([o["Income"]["Starting"] for o in jobs], dtype=np.float64)[flat]
+        self.income_rate = np.array([o["Income"]["Increase_Rate"] for o in jobs], dtype=np.float64)[flat]
+        self.income_cap = np.array([o["Income"]["Cap"] for o in jobs], dtype=np.float64)[flat]
+        self.job_age = np.where(self.education_ids[self.education] == "High School", EDUCATION_AGE, CAREER_AGE)
+        self.signing_bonus = np.where(self.job_age == CAREER_AGE, self.starting_income, 0.0)
+
+        cost = np.array([i["cost"] for i in investments] + [0.0], dtype=np.float64)
+        payout = np.array([catalog.investment_payout(i) for i in investments] + [0.0], dtype=np.float64)
+        time = np.array([i.get("time", 0) for i in investments] + [0], dtype=np.int64)
+        years = np.maximum(time, 1).astype(np.float64)
+        rate = np.zeros_like(cost)
+        held = cost > 0
+        rate[held] = (payout[held] / cost[held]) ** (1 / years[held]) - 1
+        self.investment_cost = cost[self.investment]
+        self.investment_rate = rate[self.investment]
+        self.investment_matures = np.where(time > 0, INVESTMENT_AGE + time, -1)[self.investment]
+        self.investment_payout = payout[self.investment]
+
+    def apply(self, batch, slot=0):
+        """Applies the decisions due at each life's current age; investments go in asset column slot."""
+        age = batch.age
+        at = age == EDUCATION_AGE
+        if at.any():
+            batch.bank[at] -= self.education_cost[at]
+
+        start = age == self.job_age
+        if start.any():
+            batch.bank[start] += self.signing_bonus[start]
+            batch.income[start] = self.starting_income[start]
+            batch.income_rate[start] = self.income_rate[start]
+            batch.income_cap[start] = self.income_cap[start]
+
+        buy = (age == INVESTMENT_AGE) & (self.investment >= 0)
+        if buy.any():
+            batch.bank[buy] -= self.investment_cost[buy]
+            batch.asset_value[buy, slot] = self.investment_cost[buy]
+            batch.asset_rate[buy, slot] = self.investment_rate[buy]
+            batch.asset_matures[buy, slot] = self.investment_matures[buy]
+            batch.asset_payout[buy, slot] = self.investment_payout[buy]
+        return batch
+
+    def columns(self):
+        """Decision names per life, for output."""
+        occupation = np.empty(len(self.education), dtype=object)
+        for e, ids in enumerate(self.occupation_ids):
+            mine = self.education == e
+            occupation[mine] = ids[self.occupation[mine]]
+        return {
+            "education": self.education_ids[self.education],
+            "occupation": occupation.astype(str),
+            "investment": self.investment_ids[self.investment],
+        }
+
+
+def simulate_shard(policy, seed, shard, size, first_life=None, start_age=16, end_age=99,
+                   target=RETIREMENT_TARGET, catalog=None):
+    """Simulate one shard of a run: size lives following policy, from start_age to end_age.
+
+    Each shard draws from its own streams, so a run gives the same results
+    however its shards are spread over processes. Returns a dict of column
+    arrays, one row per life, including the age each life first reached
+    target net worth (-1 if it never did).
+    """
+    catalog = get_catalog() if catalog is None else catalog
+    first_life = shard * size if first_life is None else first_life
+    streams = shard_streams(seed, shard)
+    plan = policy.plan(size, catalog, streams.decisions)
+
+    batch = PlayerBatch(size, age=start_age)
+    batch.add_asset(0.0, 0.0, 0.0)
+    retire_age = np.full(size, -1, dtype=np.int64)
+    table = catalog.event_table
+
+    plan.apply(batch)
+    for _ in range(start_age, end_age):
+        step(batch, table, streams)
+        plan.apply(batch)
+        net_worth = batch.net_worth()
+        reached = (retire_age < 0) & (net_worth >= target)
+        retire_age[reached] = batch.age[reached]
+
+    return {
+        "life": np.arange(first_life, first_life + size, dtype=np.int64),
+        **plan.columns(),
+        "retire_age": retire_age,
+        "bank": batch.bank,
+        "net_worth": batch.net_worth(),
+        "income": batch.income,
+        "health": batch.health,
+        "happiness": batch.happiness,
+    }
+
+
+def _column(x, n):
+    return np.broadcast_to(np.asarray(x, dtype=np.float64), (n,))[:, None]
+
+
+# Batch attributes that are not views into batch.records.
+_COLUMNS = ("asset_value", "asset_rate", "asset_volatility", "asset_matures", "asset_payout", "loan_principal", "loan_rate", "loan_payment", "loan_taken")
+
+
+def _take(batch, mask):
+    sub = PlayerBatch.from_records(batch.records[mask])
+    for name in _COLUMNS:
+        setattr(sub, name, getattr(batch, name)[mask])
+    return sub
+
+
+def _put(batch, mask, sub):
+    batch.records[mask] = sub.records
+    for name in _COLUMNS:
+        getattr(batch, name)[mask] = getattr(sub, name)
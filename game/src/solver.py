@@ -0,0 +1,337 @@
+"""Best-path solver: the earliest expected retirement the game's choices allow.
+
+    python solver.py --bank 200 --age 16
+
+Net worth is the sum of a deterministic part, set by the choices (education
+cost, income growth, bonuses, the investment), and the bank impacts of
+random events so far. Only the second part is random, so it is the DP
+state: a grid of event totals, advanced a year at a time through the exact
+per-age event probabilities. Values are computed backwards from end_age,
+and at every decision age each grid state takes the choice with the lowest
+expected retirement age, so the policy may react to how lucky a life has
+been. Subtrees shared between branches are solved once.
+
+Limits of the model:
+
+- Only net worth counts. Events also move health and happiness, but
+  nothing in the game ties those to money or retirement, so they are not
+  part of the state.
+- Of event impacts, only "bank" is used. An "income" impact would compound
+  through later raises and is ignored; the shipped events.json has none,
+  so a catalog that adds one makes the answer approximate.
+- Investments grow and pay out at maturity through simulation.grow, as in
+  the simulator; that part is deterministic because catalog investments
+  have no volatility.
+- Loans and assets.json holdings are not choices here, so starting
+  profiles are assumed to have neither.
+"""
+import argparse
+import math
+
+import numpy as np
+
+from catalog import get_catalog, on_reload
+from simulation import EDUCATION_AGE, INVESTMENT_AGE, RETIREMENT_TARGET, PlayerBatch, Policy, grow
+
+
+class Decision:
+    """One choice on the best path, and the share of lives at that age making it."""
+
+    def __init__(self, age, kind, choice, share):
+        self.age = age
+        self.kind = kind
+        self.choice = choice
+        self.share = share
+
+    def __repr__(self):
+        return f"Decision({self.age}, {self.kind!r}, {self.choice!r}, share={self.share:.2f})"
+
+
+class Solution:
+    """The optimal policy's outcome for one starting profile.
+
+    expected_age counts lives that never reach the target as end_age + 1.
+    path follows the most likely state through each decision, which is what
+    most students taking the best policy would actually be asked to choose.
+    """
+
+    def __init__(self, start_age, bank, expected_age, retire_probability, path):
+        self.start_age = start_age
+        self.bank = bank
+        self.expected_age = expected_age
+        self.retire_probability = retire_probability
+        self.path = path
+
+    def to_dict(self):
+        return {
+            "start_age": self.start_age,
+            "bank": self.bank,
+            "expected_age": self.expected_age,
+            "retire_probability": self.retire_probability,
+            "path": [vars(decision) for decision in self.path],
+        }
+
+
+class RetirementSolver:
+    """Solves the education, career and investment tree for earliest retirement."""
+
+    def __init__(self, catalog=None, target=RETIREMENT_TARGET, end_age=99, min_bank=0.0, max_buckets=50_000):
+        self.catalog = get_catalog() if catalog is None else catalog
+        self.target = target
+        self.end_age = end_age
+        self.never = end_age + 1
+        self.educations = [path["id"] for path in self.catalog.education]
+        self.investments = [None] + [i["id"] for i in self.catalog.investments]
+
+        self._paths = {}
+        for education in self.educations:
+            for occupation in self.catalog.occupations_for(education):
+                for investment in self.investments:
+                    key = (education, occupation["id"], investment)
+                    self._paths[key] = self._deterministic_path(*key)
+        self._build_grid(min_bank, max_buckets)
+
+        self._investment_values = {}
+        self._career_values = {}
+        self._education_values = None
+        self._solutions = {}
+
+    def solve(self, start_age=16, bank=200.0):
+        """Returns the Solution for a player starting at start_age with bank."""
+        if start_age > EDUCATION_AGE:
+            raise ValueError(f"Profiles must start by age {EDUCATION_AGE}, before the first decision")
+        if bank < self.grid[0]:
+            raise ValueError(f"Starting bank below the solver's min_bank {self.grid[0]:.0f}")
+
+        key = (start_age, self._bucket(bank))
+        if key not in self._solutions:
+            values, _ = self._educations()
+            values = self._back(values, self._zero_path, EDUCATION_AGE, start_age)
+            age, probability = values[:, key[1]]
+            self._solutions[key] = Solution(start_age, bank, float(age), float(probability),
+                                            self._best_path(start_age, key[1]))
+        return self._solutions[key]
+
+    # Decision nodes, each solved once and shared by every branch above it.
+
+    def _educations(self):
+        if self._education_values is None:
+            options = []
+            wealth = []
+            for education in self.educations:
+                values, _, job_age = self._careers(education)
+                path = self._paths[self._any_key(education)]
+                options.append(self._back(values, path, job_age, EDUCATION_AGE))
+                wealth.append(max(p[-1] for key, p in self._paths.items() if key[0] == education))
+            self._education_values = _best(options, wealth)
+        return self._education_values
+
+    def _careers(self, education):
+        if education not in self._career_values:
+            occupations = [o["id"] for o in self.catalog.occupations_for(education)]
+            job_age = int(self._plan(education, occupations[0], None).job_age[0])
+            options = []
+            for occupation in occupations:
+                values, _ = self._invest(education, occupation)
+                options.append(self._back(values, self._paths[education, occupation, None], INVESTMENT_AGE, job_age))
+            values, choice = _best(options, [self._paths[education, o, None][-1] for o in occupations])
+            self._career_values[education] = (values, choice, job_age)
+        return self._career_values[education]
+
+    def _invest(self, education, occupation):
+        key = (education, occupation)
+        if key not in self._investment_values:
+            options = []
+            wealth = []
+            for investment in self.investments:
+                path = self._paths[education, occupation, investment]
+                final = self._settle(np.array([np.full(len(self.grid), self.never), np.zeros(len(self.grid))]),
+                                     path, self.end_age)
+                options.append(self._back(final, path, self.end_age, INVESTMENT_AGE))
+                wealth.append(path[-1])
+            self._investment_values[key] = _best(options, wealth)
+        return self._investment_values[key]
+
+    # Value iteration over the event-total grid.
+
+    def _back(self, values, path, age, until):
+        """Carries (expected age, retire probability) rows back from age to until."""
+        while age > until:
+            values = self._settle(self._expect(values, age), path, age - 1)
+            age -= 1
+        return values
+
+    def _settle(self, values, path, age):
+        retired = self.grid + path[age] >= self.target
+        values = values.copy()
+        values[0, retired] = age
+        values[1, retired] = 1.0
+        return values
+
+    def _expect(self, values, age):
+        """Expected values at age - 1 over the events of the year into age."""
+        shifts, probabilities = self._kernels[age]
+        n = len(self.grid)
+        pad = self._pad
+        padded = np.pad(values, ((0, 0), (pad, pad)), mode="edge")
+        out = np.zeros_like(values)
+        for shift, probability in zip(shifts, probabilities):
+            out += probability * padded[:, pad + shift:pad + shift + n]
+        return out
+
+    def _spread(self, dist, age):
+        """Distribution over the grid after the events of the year into age."""
+        shifts, probabilities = self._kernels[age]
+        n = len(dist)
+        pad = self._pad
+        out = np.zeros(n + 2 * pad)
+        for shift, probability in zip(shifts, probabilities):
+            out[pad + shift:pad + shift + n] += probability * dist
+        out[pad] += out[:pad].sum()
+        out[pad + n - 1] += out[pad + n:].sum()
+        return out[pad:pad + n]
+
+    # Best path, following the most likely state forward through each decision.
+
+    def _best_path(self, start_age, bucket):
+        dist = np.zeros(len(self.grid))
+        dist[bucket] = 1.0
+        dist = self._forward(dist, start_age, EDUCATION_AGE)
+        path = []
+
+        _, choice = self._educations()
+        education = self._pick(dist, choice, EDUCATION_AGE, "education", self.educations, self._zero_path, path)
+        if education is None:
+            return path
+        _, choice, job_age = self._careers(education)
+        dist = self._forward(dist, EDUCATION_AGE, job_age)
+        occupations = [o["id"] for o in self.catalog.occupations_for(education)]
+        occupation = self._pick(dist, choice, job_age, "occupation", occupations,
+                                self._paths[self._any_key(education)], path)
+        if occupation is None:
+            return path
+
+        _, choice = self._invest(education, occupation)
+        dist = self._forward(dist, job_age, INVESTMENT_AGE)
+        self._pick(dist, choice, INVESTMENT_AGE, "investment", self.investments,
+                   self._paths[education, occupation, None], path)
+        return path
+
+    def _forward(self, dist, age, until):
+        while age < until:
+            age += 1
+            dist = self._spread(dist, age)
+        return dist
+
+    def _pick(self, dist, choice, age, kind, names, before, path):
+        """Adds the choice made in the likeliest state still working at age; None once all have retired."""
+        # The state the choice is made from is the one the year ended in, before it takes effect.
+        dist = np.where(self.grid + before[age] < self.target, dist, 0.0)
+        if not dist.any():
+            return None
+        index = choice[np.argmax(dist)]
+        path.append(Decision(age, kind, names[index], float(dist[choice == index].sum() / dist.sum())))
+        return names[index]
+
+    # Setup.
+
+    def _plan(self, education, occupation, investment):
+        return Policy(education, occupation, investment).plan(1, self.catalog, None)
+
+    def _deterministic_path(self, education, occupation, investment):
+        """Net worth by age with no random events, starting from zero at age 0."""
+        plan = self._plan(education, occupation, investment)
+        batch = PlayerBatch(1, age=0, bank=0.0)
+        batch.add_asset(0.0, 0.0, 0.0)
+        market = np.random.default_rng(0)  # catalog investments have no volatility
+        path = np.zeros(self.end_age + 1)
+        for age in range(1, self.end_age + 1):
+            grow(batch, market)
+            plan.apply(batch)
+            path[age] = batch.net_worth()[0]
+        return path
+
+    def _any_key(self, education):
+        return (education, self.catalog.occupations_for(education)[0]["id"], None)
+
+    def _build_grid(self, min_bank, max_buckets):
+        table = self.catalog.event_table
+        impacts = np.array([event["impact"].get("bank", 0.0) for event in table.events], dtype=np.float64)
+        lowest = highest = 0.0
+        for age in range(1, self.end_age + 1):
+            indices, _ = table.probabilities(age)
+            lowest += min(0.0, *impacts[indices]) if len(indices) else 0.0
+            highest += max(0.0, *impacts[indices]) if len(indices) else 0.0
+
+        low = min(0.0, min_bank) + lowest
+        high = self.target - min(path.min() for path in self._paths.values())
+        nonzero = [abs(int(round(v))) for v in impacts if round(v)]
+        resolution = math.gcd(*nonzero) if nonzero else 1
+        resolution = max(resolution, (high - low) / max_buckets)
+        self.resolution = resolution
+        self.grid = low + resolution * np.arange(int(math.ceil((high - low) / resolution)) + 1)
+        self._zero_path = np.zeros(self.end_age + 1)
+
+        self._kernels = {}
+        self._pad = 0
+        for age in range(1, self.end_age + 1):
+            indices, probabilities = table.probabilities(age)
+            shifts = np.rint(impacts[indices] / resolution).astype(np.int64)
+            shifts = np.append(shifts, 0)
+            probabilities = np.append(probabilities, 1.0 - probabilities.sum())
+            # Events that leave the bank alone all land on the same shift.
+            shifts, merged = np.unique(shifts, return_inverse=True)
+            self._kernels[age] = (shifts, np.bincount(merged, weights=probabilities))
+            if len(shifts):
+                self._pad = max(self._pad, int(np.abs(shifts).max()))
+
+    def _bucket(self, bank):
+        return int(np.clip(np.rint((bank - self.grid[0]) / self.resolution), 0, len(self.grid) - 1))
+
+
+def _best(options, wealth):
+    """Element-wise best of several (age, probability) value arrays: (values, index of the choice).
+
+    Ties on expected age go to the option ending with the most money.
+    """
+    stacked = np.array(options)
+    rank = np.argsort(np.argsort(wealth)) / len(wealth)
+    choice = (stacked[:, 0] - 1e-9 * rank[:, None]).argmin(axis=0)
+    return stacked[choice, :, np.arange(stacked.shape[2])].T, choice
+
+
+_solver = None
+
+
+def get_solver():
+    """Returns the shared solver for the loaded catalog, building it on first use."""
+    global _solver
+    if _solver is None:
+        _solver = RetirementSolver()
+    return _solver
+
+
+def _forget_solver(catalog):
+    global _solver
+    _solver = None
+
+
+on_reload(_forget_solver)  # the next get_solver() solves with the new game data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--age", type=int, default=16, help="starting age (at most 18)")
+    parser.add_argument("--bank", type=float, default=200.0, help="starting bank balance")
+    parser.add_argument("--target", type=float, default=RETIREMENT_TARGET, help="net worth that counts as retired")
+    args = parser.parse_args(argv)
+
+    solution = RetirementSolver(target=args.target).solve(args.age, args.bank)
+    for decision in solution.path:
+        print(f"Age {decision.age}: {decision.kind} -> {decision.choice} ({decision.share:.0%} of lives)")
+    print(f"Expected retirement age {solution.expected_age:.2f} "
+          f"({solution.retire_probability:.1%} reach {args.target:,.0f})")
+
+
+if __name__ == "__main__":
+    main()
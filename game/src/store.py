@@ -0,0 +1,196 @@
+import copy
+import json
+import sqlite3
+import threading
+import time
+from persistence import WriteBehind, diff_player, apply_delta, json_default
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    player_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    age INTEGER,
+    updated_at REAL NOT NULL,
+    seq INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS players_name ON players (name, updated_at);
+CREATE INDEX IF NOT EXISTS players_updated ON players (updated_at);
+CREATE TABLE IF NOT EXISTS journal (
+    player_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    delta TEXT NOT NULL,
+    PRIMARY KEY (player_id, seq)
+) WITHOUT ROWID;
+"""
+
+
+class PlayerStore(WriteBehind):
+    """Player profiles in one SQLite database, keyed by player_id.
+
+    Saves follow the same snapshot-plus-journal scheme as SaveJournal: record()
+    queues only the changed fields, and the writer thread commits every queued
+    delta for every player in a single transaction. Once a player has
+    compact_every journal rows they are folded back into the snapshot column.
+    One connection is shared by the caller and the writer under a lock.
+    """
+
+    def __init__(self, path, compact_every=64):
+        self.path = path
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+        # Caller-side state per player, used for diffing. The writer adds a
+        # player to _stale when a commit of theirs fails, so their next record
+        # writes every field again.
+        self._last = {}
+        self._seq = {}
+        self._stale = set()
+
+        super().__init__(name="player-store")
+
+    def record(self, player, new=False):
+        """Queue the changes to player since it was last recorded or loaded.
+
+        new means the player was just created, so there is no saved history
+        to look up first (that lookup waits for queued saves to be committed).
+        """
+        player_id = player["player_id"]
+        if player_id in self._stale:
+            self._stale.discard(player_id)
+            self._last.pop(player_id, None)
+        last = self._last.get(player_id)
+        if last is None:
+            # Unknown to this process (or forgotten): continue after whatever the database holds.
+            if not new:
+                self.flush()
+            self._seq[player_id] = 0 if new else self._max_seq(player_id)
+            last = {}
+        delta = diff_player(last, player)
+        if not delta:
+            return
+        self._last[player_id] = apply_delta(dict(last), delta)
+        self._seq[player_id] += 1
+        self.submit((player_id, self._seq[player_id], player["name"], player.get("age"), delta))
+
+    def save_many(self, players):
+        """Queue several players; they are committed together in one transaction."""
+        for player in players:
+            self.record(player)
+
+    def load(self, player_id, build=None):
+        """Rebuild a player from its snapshot and journal rows, or None if unknown.
+
+        build, if given, turns the saved dict into what the caller will record
+        (such as Player.from_dict), so the next save is diffed against the
+        same types and not rewritten in full.
+        """
+        self.flush()
+        with self._lock:
+            row = self._conn.execute("SELECT seq, data FROM players WHERE player_id = ?", (player_id,)).fetchone()
+            if row is None:
+                return None
+            seq, data = row
+            player = json.loads(data)
+            for entry_seq, delta in self._conn.execute(
+                "SELECT seq, delta FROM journal WHERE player_id = ? AND seq > ? ORDER BY seq", (player_id, seq)
+            ):
+                apply_delta(player, json.loads(delta))
+                seq = entry_seq
+
+        if build is not None:
+            player = build(player)
+        self._last[player_id] = {key: copy.deepcopy(value) for key, value in player.items()}
+        self._seq[player_id] = seq
+        return player
+
+    def forget(self, player_id):
+        """Drop what is kept in memory for diffing player_id's saves; the save itself is kept."""
+        self._last.pop(player_id, None)
+        self._seq.pop(player_id, None)
+        self._stale.discard(player_id)
+
+    def find_by_name(self, name):
+        """Return (player_id, name, age, updated_at) for profiles with name, newest first."""
+        self.flush()
+        with self._lock:
+            return self._conn.execute(
+                "SELECT player_id, name, age, updated_at FROM players WHERE name = ? ORDER BY updated_at DESC", (name,)
+            ).fetchall()
+
+    def list_profiles(self, limit=50, offset=0):
+        """Return a page of (player_id, name, age, updated_at), most recently played first."""
+        self.flush()
+        with self._lock:
+            return self._conn.execute(
+                "SELECT player_id, name, age, updated_at FROM players ORDER BY updated_at DESC LIMIT ? OFFSET ?",
+                (limit, offset),
+            ).fetchall()
+
+    def count(self):
+        self.flush()
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM players").fetchone()[0]
+
+    def close(self):
+        super().close()
+        with self._lock:
+            self._conn.close()
+
+    def commit(self, records):
+        now = time.time()
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(
+                    "INSERT INTO players (player_id, name, age, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (player_id) DO UPDATE SET name = excluded.name, age = excluded.age, "
+                    "updated_at = excluded.updated_at",
+                    [(player_id, name, age, now) for player_id, _, name, age, _ in records],
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO journal (player_id, seq, delta) VALUES (?, ?, ?)",
+                    [(player_id, seq, json.dumps(delta, separators=(",", ":"), default=json_default)) for player_id, seq, _, _, delta in records],
+                )
+                for player_id in {record[0] for record in records}:
+                    self._maybe_compact(player_id)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def failed(self, records):
+        self._stale.update(record[0] for record in records)
+
+    def _maybe_compact(self, player_id):
+        conn = self._conn
+        seq, data = conn.execute("SELECT seq, data FROM players WHERE player_id = ?", (player_id,)).fetchone()
+        pending = conn.execute("SELECT COUNT(*) FROM journal WHERE player_id = ? AND seq > ?", (player_id, seq)).fetchone()[0]
+        if pending < self.compact_every:
+            return
+        rows = conn.execute(
+            "SELECT seq, delta FROM journal WHERE player_id = ? AND seq > ? ORDER BY seq", (player_id, seq)
+        ).fetchall()
+        player = json.loads(data)
+        for entry_seq, delta in rows:
+            apply_delta(player, json.loads(delta))
+            seq = entry_seq
+        conn.execute(
+            "UPDATE players SET seq = ?, data = ? WHERE player_id = ?",
+            (seq, json.dumps(player, separators=(",", ":")), player_id),
+        )
+        conn.execute("DELETE FROM journal WHERE player_id = ? AND seq <= ?", (player_id, seq))
+
+    def _max_seq(self, player_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(seq) FROM (SELECT seq FROM players WHERE player_id = ? "
+                "UNION ALL SELECT seq FROM journal WHERE player_id = ?)",
+                (player_id, player_id),
+            ).fetchone()
+        return row[0] or 0
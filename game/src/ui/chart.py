@@ -0,0 +1,101 @@
+import numpy as np
+import pygame
+
+from history import FIELDS
+
+# Years across the chart's width; older years scroll off the left edge.
+YEARS = 80
+
+LINE_WIDTH = 2
+
+
+class HistoryChart:
+    """Line charts of a History, one lane per field, kept on a cached surface.
+
+    update() only draws what is new: one segment per lane for each year
+    appended since the last call. Once the chart is full it scrolls the
+    surface left by a year instead of replotting. A lane's scale is fitted
+    with headroom and refitted (a full replot) only when a value leaves it,
+    which happens a handful of times in a life, so the cost of a turn does
+    not grow with the number of years shown.
+    """
+
+    def __init__(self, size, lanes, years=YEARS, padding=6):
+        """lanes is a list of (History field, color), drawn top to bottom."""
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.lanes = [(FIELDS.index(name), color) for name, color in lanes]
+        self.step = max(1, (size[0] - LINE_WIDTH) // (years - 1))
+        self.years = years
+        self.lane_height = size[1] // len(lanes)
+        self.padding = padding
+        self.ranges = []
+        self.version = 0
+        self._history = None
+        self._drawn = 0
+
+    def lane_rect(self, lane):
+        """The surface area of lane number lane."""
+        return pygame.Rect(0, lane * self.lane_height, self.surface.get_width(), self.lane_height)
+
+    def update(self, history):
+        """Brings the surface up to date with history; returns True if it changed."""
+        if history is not self._history or history.total < self._drawn:
+            return self._replot(history)
+        new = history.total - self._drawn
+        if not new:
+            return False
+        if new >= self.years or not self._drawn:
+            return self._replot(history)
+        rows = history.tail(new + 1)  # from the last year drawn
+        for (column, _), (low, high) in zip(self.lanes, self.ranges):
+            values = rows[:, column]
+            if values.min() < low or values.max() > high:
+                return self._replot(history)
+
+        shift = (max(0, history.total - self.years) - max(0, self._drawn - self.years)) * self.step
+        if shift:
+            width, height = self.surface.get_size()
+            self.surface.scroll(-shift, 0)
+            self.surface.fill((0, 0, 0, 0), (width - shift, 0, shift, height))
+        x = self._x(self._drawn - 1 + np.arange(len(rows)), history.total)
+        for lane, (column, color) in enumerate(self.lanes):
+            y = self._y(lane, rows[:, column])
+            pygame.draw.lines(self.surface, color, False, list(zip(x.tolist(), y.tolist())), LINE_WIDTH)
+        self._drawn = history.total
+        self.version += 1
+        return True
+
+    def _replot(self, history):
+        self._history = history
+        self._drawn = history.total
+        self.version += 1
+        self.surface.fill((0, 0, 0, 0))
+        rows = history.tail(self.years)
+        self.ranges = [_fit(rows[:, column]) for column, _ in self.lanes]
+        if not len(rows):
+            return True
+        x = self._x(history.total - len(rows) + np.arange(len(rows)), history.total)
+        for lane, (column, color) in enumerate(self.lanes):
+            points = list(zip(x.tolist(), self._y(lane, rows[:, column]).tolist()))
+            if len(points) > 1:
+                pygame.draw.lines(self.surface, color, False, points, LINE_WIDTH)
+            else:
+                pygame.draw.circle(self.surface, color, points[0], LINE_WIDTH)
+        return True
+
+    def _x(self, index, total):
+        """Pixel columns of the years numbered index (0 is the first ever appended)."""
+        return (index - max(0, total - self.years)) * self.step + LINE_WIDTH // 2
+
+    def _y(self, lane, values):
+        low, high = self.ranges[lane]
+        top = lane * self.lane_height + self.padding
+        return np.rint(top + (high - values) / (high - low) * (self.lane_height - 2 * self.padding)).astype(int)
+
+
+def _fit(values):
+    """A (low, high) scale covering values and zero, with room to grow by half again."""
+    low = min(float(values.min()), 0.0) if len(values) else 0.0
+    high = max(float(values.max()), 0.0) if len(values) else 1.0
+    span = max(high - low, 1.0)
+    return (low - span / 2 if low < 0 else low), high + span / 2
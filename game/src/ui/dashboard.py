@@ -1,202 +1,260 @@
+import logging
 import pygame
-import pygame.gfxdraw
-import sys
-from pygame.locals import QUIT, KEYDOWN, K_s, MOUSEBUTTONDOWN
+from pygame.locals import KEYDOWN, K_f, K_s, K_F3, K_F4, MOUSEBUTTONDOWN
 from player import save_player
-from utils import draw_status_bar, load_json, DataPath
+from utils import DataPath
+from ui.widgets import draw_status_bar
+from catalog import get_catalog, on_reload, reload_catalog
+from ui.text import get_font, render_text, text_cache
+from ui.chart import HistoryChart
+from history import History
+from ui.skin import Skin
+from ui.scenes import Scene
 from phases import early_life_phase, young_adult_phase, mid_life_phase
-from handle import handle_turn
+from handle import fast_forward, handle_turn
+from loans import schedule
+from profiling import get_profiler, timed
+
+log = logging.getLogger(__name__)
 
 FONT_VIRGIL = str(DataPath.FONT_VIRGIL.value)
 
 
-def draw_rounded_rect(surface, color, rect, corner_radius):
-    """Draws a rectangle with rounded corners."""
-    pygame.gfxdraw.aacircle(surface, rect.x + corner_radius, rect.y + corner_radius, corner_radius, color)
-    pygame.gfxdraw.aacircle(surface, rect.right - corner_radius - 1, rect.y + corner_radius, corner_radius, color)
-    pygame.gfxdraw.aacircle(surface, rect.x + corner_radius, rect.bottom - corner_radius - 1, corner_radius, color)
-    pygame.gfxdraw.aacircle(surface, rect.right - corner_radius - 1, rect.bottom - corner_radius - 1, corner_radius, color)
-
-    pygame.gfxdraw.filled_circle(surface, rect.x + corner_radius, rect.y + corner_radius, corner_radius, color)
-    pygame.gfxdraw.filled_circle(surface, rect.right - corner_radius - 1, rect.y + corner_radius, corner_radius, color)
-    pygame.gfxdraw.filled_circle(surface, rect.x + corner_radius, rect.bottom - corner_radius - 1, corner_radius, color)
-    pygame.gfxdraw.filled_circle(surface, rect.right - corner_radius - 1, rect.bottom - corner_radius - 1, corner_radius, color)
-
-    pygame.draw.rect(surface, color, rect.inflate(-2*corner_radius, 0))
-    pygame.draw.rect(surface, color, rect.inflate(0, -2*corner_radius))
-
-
-def draw_game_menu(win, width, height, margin, player):
-    """Draws the game menu box (left half of the screen)."""
-    left_box_width = width // 2 - 2 * margin
-    left_box_height = height - 2 * margin
-    left_box_x = margin
-    left_box_y = margin
-
-    left_box = pygame.Surface((left_box_width, left_box_height), pygame.SRCALPHA)
-    
-    # Draw a black border around the box
-    border_rect = pygame.Rect(0, 0, left_box_width, left_box_height)
-    draw_rounded_rect(left_box, (0, 0, 0), border_rect, corner_radius=20)
-    
-    # Draw the rounded box inside the border
-    inner_rect = border_rect.inflate(-4, -4)  # Reduce size for the inner box
-    draw_rounded_rect(left_box, (111, 128, 145), inner_rect, corner_radius=20)
-
-    font = pygame.font.Font(FONT_VIRGIL, 32)
-
-    label_color = (255, 255, 255)  # White color for labels
-    BLUE = (0, 0, 255)  # Blue color for buttons
-
-    # Set up font for age label
-    age_label = font.render("Age", True, label_color)
-    padding = 10  # General padding for the contents
-    top_left_margin = 20  # Additional margin for top and left
-
-    bank_label_rect = pygame.Rect(0, 0, 0, 0)  # Dummy rect for position
-
-    # Position the age label with extra margin from the top and left
-    age_label_rect = age_label.get_rect(topleft=(padding + top_left_margin, bank_label_rect.bottom + padding + top_left_margin))
-    left_box.blit(age_label, age_label_rect)
-
-    # Render the player's age from JSON
-    age_number = font.render(str(player["age"]), True, label_color)
-    age_number_rect = age_number.get_rect(topleft=(age_label_rect.right + padding, age_label_rect.top))
-    left_box.blit(age_number, age_number_rect)
-
-    # Set up font for occupation label
-    occupation_label = font.render("Occupation", True, label_color)
-    padding = 10  # General padding for the contents
-    top_left_margin = 20  # Additional margin for top and left
-
-    bank_label_rect = pygame.Rect(0, 0, 0, 0)  # Dummy rect for position
-
-    # Position the occupation label below the age label
-    occupation_label_rect = occupation_label.get_rect(topleft=(padding + top_left_margin, age_label_rect.bottom + padding))
-    left_box.blit(occupation_label, occupation_label_rect)
-
-    # Render the player's occupation from JSON
-    occupation = font.render(str(player["occupation"]), True, label_color)
-    occupation_rect = occupation.get_rect(topleft=(occupation_label_rect.right + padding, occupation_label_rect.top))
-    left_box.blit(occupation, occupation_rect)
-
-    # Draw "Continue" button with rounded corners
-    button_font = pygame.font.Font(FONT_VIRGIL, 24)
-    button_text = button_font.render("Continue", True, label_color)
-    
-    # Position the button right next to the age number
-    button_rect = pygame.Rect(age_number_rect.right + padding + 40, age_number_rect.top - 10, 185, 60)
-
-    # Draw the rounded rectangle button
-    draw_rounded_rect(left_box, BLUE, button_rect, corner_radius=20)
-    
-    # Center the button text inside the rounded rectangle
-    left_box.blit(button_text, (button_rect.x + (button_rect.width - button_text.get_width()) // 2, 
-                                button_rect.y + (button_rect.height - button_text.get_height()) // 2))
-
-    win.blit(left_box, (left_box_x, left_box_y))
-
-    return button_rect  # Return the button's rect for click detection
-
-
-
-    
-   
-def draw_status_menu(win, width, height, margin, player):
-    """Draws the status menu box (top right corner with rounded corners)."""
-    top_right_box_width = width // 2 - 2 * margin  # Increased width
-    top_right_box_height = 180
-    top_right_box_x = width - top_right_box_width - margin
-    top_right_box_y = margin
-    
-    padding = 25  # Define padding for the inner content
-
-    top_right_box = pygame.Surface((top_right_box_width, top_right_box_height), pygame.SRCALPHA)
-    
-    # Draw a black border around the box
-    border_rect = pygame.Rect(0, 0, top_right_box_width, top_right_box_height)
-    draw_rounded_rect(top_right_box, (0, 0, 0), border_rect, corner_radius=20)
-    
-    # Draw the rounded box inside the border
-    inner_rect = border_rect.inflate(-4, -4)  # Reduce size for the inner box
-    draw_rounded_rect(top_right_box, (111, 128, 145), inner_rect, corner_radius=20)
-    
-    # Set up font
-    font = pygame.font.Font(FONT_VIRGIL, 24)
-    label_color = (255, 255, 255)  # White color for labels
-    
-    # Render Health label with padding
-    health_label = font.render("Health:", True, label_color)
-    health_label_rect = health_label.get_rect(topleft=(padding, padding))
-    top_right_box.blit(health_label, health_label_rect)
-    
-    # Render Happiness label with padding
-    happiness_label = font.render("Happiness:", True, label_color)
-    happiness_label_rect = happiness_label.get_rect(topleft=(padding, health_label_rect.bottom + padding))
-    top_right_box.blit(happiness_label, happiness_label_rect)
-
-    # Render Bank label with padding
-    bank_label = font.render("Bank Account:", True, label_color)
-    bank_number = font.render(f'${player["bank"]:.2f}', True, label_color)
-    bank_label_rect = bank_label.get_rect(topleft=(padding, happiness_label_rect.bottom + padding))
-    top_right_box.blit(bank_label, bank_label_rect)
-    
-    # Render the Bank number from JSON
-    bank_number_rect = bank_number.get_rect(topleft=(bank_label_rect.right + padding, happiness_label_rect.bottom + padding))
-    top_right_box.blit(bank_number, bank_number_rect)
-    
-    # Align the status bars to the right of the box, considering padding
-    bar_x = top_right_box_width - (220 + padding)  # Adjust this value to align the bars to the right
-    
-    # Draw the status bars with padding
-    draw_status_bar(top_right_box, bar_x, padding, player['health'], 100, (255, 0, 0))  # Red for Health
-    draw_status_bar(top_right_box, bar_x, happiness_label_rect.top, player['happiness'], 100, (0, 255, 0))  # Green for Happiness
-    
-    win.blit(top_right_box, (top_right_box_x, top_right_box_y))
-
-
-def draw_detail_menu(win, width, height, margin):
-    """Draws the detail menu box (bottom right corner)."""
-    bottom_right_box_width = width // 2 - 2 * margin 
-    bottom_right_box_height = height - 2 * margin - 200
-    bottom_right_box_x = width - bottom_right_box_width - margin
-    bottom_right_box_y = height - bottom_right_box_height - margin
-
-    bottom_right_box = pygame.Surface((bottom_right_box_width, bottom_right_box_height), pygame.SRCALPHA)
-    
-    # Draw a black border around the box
-    border_rect = pygame.Rect(0, 0, bottom_right_box_width, bottom_right_box_height)
-    draw_rounded_rect(bottom_right_box, (0, 0, 0), border_rect, corner_radius=20)
-    
-    # Draw the rounded box inside the border
-    inner_rect = border_rect.inflate(-4, -4)  # Reduce size for the inner box
-    draw_rounded_rect(bottom_right_box, (111, 128, 145), inner_rect, corner_radius=20)
-    
-    win.blit(bottom_right_box, (bottom_right_box_x, bottom_right_box_y))
+PANEL_BORDER = (0, 0, 0)
+PANEL_FILL = (111, 128, 145)
+LABEL_COLOR = (255, 255, 255)
+BLUE = (0, 0, 255)
+
+# History fields charted in the detail menu, top to bottom, with their labels and line colors.
+CHART_LANES = [
+    ("bank", "Bank", (255, 215, 0)),
+    ("income", "Income", (0, 0, 160)),
+    ("assets", "Assets", (255, 140, 0)),
+    ("health", "Health", (255, 0, 0)),
+    ("happiness", "Happiness", (0, 255, 0)),
+]
+
+
+PANEL_SKIN = Skin(PANEL_FILL, radius=20, border_color=PANEL_BORDER, border=2)
+BUTTON_SKIN = Skin(BLUE, radius=20)
+OPTION_SKIN = Skin(BLUE, radius=10)
+
+
+class Panel:
+    """A dashboard box whose background and fixed labels are rendered once.
+
+    Values are drawn into named slots; a slot is repainted (static layer first,
+    then the value) only when its value changes, and its screen rect is returned
+    so the caller can push just that area to the display.
+    """
+
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)
+        self.static = PANEL_SKIN.render(self.rect.size).copy()
+        self._slots = {}
+        self._values = {}
+
+    def add_slot(self, name, rect, draw):
+        """Registers a value slot; draw(win, screen_rect, value) paints it."""
+        self._slots[name] = (pygame.Rect(rect), draw)
+
+    def blit(self, win):
+        """Repaints the whole panel and forgets every drawn value."""
+        win.blit(self.static, self.rect)
+        self._values.clear()
+        return self.rect
+
+    def update(self, win, name, value):
+        """Redraws a slot if its value changed; returns the dirty rect or None."""
+        if name in self._values and self._values[name] == value:
+            return None
+        self._values[name] = value
+        local, draw = self._slots[name]
+        screen_rect = local.move(self.rect.topleft)
+        win.blit(self.static, screen_rect, area=local)
+        clip = win.get_clip()
+        win.set_clip(screen_rect)
+        draw(win, screen_rect, value)
+        win.set_clip(clip)
+        return screen_rect
+
+
+def _draw_text(size):
+    def draw(win, rect, value):
+        win.blit(render_text(value, size, LABEL_COLOR, FONT_VIRGIL), rect.topleft)
+    return draw
+
+
+def _draw_bar(color):
+    def draw(win, rect, value):
+        draw_status_bar(win, rect.x, rect.y, value, 100, color)
+    return draw
+
+
+class DashboardView:
+    """Retained-mode dashboard: static layers are cached, only changed values are redrawn."""
+
+    def __init__(self, win, width, height, bg_color, margin=10):
+        self.win = win
+        self.size = (width, height)
+        self.bg_color = bg_color
+        self.margin = margin
+
+        self.game_menu, self.button_rect = self._build_game_menu(width, height, margin)
+        self.status_menu = self._build_status_menu(width, height, margin)
+        self.detail_menu = self._build_detail_menu(width, height, margin)
+        self._no_history = History()  # charted for players loaded as plain dicts
+        self._drawn = False
+
+    def invalidate(self):
+        """Forces the next draw to repaint the whole screen."""
+        self._drawn = False
+
+    def draw(self, player):
+        """Brings the screen up to date with player; returns the dirty rects."""
+        dirty = []
+        if not self._drawn:
+            self.win.fill(self.bg_color)
+            for panel in (self.game_menu, self.status_menu, self.detail_menu):
+                panel.blit(self.win)
+            dirty.append(self.win.get_rect())
+            self._drawn = True
+
+        dirty += self.draw_game_menu(player)
+        dirty += self.draw_status_menu(player)
+        dirty += self.draw_detail_menu(player)
+        return dirty
+
+    @timed("draw.game_menu")
+    def draw_game_menu(self, player):
+        """Updates the age and occupation shown in the game menu."""
+        updates = [
+            self.game_menu.update(self.win, "age", str(player["age"])),
+            self.game_menu.update(self.win, "occupation", str(player["occupation"])),
+        ]
+        return [rect for rect in updates if rect]
+
+    @timed("draw.status_menu")
+    def draw_status_menu(self, player):
+        """Updates the health and happiness bars and the bank balance."""
+        updates = [
+            self.status_menu.update(self.win, "health", player["health"]),
+            self.status_menu.update(self.win, "happiness", player["happiness"]),
+            self.status_menu.update(self.win, "bank", f'${player["bank"]:.2f}'),
+        ]
+        return [rect for rect in updates if rect]
+
+    @timed("draw.detail_menu")
+    def draw_detail_menu(self, player):
+        """Adds the years played since the last draw to the history charts."""
+        history = player.get("history")
+        self.chart.update(self._no_history if history is None else history)
+        rect = self.detail_menu.update(self.win, "chart", self.chart.version)
+        return [rect] if rect else []
+
+    def _build_game_menu(self, width, height, margin):
+        """Lays out the game menu box (left half of the screen)."""
+        panel = Panel((margin, margin, width // 2 - 2 * margin, height - 2 * margin))
+        padding = 10  # General padding for the contents
+        top_left_margin = 20  # Additional margin for top and left
+
+        age_label = render_text("Age", 32, LABEL_COLOR, FONT_VIRGIL)
+        age_label_rect = age_label.get_rect(topleft=(padding + top_left_margin, padding + top_left_margin))
+        panel.static.blit(age_label, age_label_rect)
+
+        # Anchor the button to the right edge so it never moves; the age slot fills the gap.
+        line_height = get_font(FONT_VIRGIL, 32).get_linesize()
+        button_rect = pygame.Rect(panel.rect.width - 185 - 2 * padding, age_label_rect.top - 10, 185, 60)
+        age_rect = pygame.Rect(age_label_rect.right + padding, age_label_rect.top, button_rect.x - age_label_rect.right - 2 * padding, line_height)
+        panel.add_slot("age", age_rect, _draw_text(32))
+
+        occupation_label = render_text("Occupation", 32, LABEL_COLOR, FONT_VIRGIL)
+        occupation_label_rect = occupation_label.get_rect(topleft=(padding + top_left_margin, age_label_rect.bottom + padding))
+        panel.static.blit(occupation_label, occupation_label_rect)
+
+        occupation_rect = pygame.Rect(occupation_label_rect.right + padding, occupation_label_rect.top, 0, line_height)
+        occupation_rect.width = panel.rect.width - padding - occupation_rect.x
+        panel.add_slot("occupation", occupation_rect, _draw_text(32))
+
+        # Draw "Continue" button with rounded corners next to the age number
+        BUTTON_SKIN.draw(panel.static, button_rect)
+        button_text = render_text("Continue", 24, LABEL_COLOR, FONT_VIRGIL)
+        panel.static.blit(button_text, button_text.get_rect(center=button_rect.center))
+
+        return panel, button_rect.move(panel.rect.topleft)
+
+    def _build_status_menu(self, width, height, margin):
+        """Lays out the status menu box (top right corner)."""
+        box_width = width // 2 - 2 * margin
+        panel = Panel((width - box_width - margin, margin, box_width, 180))
+        padding = 25  # Define padding for the inner content
+
+        health_label = render_text("Health:", 24, LABEL_COLOR, FONT_VIRGIL)
+        health_label_rect = health_label.get_rect(topleft=(padding, padding))
+        panel.static.blit(health_label, health_label_rect)
+
+        happiness_label = render_text("Happiness:", 24, LABEL_COLOR, FONT_VIRGIL)
+        happiness_label_rect = happiness_label.get_rect(topleft=(padding, health_label_rect.bottom + padding))
+        panel.static.blit(happiness_label, happiness_label_rect)
+
+        bank_label = render_text("Bank Account:", 24, LABEL_COLOR, FONT_VIRGIL)
+        bank_label_rect = bank_label.get_rect(topleft=(padding, happiness_label_rect.bottom + padding))
+        panel.static.blit(bank_label, bank_label_rect)
+
+        bank_rect = pygame.Rect(bank_label_rect.right + padding, bank_label_rect.top, 0, bank_label_rect.height)
+        bank_rect.width = box_width - padding - bank_rect.x
+        panel.add_slot("bank", bank_rect, _draw_text(24))
+
+        # Align the status bars to the right of the box, considering padding
+        bar_x = box_width - (220 + padding)
+        panel.add_slot("health", (bar_x, padding, 200, 20), _draw_bar((255, 0, 0)))  # Red for Health
+        panel.add_slot("happiness", (bar_x, happiness_label_rect.top, 200, 20), _draw_bar((0, 255, 0)))  # Green for Happiness
+        return panel
+
+    def _build_detail_menu(self, width, height, margin):
+        """Lays out the detail menu box (bottom right corner)."""
+        box_width = width // 2 - 2 * margin
+        box_height = height - 2 * margin - 200
+        panel = Panel((width - box_width - margin, height - box_height - margin, box_width, box_height))
+        padding = 20
+
+        chart_rect = pygame.Rect(padding, padding, box_width - 2 * padding, box_height - 2 * padding)
+        self.chart = HistoryChart(chart_rect.size, [(name, color) for name, _, color in CHART_LANES])
+        for lane, (_, label, color) in enumerate(CHART_LANES):
+            lane_rect = self.chart.lane_rect(lane).move(chart_rect.topleft)
+            panel.static.blit(render_text(label, 18, LABEL_COLOR, FONT_VIRGIL), lane_rect.topleft)
+            pygame.draw.line(panel.static, PANEL_BORDER, lane_rect.bottomleft, lane_rect.bottomright)
+
+        def draw(win, rect, version):
+            win.blit(self.chart.surface, rect.topleft)
+        panel.add_slot("chart", chart_rect, draw)
+        return panel
+
+
+_view = None
+
+
+def get_dashboard_view(win, width, height, bg_color):
+    """Returns the cached dashboard view for this window, building it if needed."""
+    global _view
+    if _view is None or _view.win is not win or _view.size != (width, height) or _view.bg_color != bg_color:
+        _view = DashboardView(win, width, height, bg_color)
+    return _view
 
 
 def draw_dashboard_screen(win, width, height, bg_color, player):
     """Draws the dashboard screen with three sections."""
-    win.fill(bg_color)  # Set background color
-    
-    margin = 10
-    
-    # Draw the game menu and get the button rect
-    button_rect = draw_game_menu(win, width, height, margin, player)
-    
-    # Draw the status menu and detail menu
-    draw_status_menu(win, width, height, margin, player)
-    draw_detail_menu(win, width, height, margin)
-    
+    view = get_dashboard_view(win, width, height, bg_color)
+    view.invalidate()
+    view.draw(player)
+
     pygame.display.update()
 
-    return button_rect  # Return the button rect
+    return view.button_rect  # Return the button rect
 
 def draw_prompt_menu(win, width, height, margin, prompt, options, player):
     """Displays a decision prompt with clickable options centered on the screen."""
-    font = pygame.font.Font(FONT_VIRGIL, 24)
     label_color = (255, 255, 255)
-    BLUE = (0, 0, 255)
 
     # Calculate the dimensions of the prompt box
     prompt_box_width = width - 2 * margin
@@ -206,16 +264,10 @@ def draw_prompt_menu(win, width, height, margin, prompt, options, player):
     prompt_box_y = (height - prompt_box_height) // 2
 
     # Create the prompt box surface
-    prompt_box = pygame.Surface((prompt_box_width, prompt_box_height), pygame.SRCALPHA)
-
-    # Draw the prompt box
-    border_rect = pygame.Rect(0, 0, prompt_box_width, prompt_box_height)
-    draw_rounded_rect(prompt_box, (0, 0, 0), border_rect, corner_radius=20)
-    inner_rect = border_rect.inflate(-4, -4)
-    draw_rounded_rect(prompt_box, (111, 128, 145), inner_rect, corner_radius=20)
+    prompt_box = PANEL_SKIN.render((prompt_box_width, prompt_box_height)).copy()
 
     # Render the prompt text and center it horizontally
-    prompt_text = font.render(prompt, True, label_color)
+    prompt_text = render_text(prompt, 24, label_color, FONT_VIRGIL)
     prompt_text_rect = prompt_text.get_rect(center=(prompt_box_width // 2, margin))
     prompt_box.blit(prompt_text, prompt_text_rect)
 
@@ -223,9 +275,9 @@ def draw_prompt_menu(win, width, height, margin, prompt, options, player):
     option_rects = []
     for i, option in enumerate(options):
         option_id = option.get("id", "Unnamed Option")  # Safely get the id or provide a default
-        option_text = font.render(option_id, True, label_color)
+        option_text = render_text(option_id, 24, label_color, FONT_VIRGIL)
         option_rect = pygame.Rect((prompt_box_width - 300) // 2, prompt_text_rect.bottom + margin + i * option_height, 300, 40)
-        pygame.draw.rect(prompt_box, BLUE, option_rect)
+        OPTION_SKIN.draw(prompt_box, option_rect)
         option_text_rect = option_text.get_rect(center=option_rect.center)
         prompt_box.blit(option_text, option_text_rect)
         option_rects.append((option_rect, option))
@@ -236,6 +288,41 @@ def draw_prompt_menu(win, width, height, margin, prompt, options, player):
 
     return option_rects
 
+def draw_profile_overlay(win, profiler, margin=20):
+    """Draws frame and turn timings and cache hit rates in the bottom left corner; returns its rect."""
+    stats = profiler.stats()
+
+    def ms(name, field="recent_mean_ms"):
+        return f"{stats[name][field]:.2f} ms" if name in stats else "-"
+
+    schedules = schedule.cache_info()
+    lookups = schedules.hits + schedules.misses
+    text = text_cache().stats()
+    counters = profiler.counts()
+    marks = {name: f"{seconds * 1000:.0f} ms" for name, seconds in profiler.marks.items()}
+    lines = [
+        f"startup: first frame {marks.get('first_frame', '-')}, dashboard {marks.get('dashboard', '-')}",
+        f"frame {ms('frame')} (p95 {ms('frame', 'recent_p95_ms')})",
+        f"display.update {ms('display.update')}",
+        f"turn {ms('turn', 'last_ms')} (mean {ms('turn', 'mean_ms')})",
+        f"events {ms('events')}  save {ms('save')}",
+        f"turns {counters.get('turns', 0)}  events fired {counters.get('events.fired', 0)}  "
+        f"saved {counters.get('save.records', 0)}",
+        f"text cache {text['hit_rate']:.1%} of {text['hits'] + text['misses']} ({text['entries']} entries)",
+        f"loan schedules {schedules.hits / lookups if lookups else 0:.1%} of {lookups}",
+        "F4: stop capture" if profiler.capturing else "F4: start capture",
+    ]
+
+    # Rendered directly: the numbers change every frame and would only churn the text cache.
+    font = get_font(None, 20)
+    line_height = font.get_linesize()
+    rect = pygame.Rect(margin, win.get_height() - margin - 10 - line_height * len(lines), 330, 10 + line_height * len(lines))
+    win.fill((0, 0, 0), rect)
+    for i, line in enumerate(lines):
+        win.blit(font.render(line, True, LABEL_COLOR), (rect.x + 5, rect.y + 5 + i * line_height))
+    return rect
+
+
 def display_message(win, message, font, position, color=(255, 255, 255)):
     """Displays a message on the screen at the specified position."""
     text_surface = font.render(message, True, color)
@@ -244,67 +331,122 @@ def display_message(win, message, font, position, color=(255, 255, 255)):
 
 
 
-def dashboard_screen(win, width, height, bg_color, player):
+# Posted every CONTENT_POLL_MS while the dashboard runs, to pick up edited game data.
+CONTENT_CHECK = pygame.event.custom_type()
+CONTENT_POLL_MS = 1000
+
+# Years the F key skips ahead.
+FAST_FORWARD_YEARS = 10
+
+# How long a message such as "Game saved!" stays up, and where.
+MESSAGE_MS = 2000
+MESSAGE_POSITION = (50, 50)
+
+
+class DashboardScene(Scene):
     """Handles the dashboard screen logic."""
-    button_rect = draw_dashboard_screen(win, width, height, bg_color, player)
-    
-    events = load_json(DataPath.EVENTS)
-    occupations = load_json(DataPath.OCCUPATIONS)
-
-    font = pygame.font.Font(FONT_VIRGIL, 24)  
-    
-    clock = pygame.time.Clock()
-
-    decision_made = False
-    options_rects = []
-    decision_data = None
-
-    while True:
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == KEYDOWN:
-                if event.key == K_s:
-                    save_player(player)
-                    display_message(win, "Game saved!", font, (50, 50))  
-            if event.type == MOUSEBUTTONDOWN:
-                if len(options_rects) > 0:
-                    for option_rect, option in options_rects:
-                        if option_rect.collidepoint(event.pos):
-                            decision_data = option
-                            decision_made = True
-                            options_rects = []
-                            break
-                elif button_rect and button_rect.collidepoint(event.pos):
-                    player = handle_turn(player, events, occupations)
-                    button_rect = draw_dashboard_screen(win, width, height, bg_color, player)
-
-        if decision_made:
-            if player["age"] < 23:
-                player = early_life_phase(player)
-            elif player["age"] < 31:
-                player = young_adult_phase(player)
-            else:
-                player = mid_life_phase(player)
-            
-            if decision_data["id"] == "High School":
-                occupations = load_json(DataPath.OCCUPATIONS)
-                occupation_options = occupations[0]["occupations"]
-                options_rects = draw_prompt_menu(win, width, height, 20, "Choose your career path:", occupation_options)
-                player['occupation'] = decision_data
-                income_key = "Starting Income" if "Starting Income" in decision_data else "Est. Start Income"
-                player['income'] = decision_data[income_key]
-            else:
-                player['skills']['education'] = decision_data["id"]
-                player['bank'] -= decision_data["Cost"]
-                income_key = "Starting Income" if "Starting Income" in decision_data else "Est. Start Income"
-                player['income'] = decision_data[income_key]
-            
-            decision_made = False
-            options_rects = []
-            
-            button_rect = draw_dashboard_screen(win, width, height, bg_color, player)
-
-        pygame.display.update()
-        clock.tick(1)
+
+    def __init__(self, width, height, bg_color, player):
+        self.width = width
+        self.height = height
+        self.bg_color = bg_color
+        self.player = player
+        self.catalog = get_catalog()
+        self.view = None
+        self.profiler = get_profiler()
+        self.show_profile = False
+        self.message = None
+        self.message_until = 0
+
+        self.options_rects = []
+
+    def enter(self, win):
+        self.win = win
+        self.view = get_dashboard_view(win, self.width, self.height, self.bg_color)
+        self.view.invalidate()
+        pygame.display.update(self.view.draw(self.player))
+        self.profiler.mark("dashboard")
+        on_reload(self.catalog_reloaded)
+        pygame.time.set_timer(CONTENT_CHECK, CONTENT_POLL_MS)
+
+    def catalog_reloaded(self, catalog):
+        self.catalog = catalog
+        self.show_message("Game data reloaded")
+        self.view.invalidate()
+
+    def show_message(self, text):
+        """Shows text over the dashboard for MESSAGE_MS."""
+        self.message = text
+        self.message_until = pygame.time.get_ticks() + MESSAGE_MS
+        self._set_wake()
+
+    def _set_wake(self):
+        # The profile overlay's numbers stay live, and a message is taken down on time.
+        self.wake_ms = 500 if self.show_profile or self.message is not None else 0
+
+    def handle_event(self, event):
+        if event.type == CONTENT_CHECK:
+            reload_catalog()
+        if event.type == KEYDOWN:
+            if event.key == K_s:
+                save_player(self.player)
+                self.show_message("Game saved!")
+            if event.key == K_f and not self.options_rects:
+                self.player = fast_forward(self.player, FAST_FORWARD_YEARS, self.catalog)
+            if event.key == K_F3:
+                self.show_profile = not self.show_profile
+                self._set_wake()
+                self.view.invalidate()
+            if event.key == K_F4:
+                if self.profiler.capturing:
+                    paths = self.profiler.stop_capture(DataPath.PROFILES.value, {"text_cache": text_cache().stats()})
+                    log.info("Profile written to %s", ", ".join(paths))
+                    self.show_message("Profile saved!")
+                else:
+                    self.profiler.start_capture()
+        if event.type == MOUSEBUTTONDOWN:
+            if len(self.options_rects) > 0:
+                for option_rect, option in self.options_rects:
+                    if option_rect.collidepoint(event.pos):
+                        self.make_decision(option)
+                        break
+            elif self.view.button_rect.collidepoint(event.pos):
+                self.player = handle_turn(self.player, self.catalog)
+        return None
+
+    def make_decision(self, decision_data):
+        player = self.player
+        if player["age"] < 23:
+            player = early_life_phase(player)
+        elif player["age"] < 31:
+            player = young_adult_phase(player)
+        else:
+            player = mid_life_phase(player)
+        
+        if decision_data["id"] == "High School":
+            occupation_options = self.catalog.occupations_for("High School")
+            self.options_rects = draw_prompt_menu(self.win, self.width, self.height, 20, "Choose your career path:", occupation_options, player)
+            player['occupation'] = decision_data
+            income_key = "Starting Income" if "Starting Income" in decision_data else "Est. Start Income"
+            player['income'] = decision_data[income_key]
+        else:
+            player['skills']['education'] = decision_data["id"]
+            player['bank'] -= decision_data["Cost"]
+            income_key = "Starting Income" if "Starting Income" in decision_data else "Est. Start Income"
+            player['income'] = decision_data[income_key]
+        
+        self.player = player
+        self.options_rects = []
+        self.view.invalidate()
+
+    def update(self, win):
+        if self.message is not None and pygame.time.get_ticks() >= self.message_until:
+            self.message = None
+            self._set_wake()
+            self.view.invalidate()
+        dirty = self.view.draw(self.player)
+        if self.message is not None:
+            dirty.append(win.blit(render_text(self.message, 24, LABEL_COLOR, FONT_VIRGIL), MESSAGE_POSITION))
+        if self.show_profile:
+            dirty.append(draw_profile_overlay(win, self.profiler))
+        return dirty
@@ -1,12 +1,12 @@
 import pygame
-import sys
-from pygame.locals import QUIT, KEYDOWN, K_RETURN
+from pygame.locals import KEYDOWN, K_RETURN
+from ui.text import render_text
+from ui.scenes import Scene, SceneManager
 
 def draw_guide_screen(WIN, WIDTH, HEIGHT, BG_COLOR):
     """Displays the guide screen with instructions."""
     WIN.fill(BG_COLOR)  
 
-    font = pygame.font.Font(None, 30)  # Reduced font size to 30
     instructions = [
         "Welcome to FinLitFun!",
         "Objective:",
@@ -20,35 +20,19 @@ def draw_guide_screen(WIN, WIDTH, HEIGHT, BG_COLOR):
     y_offset = 80  
     line_spacing = 35  
     for line in instructions:
-        text = font.render(line, True, (255, 255, 255))  # White text
+        text = render_text(line, 30, (255, 255, 255))  # White text
         WIN.blit(text, (WIDTH // 2 - text.get_width() // 2, y_offset))
         y_offset += line_spacing
 
-    continue_text = font.render("Press Enter to continue...", True, (255, 255, 255))
+    continue_text = render_text("Press Enter to continue...", 30, (255, 255, 255))
     WIN.blit(continue_text, (WIDTH // 2 - continue_text.get_width() // 2, HEIGHT - 60))
 
     pygame.display.update()
 
-def guide_screen(WIN, WIDTH, HEIGHT, BG_COLOR):
-    """Handles the guide screen logic."""
-    draw_guide_screen(WIN, WIDTH, HEIGHT, BG_COLOR)
-
-    while True:
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == KEYDOWN:
-                if event.key == K_RETURN:  
-                    return  
-
-        pygame.display.update()
-
 def draw_phases_screen(WIN, WIDTH, HEIGHT, BG_COLOR):
     """Displays the game phases screen with instructions."""
     WIN.fill(BG_COLOR)  
 
-    font = pygame.font.Font(None, 30) 
     phase_instructions = [
         "Game Phases:",
         "1. Early Life (Ages 16-22):",
@@ -70,34 +54,19 @@ def draw_phases_screen(WIN, WIDTH, HEIGHT, BG_COLOR):
     y_offset = 50 
     line_spacing = 30  
     for line in phase_instructions:
-        text = font.render(line, True, (255, 255, 255))  
+        text = render_text(line, 30, (255, 255, 255))  
         WIN.blit(text, (WIDTH // 2 - text.get_width() // 2, y_offset))
         y_offset += line_spacing
 
-    continue_text = font.render("Press Enter to continue...", True, (255, 255, 255))
+    continue_text = render_text("Press Enter to continue...", 30, (255, 255, 255))
     WIN.blit(continue_text, (WIDTH // 2 - continue_text.get_width() // 2, HEIGHT - 60))  
 
     pygame.display.update()
 
-def phases_screen(WIN, WIDTH, HEIGHT, BG_COLOR):
-    """Handles the game phases screen logic."""
-    draw_phases_screen(WIN, WIDTH, HEIGHT, BG_COLOR)
-
-    while True:
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == KEYDOWN:
-                if event.key == K_RETURN:  
-                    return  
-        pygame.display.update()
-
 def draw_status_screen(WIN, WIDTH, HEIGHT, BG_COLOR):
     """Displays the managing status, decision making, and random events screen."""
     WIN.fill(BG_COLOR)  
 
-    font = pygame.font.Font(None, 30)  # Reduced font size to 30
     status_instructions = [
         "Managing Status:",
         "   - Health: Stay healthy by balancing work and personal time.",
@@ -122,25 +91,36 @@ def draw_status_screen(WIN, WIDTH, HEIGHT, BG_COLOR):
     y_offset = 50  
     line_spacing = 30  
     for line in status_instructions:
-        text = font.render(line, True, (255, 255, 255))  
+        text = render_text(line, 30, (255, 255, 255))  
         WIN.blit(text, (WIDTH // 2 - text.get_width() // 2, y_offset))
         y_offset += line_spacing
     pygame.display.update()
 
-def status_screen(WIN, WIDTH, HEIGHT, BG_COLOR):
-    """Handles the guide for status, decision making, and random events logic."""
-    draw_status_screen(WIN, WIDTH, HEIGHT, BG_COLOR)
+class GuideScene(Scene):
+    """A static instructions page; Enter moves on to next_scene."""
+
+    def __init__(self, draw, width, height, bg_color, next_scene):
+        self.draw = draw
+        self.width = width
+        self.height = height
+        self.bg_color = bg_color
+        self.next_scene = next_scene
 
-    while True:
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == KEYDOWN:
-                if event.key == K_RETURN:  
-                    return  
+    def enter(self, win):
+        self.draw(win, self.width, self.height, self.bg_color)
 
-        pygame.display.update()
+    def handle_event(self, event):
+        if event.type == KEYDOWN and event.key == K_RETURN:
+            return self.next_scene
+        return None
+
+
+def guide_scenes(width, height, bg_color, next_scene):
+    """Chains the guide, phases and status pages in front of next_scene."""
+    scene = next_scene
+    for draw in (draw_status_screen, draw_phases_screen, draw_guide_screen):
+        scene = GuideScene(draw, width, height, bg_color, scene)
+    return scene
 
 def main():
     pygame.init()
@@ -149,13 +129,8 @@ def main():
     pygame.display.set_caption("FinLitFun Guide")
     BG_COLOR = (0, 0, 0)  # Black background
 
-    guide_screen(WIN, WIDTH, HEIGHT, BG_COLOR)
-
-    phases_screen(WIN, WIDTH, HEIGHT, BG_COLOR)
-
-    status_screen(WIN, WIDTH, HEIGHT, BG_COLOR)
+    SceneManager(WIN).run(guide_scenes(WIDTH, HEIGHT, BG_COLOR, Scene()))
+    pygame.quit()
 
 if __name__ == "__main__":
     main()
-
-
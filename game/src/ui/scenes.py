@@ -0,0 +1,75 @@
+import time
+import pygame
+from pygame.locals import QUIT, NOEVENT, KEYDOWN, MOUSEBUTTONDOWN, MOUSEMOTION
+from profiling import get_profiler
+
+# Events that mean the player is interacting and frames should come quickly.
+INPUT_EVENTS = (KEYDOWN, MOUSEBUTTONDOWN, MOUSEMOTION)
+
+
+class Scene:
+    """One screen of the game, driven by SceneManager.
+
+    A scene sleeps until input arrives. If wake_ms is set, update() is also
+    called at least that often, which is enough for things like a blinking
+    cursor. After input the manager runs the scene at up to fps frames per
+    second for a short burst, so clicks and typing get immediate feedback
+    without keeping a core busy while nothing happens.
+    """
+
+    fps = 60
+    wake_ms = 0
+
+    def enter(self, win):
+        """Draws the scene from scratch and presents it."""
+
+    def handle_event(self, event):
+        """Reacts to one event; returns the next scene to switch to, or None."""
+        return None
+
+    def update(self, win):
+        """Redraws whatever changed; returns the dirty rects to present."""
+        return []
+
+
+class SceneManager:
+    """Runs scenes until one quits, blocking on input while idle."""
+
+    def __init__(self, win, burst_ms=250):
+        self.win = win
+        self.burst_ms = burst_ms
+        self.clock = pygame.time.Clock()
+
+    def run(self, scene):
+        """Runs scene and whatever scenes it hands over to; returns on QUIT."""
+        scene.enter(self.win)
+        busy_until = 0
+        profiler = get_profiler()
+
+        while scene is not None:
+            now = pygame.time.get_ticks()
+            if now < busy_until:
+                self.clock.tick(scene.fps)
+                events = pygame.event.get()
+            else:
+                first = pygame.event.wait(scene.wake_ms)
+                events = [] if first.type == NOEVENT else [first] + pygame.event.get()
+
+            for event in events:
+                if event.type == QUIT:
+                    return
+                if event.type in INPUT_EVENTS:
+                    busy_until = pygame.time.get_ticks() + self.burst_ms
+
+                # Later events in the same batch go to the scene switched to.
+                next_scene = scene.handle_event(event)
+                if next_scene is not None:
+                    scene = next_scene
+                    scene.enter(self.win)
+
+            start = time.perf_counter()
+            dirty = scene.update(self.win)
+            if dirty:
+                with profiler.timer("display.update"):
+                    pygame.display.update(dirty)
+            profiler.record("frame", time.perf_counter() - start)
@@ -0,0 +1,90 @@
+import threading
+import pygame
+import pygame.gfxdraw
+from collections import OrderedDict
+
+
+def _rasterize_rounded_rect(surface, color, rect, corner_radius):
+    """Draws a rectangle with rounded corners (primitive version, used once per skin)."""
+    corners = (
+        (rect.x + corner_radius, rect.y + corner_radius),
+        (rect.right - corner_radius - 1, rect.y + corner_radius),
+        (rect.x + corner_radius, rect.bottom - corner_radius - 1),
+        (rect.right - corner_radius - 1, rect.bottom - corner_radius - 1),
+    )
+    for x, y in corners:
+        pygame.gfxdraw.aacircle(surface, x, y, corner_radius, color)
+        pygame.gfxdraw.filled_circle(surface, x, y, corner_radius, color)
+
+    pygame.draw.rect(surface, color, rect.inflate(-2*corner_radius, 0))
+    pygame.draw.rect(surface, color, rect.inflate(0, -2*corner_radius))
+
+
+class Skin:
+    """A rounded panel or button style, rasterized once into a nine-slice sprite.
+
+    The sprite is just big enough to hold the four corners plus a one-pixel
+    edge strip between them. Any size is then built from four corner blits,
+    four stretched edge strips and a center fill, and recently used sizes are
+    kept so a redraw at the same size is a single blit. The size cache is
+    locked, as the preloader thread renders skins while the main thread draws.
+    """
+
+    def __init__(self, fill, radius=20, border_color=None, border=0, cache_size=16):
+        self.fill = fill
+        self.radius = radius
+        self.border = border if border_color is not None else 0
+        self.corner = radius + self.border
+        self.cache_size = cache_size
+        self._sizes = OrderedDict()
+        self._lock = threading.Lock()
+
+        side = 2 * self.corner + 1
+        self.sprite = pygame.Surface((side, side), pygame.SRCALPHA)
+        outer = pygame.Rect(0, 0, side, side)
+        if self.border:
+            _rasterize_rounded_rect(self.sprite, border_color, outer, radius)
+        _rasterize_rounded_rect(self.sprite, fill, outer.inflate(-2 * self.border, -2 * self.border), radius)
+
+    def render(self, size):
+        """Returns a surface of the given size with the skin applied (shared, do not draw on it)."""
+        size = (int(size[0]), int(size[1]))
+        with self._lock:
+            surface = self._sizes.get(size)
+            if surface is None:
+                surface = self._sizes[size] = self._compose(*size)
+                if len(self._sizes) > self.cache_size:
+                    self._sizes.popitem(last=False)
+            else:
+                self._sizes.move_to_end(size)
+            return surface
+
+    def draw(self, surface, rect):
+        """Blits the skin onto surface at rect."""
+        surface.blit(self.render(rect.size), rect)
+
+    def _compose(self, width, height):
+        c = self.corner
+        if width < 2 * c + 1 or height < 2 * c + 1:
+            return pygame.transform.smoothscale(self.sprite, (width, height))
+
+        sprite = self.sprite
+        s = sprite.get_width()
+        inner_w, inner_h = width - 2 * c, height - 2 * c
+        out = pygame.Surface((width, height), pygame.SRCALPHA)
+
+        # Corners
+        out.blit(sprite, (0, 0), (0, 0, c, c))
+        out.blit(sprite, (width - c, 0), (s - c, 0, c, c))
+        out.blit(sprite, (0, height - c), (0, s - c, c, c))
+        out.blit(sprite, (width - c, height - c), (s - c, s - c, c, c))
+
+        # Edges, stretched from the one-pixel strips between the corners
+        out.blit(pygame.transform.scale(sprite.subsurface((c, 0, 1, c)), (inner_w, c)), (c, 0))
+        out.blit(pygame.transform.scale(sprite.subsurface((c, s - c, 1, c)), (inner_w, c)), (c, height - c))
+        out.blit(pygame.transform.scale(sprite.subsurface((0, c, c, 1)), (c, inner_h)), (0, c))
+        out.blit(pygame.transform.scale(sprite.subsurface((s - c, c, c, 1)), (c, inner_h)), (width - c, c))
+
+        # Center
+        out.fill(self.fill, (c, c, inner_w, inner_h))
+        return out
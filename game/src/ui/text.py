@@ -0,0 +1,93 @@
+import threading
+import pygame
+from collections import OrderedDict
+
+_fonts = {}
+_fonts_lock = threading.Lock()
+
+
+def get_font(face, size):
+    """Returns the shared Font for (face, size), opening the file only once."""
+    key = (face, size)
+    font = _fonts.get(key)
+    if font is None:
+        with _fonts_lock:
+            font = _fonts.get(key)
+            if font is None:
+                font = _fonts[key] = pygame.font.Font(face, size)
+    return font
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces, bounded by entry count and pixel bytes.
+
+    Cached surfaces are shared between callers and must not be drawn on.
+    A lock makes it safe to render from the preloader thread while the
+    main thread draws.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._surfaces = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, text, face, size, color, antialias=True):
+        """Returns the rendered surface for text, rendering it on a miss."""
+        with self._lock:
+            return self._render(text, face, size, color, antialias)
+
+    def _render(self, text, face, size, color, antialias):
+        key = (text, face, size, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = get_font(face, size).render(text, antialias, color)
+        self._surfaces[key] = surface
+        self.bytes += _size_of(surface)
+        while len(self._surfaces) > self.max_entries or (self.bytes > self.max_bytes and len(self._surfaces) > 1):
+            _, evicted = self._surfaces.popitem(last=False)
+            self.bytes -= _size_of(evicted)
+            self.evictions += 1
+        return surface
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._surfaces),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._surfaces.clear()
+            self.bytes = 0
+
+
+def _size_of(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+_cache = TextCache()
+
+
+def render_text(text, size, color, face=None, antialias=True):
+    """Renders text through the process-wide cache; face None is pygame's default font."""
+    return _cache.render(text, face, size, color, antialias)
+
+
+def text_cache():
+    """Returns the process-wide text cache (for stats and tuning)."""
+    return _cache
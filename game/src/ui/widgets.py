@@ -0,0 +1,10 @@
+import pygame
+
+WHITE = (255, 255, 255)
+
+
+def draw_status_bar(surface, x, y, value, max_value, color):
+    """Draws a status bar representing a value out of a maximum."""
+    pygame.draw.rect(surface, color, (x, y, 200, 20))
+    pygame.draw.rect(surface, WHITE, (x, y, 200 * (1 - value / max_value), 20))
+
@@ -1,31 +1,72 @@
-import pygame
 import json
+import os
 from enum import Enum
 
-WHITE = (255, 255, 255)
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _game_path(*parts):
+    return os.path.join(GAME_DIR, *parts)
 
 
 class DataPath(Enum):
-    PLAYER = "../data/player.json"
-    ASSETS = "../data/assets.json"
-    LIABILITIES = "../data/liabilities.json"
-    EDUCATION = "../data/education.json"
-    OCCUPATIONS = "../data/occupations.json"
-    EVENTS = "../data/events.json"
-    INVESTMENTS = "../data/investments.json"
-    FONT_VIRGIL = "../assets/fonts/Virgil-GS-Regular.ttf"
+    """Game files, as absolute paths, so the game runs from any working directory."""
+    PLAYER = _game_path("data", "player.json")
+    PLAYER_JOURNAL = _game_path("data", "player.journal")
+    PLAYERS_DB = _game_path("data", "players.db")
+    ASSETS = _game_path("data", "assets.json")
+    LIABILITIES = _game_path("data", "liabilities.json")
+    EDUCATION = _game_path("data", "education.json")
+    OCCUPATIONS = _game_path("data", "occupations.json")
+    EVENTS = _game_path("data", "events.json")
+    INVESTMENTS = _game_path("data", "investments.json")
+    PACK = _game_path("data", "catalog.pack")
+    LOGO = _game_path("assets", "logo.png")
+    FONT_VIRGIL = _game_path("assets", "fonts", "Virgil-GS-Regular.ttf")
+    PROFILES = _game_path("profiles")
+
+
+# Parsed files by path: ((mtime_ns, size), content).
+_json_cache = {}
 
 
 def load_json(path: DataPath):
+    """Loads a game data file, or None if it cannot be read or parsed.
+
+    Parsed content is cached and shared between callers, so treat it as
+    read-only. A repeat load costs one stat call: the file is parsed again
+    only when its modification time or size changed. Catalog files come
+    from the prebuilt data pack while it is current.
+    """
     p = path.value
+    cached = _json_cache.get(p)
     try:
-        with open(p, "r") as file:
-            content = json.load(file)
-        return content
-    except:
-        print(f"Error loading {p}")
+        stat = os.stat(p)
+        version = (stat.st_mtime_ns, stat.st_size)
+    except OSError as e:
+        version = None
+        if cached is None or cached[0] is not None:
+            print(f"Error loading {p}: {e.strerror}")
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    if version is None:
+        _json_cache[p] = (None, None)
         return None
 
+    import datapack  # datapack imports DataPath from here
+    pack = datapack.get_pack() if isinstance(path, DataPath) and path.name in datapack.DOCUMENTS else None
+    try:
+        if pack is not None:
+            content = pack.document(path.name)
+        else:
+            with open(p, "r") as file:
+                content = json.load(file)
+    except (OSError, ValueError) as e:
+        print(f"Error loading {p}: {e}")
+        content = None  # cached too, so a broken file is reported once per change
+    _json_cache[p] = (version, content)
+    return content
+
 
 # TODO - set output to UI instead of console
 def prompt_user(prompt: str, options: list, input_message: str = "Enter the number of your choice: "):
@@ -56,25 +97,3 @@ def prompt_user(prompt: str, options: list, input_message: str = "Enter the numb
     
     choice = int(choice) - 1
     return options[choice]
-
-
-def draw_status_bar(surface, x, y, value, max_value, color):
-    """Draws a status bar representing a value out of a maximum."""
-    pygame.draw.rect(surface, color, (x, y, 200, 20))
-    pygame.draw.rect(surface, WHITE, (x, y, 200 * (1 - value / max_value), 20))
-
-
-def draw_button(button_font_size: int, win: pygame.surface.Surface, width: int, height: int, button_color, left: int, top: int):
-    button_font = pygame.font.Font(None, button_font_size)
-    button_text = button_font.render("Play Now", True, (255, 255, 255))  
-    
-  
-    button_rect = pygame.Rect(width // 2 - 100, height // 2 + 90, 200, 60)
-    
-   
-    pygame.draw.rect(win, button_color, button_rect)  
-    
-    
-    win.blit(button_text, (button_rect.x + (button_rect.width - button_text.get_width()) // 2, 
-                           button_rect.y + (button_rect.height - button_text.get_height()) // 2))
-    
\ No newline at end of file
@@ -0,0 +1,82 @@
+import os
+import shutil
+import sys
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import pytest
+
+import player as player_module
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path):
+    """Every test saves to its own player database, never game/data/players.db."""
+    store = player_module.use_store(str(tmp_path / "players.db"))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def win():
+    """A small window on the dummy video driver, which the event queue needs."""
+    import pygame
+    pygame.display.init()
+    yield pygame.display.set_mode((64, 64))
+    pygame.display.quit()
+
+
+@pytest.fixture
+def catalog():
+    from catalog import get_catalog
+    return get_catalog()
+
+
+@pytest.fixture
+def make_player(catalog):
+    """Builds a saved player mid-career, with holdings, an investment and a loan that vary with seed."""
+    from loans import take_loan
+    from portfolio import Portfolio
+
+    def make(seed, name="Test"):
+        player = player_module.create_player(name)
+        player["seed"] = seed
+        player["skills"]["education"] = "University/College" if seed % 2 else "High School"
+        jobs = catalog.occupations_for(player["skills"]["education"])
+        job = jobs[seed % len(jobs)]
+        player["occupation"] = job["id"]
+        player["income"] = float(job["Income"]["Starting"])
+        portfolio = Portfolio.of(player)
+        for asset in catalog.assets[:2]:
+            portfolio.buy_asset(asset, player["age"])
+        investment = catalog.investments[seed % len(catalog.investments)]
+        portfolio.buy_investment(investment, player["age"], catalog.investment_payout(investment))
+        take_loan(player, catalog.liabilities[seed % len(catalog.liabilities)])
+        return player
+    return make
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """A copy of the catalog files standing in for game/data, with no pack and nothing loaded from it yet."""
+    import catalog
+    import datapack
+    import utils
+    from utils import DataPath
+
+    directory = tmp_path / "data"
+    directory.mkdir()
+    for name in datapack.DOCUMENTS:
+        path = directory / os.path.basename(DataPath[name].value)
+        shutil.copyfile(DataPath[name].value, path)
+        monkeypatch.setattr(DataPath[name], "_value_", str(path))
+    monkeypatch.setattr(DataPath.PACK, "_value_", str(directory / "catalog.pack"))
+    monkeypatch.setattr(utils, "_json_cache", {})
+    monkeypatch.setattr(datapack, "_pack", None)
+    monkeypatch.setattr(datapack, "_failed", None)
+    monkeypatch.setattr(catalog, "_catalog", None)
+    monkeypatch.setattr(catalog, "_listeners", [])
+    monkeypatch.setattr(catalog, "_rejected", None)
+    return directory
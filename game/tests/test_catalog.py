@@ -0,0 +1,49 @@
+import json
+import os
+
+from catalog import get_catalog, on_reload, reload_catalog
+from utils import DataPath, load_json
+
+
+def rewrite(path, change, at):
+    """Rewrites a JSON data file through change(content), with mtime at."""
+    with open(path) as file:
+        content = json.load(file)
+    change(content)
+    with open(path, "w") as file:
+        json.dump(content, file)
+    os.utime(path, (at, at))
+
+
+def test_load_json_parses_again_only_after_a_change(data_dir):
+    events = load_json(DataPath.EVENTS)
+    assert load_json(DataPath.EVENTS) is events
+    rewrite(DataPath.EVENTS.value, lambda content: content.pop(), os.path.getmtime(DataPath.EVENTS.value) + 10)
+    changed = load_json(DataPath.EVENTS)
+    assert len(changed) == len(events) - 1
+    assert load_json(DataPath.EVENTS) is changed
+
+
+def test_invalid_edit_keeps_the_running_catalog(data_dir, capsys):
+    catalog = get_catalog()
+    reloads = []
+    on_reload(reloads.append)
+    assert reload_catalog() is None
+    later = os.path.getmtime(DataPath.EVENTS.value) + 10
+
+    def break_first(events):
+        events[0]["probability"] = 2
+    rewrite(DataPath.EVENTS.value, break_first, later)
+    assert reload_catalog() is None
+    assert "Game data not reloaded" in capsys.readouterr().out
+    assert reload_catalog() is None  # reported once
+    assert capsys.readouterr().out == ""
+    assert get_catalog() is catalog and reloads == []
+
+    def fix_first(events):
+        events[0]["probability"] = 0.5
+    rewrite(DataPath.EVENTS.value, fix_first, later + 10)
+    reloaded = reload_catalog()
+    assert reloaded is not None and reloaded is not catalog
+    assert get_catalog() is reloaded and reloads == [reloaded]
+    assert reloaded.events[0]["probability"] == 0.5
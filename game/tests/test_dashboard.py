@@ -0,0 +1,25 @@
+import logging
+from types import SimpleNamespace
+
+import pygame
+
+import player as player_module
+from ui import dashboard
+from ui.dashboard import DashboardScene
+
+
+def test_f4_starts_and_stops_a_capture(tmp_path, monkeypatch, caplog):
+    profiles = tmp_path / "profiles"
+    monkeypatch.setattr(dashboard, "DataPath", SimpleNamespace(PROFILES=SimpleNamespace(value=str(profiles))))
+    scene = DashboardScene(800, 600, (0, 0, 0), player_module.create_player("Capture"))
+    f4 = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F4)
+
+    scene.handle_event(f4)
+    assert scene.profiler.capturing
+    with caplog.at_level(logging.INFO, logger="ui.dashboard"):
+        scene.handle_event(f4)
+    assert not scene.profiler.capturing
+    assert scene.message == "Profile saved!"
+    written = sorted(path.suffix for path in profiles.iterdir())
+    assert written == [".json", ".prof", ".txt"]
+    assert str(profiles) in caplog.text
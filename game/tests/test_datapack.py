@@ -0,0 +1,61 @@
+import json
+import os
+
+import numpy as np
+
+import datapack
+from catalog import Catalog
+from utils import DataPath, load_json
+
+
+def edit(path, change):
+    """Rewrites a JSON data file through change(content), with an mtime after the pack's."""
+    with open(path) as file:
+        content = json.load(file)
+    change(content)
+    with open(path, "w") as file:
+        json.dump(content, file)
+    later = os.path.getmtime(DataPath.PACK.value) + 10
+    os.utime(path, (later, later))
+
+
+def test_pack_round_trips_the_json(data_dir):
+    datapack.build()
+    pack = datapack.get_pack()
+    assert pack is not None
+    tables = datapack.build_tables({name.lower(): load_json(DataPath[name]) for name in datapack.DOCUMENTS})
+    for name in datapack.DOCUMENTS:
+        with open(DataPath[name].value) as file:
+            assert pack.document(name) == json.load(file)
+        table = name.lower()
+        assert pack.tables[table].dtype == tables[table].dtype
+        np.testing.assert_array_equal(pack.tables[table], tables[table])
+
+    catalog = Catalog.load()
+    assert catalog.tables is pack.tables
+    assert catalog.events == pack.document("EVENTS")
+
+
+def test_stale_pack_falls_back_to_json(data_dir):
+    datapack.build()
+    first = load_json(DataPath.EVENTS)
+    assert datapack.get_pack() is not None
+
+    def double_first_probability(events):
+        events[0]["probability"] *= 2
+    edit(DataPath.EVENTS.value, double_first_probability)
+    assert datapack.get_pack() is None
+    events = load_json(DataPath.EVENTS)
+    assert events[0]["probability"] == 2 * first[0]["probability"]
+
+    catalog = Catalog.load()
+    assert catalog.tables["events"]["probability"][0] == events[0]["probability"]
+
+
+def test_unreadable_pack_is_ignored(data_dir, capsys):
+    with open(DataPath.PACK.value, "wb") as file:
+        file.write(b"NOPE" + b"\0" * 64)
+    assert datapack.get_pack() is None
+    assert "Ignoring data pack" in capsys.readouterr().out
+    with open(DataPath.EDUCATION.value) as file:
+        assert load_json(DataPath.EDUCATION) == json.load(file)
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from event_table import EventTable
+
+EVENTS = [
+    {"id": "a", "age_range": [16, 30], "probability": 0.2, "impact": {"bank": -100}},
+    {"id": "b", "age_range": [20, 40], "probability": 0.5, "impact": {"bank": 50, "health": -5}},
+    {"id": "c", "age_range": [25, 25], "probability": 1.0, "impact": {"happiness": 10}},
+    {"id": "d", "age_range": [35, 60], "probability": 0.1, "impact": {"bank": 7}},
+]
+
+
+def first_match(events, age, rolls):
+    """The game's rule: try events in file order, the first whose roll succeeds fires."""
+    for event, roll in zip(events, rolls):
+        if event["age_range"][0] <= age <= event["age_range"][1] and roll < event["probability"]:
+            return event["id"]
+    return None
+
+
+@pytest.fixture
+def table():
+    return EventTable(EVENTS)
+
+
+@pytest.mark.parametrize("age", [10, 16, 22, 25, 38, 61])
+def test_probabilities_follow_first_match(table, age):
+    indices, chance = table.probabilities(age)
+    expected, left = {}, 1.0
+    for event in EVENTS:
+        if event["age_range"][0] <= age <= event["age_range"][1]:
+            expected[event["id"]] = left * event["probability"]
+            left *= 1 - event["probability"]
+    assert [EVENTS[i]["id"] for i in indices] == list(expected)
+    np.testing.assert_allclose(chance, list(expected.values()))
+
+
+@pytest.mark.parametrize("age", [16, 22, 25, 38])
+def test_one_draw_samples_like_separate_rolls(table, age):
+    rng = np.random.default_rng(age)
+    n = 200_000
+    counts = {}
+    for u in rng.random(n // 4):
+        event = table.sample(age, u)
+        key = None if event is None else event["id"]
+        counts[key] = counts.get(key, 0) + 1
+    rolled = {}
+    for rolls in rng.random((n // 4, len(EVENTS))):
+        key = first_match(EVENTS, age, rolls)
+        rolled[key] = rolled.get(key, 0) + 1
+    assert set(counts) == set(rolled)
+    for key in counts:
+        assert counts[key] / (n // 4) == pytest.approx(rolled[key] / (n // 4), abs=0.01)
+
+
+def test_sample_many_agrees_with_sample(table):
+    rng = np.random.default_rng(0)
+    ages = rng.integers(10, 65, size=5000)
+    u = rng.random(5000)
+    fired = table.sample_many(ages, u)
+    for age, draw, index in zip(ages.tolist(), u.tolist(), fired.tolist()):
+        event = table.sample(age, draw)
+        assert (event is None and index == -1) or event is EVENTS[index]
+
+
+def test_impact_matrix(table):
+    impact = table.impact_matrix(("bank", "health", "happiness"))
+    np.testing.assert_array_equal(impact[[0, 1, 2, 3, -1]], [[-100, 0, 0], [50, -5, 0], [0, 0, 10], [7, 0, 0], [0, 0, 0]])
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from loans import MONTHS, Schedule, payoff_months, year_service
+
+LOANS = [
+    (20000.0, 0.05, 400.0),
+    (20000.0, 0.0, 700.0),   # interest free
+    (1000.0, 0.24, 1000.0),  # repaid in the second month
+    (5000.0, 0.12, 50.0),    # payment never covers the interest
+    (250000.0, 0.065, 1580.17),
+]
+
+
+def month_loop(principal, rate, payment, years):
+    """The amortization the closed forms replace: (paid, interest, closing balance) per year."""
+    balance, rows = principal, []
+    for _ in range(years):
+        paid = interest = 0.0
+        for _ in range(MONTHS):
+            if balance <= 0:
+                break
+            charge = balance * rate / MONTHS
+            amount = min(payment, balance + charge)
+            balance += charge - amount
+            paid += amount
+            interest += charge
+        rows.append((paid, interest, balance))
+    return np.array(rows)
+
+
+@pytest.mark.parametrize("principal, rate, payment", LOANS)
+def test_year_service_matches_month_loop(principal, rate, payment):
+    years = 40
+    expected = month_loop(principal, rate, payment, years)
+    paid, interest, balance = year_service(principal, rate, payment, np.arange(years))
+    np.testing.assert_allclose(paid, expected[:, 0], rtol=1e-9, atol=1e-6)
+    np.testing.assert_allclose(interest, expected[:, 1], rtol=1e-9, atol=1e-6)
+    np.testing.assert_allclose(balance, expected[:, 2], rtol=1e-9, atol=1e-6)
+
+
+@pytest.mark.parametrize("principal, rate, payment", LOANS)
+def test_schedule_years_and_totals(principal, rate, payment):
+    schedule = Schedule(principal, rate, payment)
+    if np.isinf(payoff_months(principal, rate, payment)):
+        assert schedule.years is None
+        return
+    expected = month_loop(principal, rate, payment, schedule.years + 1)
+    assert expected[-2, 0] > 0 and expected[-1, 0] == 0
+    assert schedule.total_interest() == pytest.approx(expected[:, 1].sum(), rel=1e-9)
+    assert schedule.year(schedule.years) == (0.0, 0.0, pytest.approx(0.0, abs=1e-6))
+    assert schedule.year(-1) == (0.0, 0.0, principal)
+
+
+def test_year_service_before_the_loan_is_taken():
+    paid, interest, balance = year_service(1000.0, 0.05, 100.0, -3)
+    assert (float(paid), float(interest), float(balance)) == (0.0, 0.0, 1000.0)
@@ -0,0 +1,169 @@
+import copy
+import json
+import sqlite3
+
+import numpy as np
+import pytest
+
+import player as player_module
+from handle import fast_forward, handle_turn
+from history import History
+from model import MAGIC_V1, Player
+from persistence import SaveJournal, apply_delta, diff_player
+from store import PlayerStore
+
+
+def reload(store, player_id):
+    """The player as a fresh process would load it from store's database."""
+    store.flush()
+    other = PlayerStore(store.path)
+    try:
+        return other.load(player_id)
+    finally:
+        other.close()
+
+
+def test_diff_and_apply_round_trip():
+    old = {"age": 20, "bank": 5.0, "skills": {"education": "High School"}, "gone": 1}
+    new = {"age": 21, "bank": 5.0, "skills": {"education": "Bootcamp"}, "added": [1, 2]}
+    delta = diff_player(old, new)
+    assert "bank" not in delta
+    assert apply_delta(copy.deepcopy(old), delta) == new
+
+
+def test_journal_replays_after_the_snapshot(tmp_path):
+    snapshot, journal = str(tmp_path / "player.json"), str(tmp_path / "player.journal")
+    saves = SaveJournal(snapshot, journal, compact_every=4)
+    player = {"player_id": "p", "age": 16, "bank": 0.0}
+    for year in range(10):  # two compactions, then two journal entries
+        player["age"] += 1
+        player["bank"] += 100.0 * year
+        saves.record(player)
+        saves.flush()
+    saves.close()
+    with open(journal) as file:
+        assert len(file.readlines()) == 2
+
+    with open(journal, "a") as file:
+        file.write('{"seq": 11, "delta": {"age"')  # torn by a crash mid-append
+    reloaded = SaveJournal(snapshot, journal)
+    assert reloaded.load() == player
+    reloaded.close()
+
+
+def test_failed_commit_rewrites_the_player(tmp_path, monkeypatch):
+    store = PlayerStore(str(tmp_path / "flaky.db"))
+    commit = store.commit
+    calls = []
+
+    def flaky(records):
+        calls.append(len(records))
+        if len(calls) == 2:
+            raise OSError("disk full")
+        commit(records)
+    monkeypatch.setattr(store, "commit", flaky)
+
+    player = {"player_id": "p", "name": "P", "age": 16, "bank": 1.0, "income": 5.0}
+    store.record(player, new=True)
+    store.flush()
+    player.update(bank=2.0, income=7.0)
+    store.record(player)  # lost
+    store.flush()
+    player.update(age=17)
+    store.record(player)
+    store.flush()
+    assert reload(store, "p") == player
+    store.close()
+
+
+def test_store_compacts_and_reloads(tmp_path):
+    store = PlayerStore(str(tmp_path / "compact.db"), compact_every=8)
+    player = {"player_id": "p", "name": "P", "age": 16, "bank": 0.0, "history": []}
+    for year in range(30):
+        player["age"] += 1
+        player["bank"] += 10.0 * year
+        player["history"] = player["history"] + [player["bank"]]
+        store.record(player)
+        store.flush()
+
+    conn = sqlite3.connect(store.path)
+    snapshot_seq, = conn.execute("SELECT seq FROM players WHERE player_id = 'p'").fetchone()
+    pending, = conn.execute("SELECT COUNT(*) FROM journal WHERE player_id = 'p'").fetchone()
+    conn.close()
+    assert snapshot_seq == 24 and pending == 6
+    assert reload(store, "p") == player
+    store.close()
+
+
+def test_history_appends_reload(store, catalog):
+    player = player_module.create_player("History")
+    for year in range(150):  # past the ring buffer's capacity
+        handle_turn(player, catalog)
+        if year % 37 == 0:
+            fast_forward(player, 5, catalog)
+    store.flush()
+
+    conn = sqlite3.connect(store.path)
+    deltas = [delta for delta, in conn.execute("SELECT delta FROM journal ORDER BY seq DESC LIMIT 3")]
+    conn.close()
+    assert all('"$append"' in delta and len(delta) < 400 for delta in deltas)
+
+    loaded = Player.from_dict(reload(store, player["player_id"]))
+    assert len(loaded["history"]) == loaded["history"].capacity
+    assert loaded["history"] == player["history"]
+
+    for _ in range(10):
+        handle_turn(player, catalog)
+    assert Player.from_dict(reload(store, player["player_id"]))["history"] == player["history"]
+
+
+def test_first_save_after_a_load_is_a_delta(store, catalog, make_player):
+    player = make_player(2)
+    for _ in range(3):
+        handle_turn(player, catalog)
+    store.flush()
+    store.forget(player["player_id"])
+
+    loaded = player_module.load_player(player["player_id"])
+    handle_turn(loaded, catalog)
+    store.flush()
+    conn = sqlite3.connect(store.path)
+    delta, = conn.execute("SELECT delta FROM journal ORDER BY seq DESC LIMIT 1").fetchone()
+    conn.close()
+    delta = json.loads(delta)
+    assert "history" not in delta and list(delta["$append"]) == ["history"]
+    assert "skills" not in delta and "liabilities" not in delta
+    assert reload(store, player["player_id"]) == loaded.to_dict()
+
+
+def test_history_ring_buffer():
+    history = History(capacity=4)
+    for year in range(6):
+        history.append(np.full(6, year))
+    assert len(history) == 4 and history.total == 6
+    assert history.column("age").tolist() == [2, 3, 4, 5]
+    history.extend(np.arange(10 * 6).reshape(10, 6))
+    assert history.total == 16 and history.column("age").tolist() == [36, 42, 48, 54]
+    assert History.from_bytes(history.to_bytes()) == history
+    assert History.from_json(history.to_json()) == history
+    assert len(History.from_json(None)) == 0
+
+
+def test_player_bytes_round_trip_and_flp1(make_player, catalog):
+    player = make_player(3)
+    for _ in range(5):
+        handle_turn(player, catalog)
+    encoded = player.to_bytes()
+    assert Player.from_bytes(encoded).to_dict() == player.to_dict()
+
+    # An FLP1 player is the same encoding without the history section.
+    history = player["history"].to_bytes()
+    section = len(history).to_bytes(4, "little") + history
+    start = encoded.index(section)
+    old = MAGIC_V1 + encoded[4:start] + encoded[start + len(section):]
+    decoded = Player.from_bytes(old)
+    assert len(decoded["history"]) == 0
+    assert decoded.to_dict() == {**player.to_dict(), "history": History().to_json()}
+
+    with pytest.raises(ValueError):
+        Player.from_bytes(b"NOPE" + encoded[4:])
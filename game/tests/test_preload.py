@@ -0,0 +1,38 @@
+import pygame
+import pytest
+
+from preload import PRELOAD_DONE, Preloader
+
+
+def done_events():
+    return [event.task for event in pygame.event.get(PRELOAD_DONE)]
+
+
+def test_runs_tasks_in_order_and_posts_each(win):
+    ran = []
+
+    def task(name):
+        def run():
+            ran.append(name)
+            return name.upper()
+        return name, run
+
+    pygame.event.clear()
+    preloader = Preloader([task("fonts"), task("catalog"), task("skins")]).start()
+    assert preloader.wait() == {"fonts": "FONTS", "catalog": "CATALOG", "skins": "SKINS"}
+    assert ran == ["fonts", "catalog", "skins"]
+    assert preloader.get("catalog") == "CATALOG" and preloader.get("missing", 0) == 0
+    assert done_events() == ["fonts", "catalog", "skins"]
+
+
+def test_failed_task_skips_the_rest_and_raises_on_wait(win):
+    def broken():
+        raise ValueError("bad game data")
+    ran = []
+
+    pygame.event.clear()
+    preloader = Preloader([("fonts", lambda: 1), ("catalog", broken), ("skins", lambda: ran.append(1))]).start()
+    with pytest.raises(ValueError, match="bad game data"):
+        preloader.wait()
+    assert ran == [] and preloader.results == {"fonts": 1}
+    assert done_events() == ["fonts", "catalog"]  # the failed task still wakes the title screen
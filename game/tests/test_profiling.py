@@ -0,0 +1,27 @@
+import json
+import threading
+
+from profiling import Profiler
+
+
+def test_counts_from_other_threads_while_exporting(tmp_path):
+    profiler = Profiler()
+
+    def work():
+        for _ in range(20000):
+            profiler.count("save.records")
+            profiler.record(f"op{threading.get_ident() % 7}", 0.001)
+    workers = [threading.Thread(target=work) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    while any(worker.is_alive() for worker in workers):
+        profiler.export(str(tmp_path / "trace.json"))
+        profiler.export(str(tmp_path / "trace.csv"))
+        profiler.counts()
+    for worker in workers:
+        worker.join()
+
+    assert profiler.counts() == {"save.records": 80000}
+    assert sum(row["count"] for row in profiler.stats().values()) == 80000
+    with open(profiler.export(str(tmp_path / "trace.json"))) as file:
+        assert json.load(file)["counters"] == {"save.records": 80000}
@@ -0,0 +1,54 @@
+import pygame
+
+from ui.scenes import Scene, SceneManager
+
+SWITCH = pygame.event.custom_type()
+PING = pygame.event.custom_type()
+
+
+class Recorder(Scene):
+    def __init__(self, next_scene=None):
+        self.next_scene = next_scene
+        self.entered = 0
+        self.events = []
+        self.updates = 0
+
+    def enter(self, win):
+        self.entered += 1
+
+    def handle_event(self, event):
+        self.events.append(event.type)
+        return self.next_scene if event.type == SWITCH else None
+
+    def update(self, win):
+        self.updates += 1
+        return [pygame.Rect(0, 0, 8, 8)]
+
+
+def test_switches_scene_mid_batch_and_stops_on_quit(win):
+    second = Recorder()
+    first = Recorder(next_scene=second)
+    pygame.event.clear()
+    for kind in (SWITCH, PING, pygame.QUIT, PING):
+        pygame.event.post(pygame.event.Event(kind))
+
+    SceneManager(win).run(first)
+    assert first.entered == 1 and first.events == [SWITCH]
+    assert second.entered == 1 and second.events == [PING]  # the rest of the batch, up to QUIT
+    assert first.updates == second.updates == 0
+
+
+def test_idle_scene_wakes_every_wake_ms(win):
+    class Ticker(Recorder):
+        wake_ms = 5
+
+        def update(self, win):
+            super().update(win)
+            if self.updates == 3:
+                pygame.event.post(pygame.event.Event(pygame.QUIT))
+            return []
+
+    scene = Ticker()
+    pygame.event.clear()
+    SceneManager(win).run(scene)
+    assert scene.updates == 3 and scene.events == []
@@ -0,0 +1,134 @@
+import asyncio
+import threading
+
+import pytest
+
+from client import GameClient, ServerError
+from phases import INVESTMENT_AGE
+from server import GameServer
+
+
+@pytest.fixture(params=[0.0, 0.002], ids=["unbatched", "batched"])
+def server(request):
+    """A GameServer on a free port of 127.0.0.1, running on its own event loop thread."""
+    loop = asyncio.new_event_loop()
+    game = GameServer(max_sessions=2, batch_window=request.param)
+    listener = loop.run_until_complete(game.start("127.0.0.1", 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    game.port = listener.sockets[0].getsockname()[1]
+    yield game
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    listener.close()
+    loop.run_until_complete(listener.wait_closed())
+    loop.close()
+
+
+@pytest.fixture
+def client(server):
+    with GameClient("127.0.0.1", server.port) as client:
+        yield client
+
+
+def play_decisions(client, player_id):
+    """Plays on, taking the first option of every decision, until none are left to make."""
+    result = client.state(player_id)
+    while result["decision"] is not None or result["player"]["age"] < INVESTMENT_AGE:
+        if result["decision"] is None:
+            result = client.turn(player_id)
+        else:
+            result = client.decide(player_id, result["decision"]["options"][0])
+    return result
+
+
+def test_ping_and_errors(client):
+    assert client.call("ping") == "pong"
+    with pytest.raises(ServerError, match="Unknown op"):
+        client.call("fly")
+    with pytest.raises(ServerError, match="No player"):
+        client.state("nobody")
+    with pytest.raises(ServerError, match="Bad arguments"):
+        client.call("state")
+    with pytest.raises(ServerError, match="years"):
+        client.turn(client.create("Ada")["player"]["player_id"], years=0)
+
+
+def test_bad_lines_get_error_responses(server):
+    with GameClient("127.0.0.1", server.port) as client:
+        client._file.write(b"not json\n[1]\n")
+        client._file.flush()
+        assert client._file.readline() == b'{"id":null,"ok":false,"error":"Request is not valid JSON"}\n'
+        assert b"must be an object" in client._file.readline()
+        assert client.call("ping") == "pong"
+
+
+def test_create_decide_turn(client):
+    result = client.create("Ada")
+    player_id = result["player"]["player_id"]
+    assert result["player"]["name"] == "Ada"
+    result = client.turn(player_id, years=10)
+    assert result["decision"]["kind"] == "education"
+    with pytest.raises(ServerError, match="Decide first"):
+        client.turn(player_id)
+
+    result = play_decisions(client, player_id)
+    age = result["player"]["age"]
+    result = client.turn(player_id, years=3)
+    assert result["player"]["age"] == age + 3
+    assert len(result["player"]["history"]["rows"]) == result["player"]["age"] - 16
+
+    ahead = client.preview(player_id, 5)
+    assert ahead["player"]["age"] == age + 8
+    assert client.state(player_id)["player"]["age"] == age + 3
+    assert client.call("stats")["counters"]["turns"] >= age + 3 - 16
+
+
+def test_sessions_are_isolated(server):
+    with GameClient("127.0.0.1", server.port) as first, GameClient("127.0.0.1", server.port) as second:
+        a = first.create("Ada")["player"]["player_id"]
+        b = second.create("Bob")["player"]["player_id"]
+        play_decisions(first, a)
+        before = second.state(b)["player"]
+        first.turn(a, years=5)
+        assert second.state(b)["player"] == before
+        assert first.state(a)["player"]["name"] == "Ada"
+
+
+def test_dropped_session_reloads_from_save(server, client, store):
+    ids = [client.create(name)["player"]["player_id"] for name in ("Ada", "Bob", "Cy")]
+    assert ids[0] not in server.sessions
+    assert ids[0] not in store._last
+
+    result = play_decisions(client, ids[0])
+    client.turn(ids[0], years=2)
+    assert client.close_session(ids[0]) is True
+    assert ids[0] not in store._last
+    assert client.load(ids[0])["player"]["age"] == result["player"]["age"] + 2
+
+    listed = {row["player_id"]: row["name"] for row in client.list_players()}
+    assert listed == dict(zip(ids, ("Ada", "Bob", "Cy")))
+
+
+def test_failed_turn_changes_nothing_and_spares_the_batch(server):
+    with GameClient("127.0.0.1", server.port) as first, GameClient("127.0.0.1", server.port) as second:
+        a = first.create("Ada")["player"]["player_id"]
+        b = second.create("Bob")["player"]["player_id"]
+        server.sessions[a]["income"] = "lots"
+        ages = {a: server.sessions[a]["age"], b: server.sessions[b]["age"]}
+
+        errors = []
+
+        def turn_a():
+            try:
+                first.turn(a)
+            except ServerError as e:
+                errors.append(e)
+        thread = threading.Thread(target=turn_a)
+        thread.start()
+        assert second.turn(b)["player"]["age"] == ages[b] + 1
+        thread.join()
+
+        assert len(errors) == 1
+        assert server.sessions[a]["age"] == ages[a]
+        assert len(server.sessions[a]["history"]) == 0
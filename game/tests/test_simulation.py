@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from portfolio import Portfolio
+from simulate import simulate
+from simulation import Policy, PlayerBatch, grow, raise_income, income_path
+
+
+@pytest.mark.parametrize("income, rate, cap", [(20000.0, 0.05, 25000.0), (30000.0, 0.1, np.inf),
+                                               (50000.0, 0.0, 60000.0), (70000.0, 0.03, 60000.0)])
+def test_income_path_matches_yearly_raises(income, rate, cap):
+    path = income_path(income, rate, cap, 12)
+    for year in range(12):
+        income = raise_income(income, rate, cap)
+        assert path[year] == pytest.approx(income, rel=1e-12)
+
+
+def test_batch_pays_out_matured_investments(catalog, make_player):
+    player = make_player(0)  # the first catalog investment
+    player["liabilities"].clear()
+    portfolio = Portfolio.of(player)
+    matures, payout = int(portfolio.matures[-1]), float(portfolio.payout[-1])
+    kept = portfolio.ids[:-1]
+    batch = PlayerBatch.from_players([player], catalog)
+    batch.income[:] = 0.0
+    market = np.random.default_rng(0)
+
+    while batch.age[0] < matures:
+        bank = float(batch.bank[0])
+        grow(batch, market)
+    assert batch.bank[0] - bank == payout
+    assert batch.asset_value[0, -1] == 0.0 and batch.asset_matures[0, -1] == -1
+
+    batch.to_players([player])
+    assert Portfolio.of(player).ids == kept
+    assert player["bank"] == batch.bank[0]
+
+
+def test_simulate_gives_the_same_shards_in_any_process_count():
+    serial = list(simulate(Policy(), 600, seed=3, shard_size=50, workers=1, end_age=40))
+    pooled = list(simulate(Policy(), 600, seed=3, shard_size=50, workers=2, end_age=40))
+    assert len(pooled) == 12
+    for a, b in zip(serial, pooled):
+        assert a.keys() == b.keys()
+        for key in a:
+            np.testing.assert_array_equal(a[key], b[key])
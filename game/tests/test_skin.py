@@ -0,0 +1,29 @@
+import pygame
+
+from ui.skin import Skin
+
+FILL = (111, 128, 145)
+BORDER = (0, 0, 0)
+
+
+def test_render_is_sized_and_cached():
+    skin = Skin(FILL, radius=20, border_color=BORDER, border=2, cache_size=2)
+    panel = skin.render((300, 120))
+    assert panel.get_size() == (300, 120)
+    assert skin.render((300.0, 120.0)) is panel
+    assert skin.render((10, 8)).get_size() == (10, 8)  # smaller than the corners: scaled sprite
+
+    assert panel.get_at((150, 60))[:3] == FILL
+    assert panel.get_at((150, 0))[:3] == BORDER and panel.get_at((0, 60))[:3] == BORDER
+    assert panel.get_at((0, 0)).a == 0  # outside the rounded corner
+
+    skin.render((64, 64))
+    assert skin.render((300, 120)) is not panel  # evicted, least recently used first
+
+
+def test_draw_blits_at_rect():
+    skin = Skin(FILL, radius=10)
+    target = pygame.Surface((200, 100))
+    skin.draw(target, pygame.Rect(50, 20, 100, 60))
+    assert target.get_at((100, 50))[:3] == FILL
+    assert target.get_at((10, 10))[:3] == (0, 0, 0)
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from catalog import Catalog
+from simulation import Policy, simulate_shard
+from solver import RetirementSolver
+
+TARGET = 1_500_000
+
+
+@pytest.fixture
+def small_catalog():
+    """Two paths where college, the engineer job and the bond are clearly best, and events that move the bank."""
+    return Catalog(
+        education=[{"id": "High School", "Cost": 0}, {"id": "College", "Cost": 20000}],
+        occupations=[
+            {"id": "High School", "occupations": [
+                {"id": "Clerk", "Income": {"Starting": 40000, "Increase_Rate": 0.0, "Cap": 40000}},
+                {"id": "Intern", "Income": {"Starting": 10000, "Increase_Rate": 0.0, "Cap": 10000}}]},
+            {"id": "College", "occupations": [
+                {"id": "Engineer", "Income": {"Starting": 80000, "Increase_Rate": 0.0, "Cap": 80000}}]},
+        ],
+        events=[{"event_id": "windfall", "impact": {"bank": 50000}, "probability": 0.3, "age_range": [20, 60]},
+                {"event_id": "fine", "impact": {"bank": -10000}, "probability": 0.2, "age_range": [16, 99]}],
+        investments=[{"id": "Bond", "cost": 10000, "return": 30000, "time": 10}],
+        assets=[],
+        liabilities=[],
+    )
+
+
+def test_solver_matches_simulating_its_policy(small_catalog):
+    solution = RetirementSolver(small_catalog, target=TARGET).solve(16, 200.0)
+    assert [(d.age, d.kind, d.choice, d.share) for d in solution.path] == [
+        (18, "education", "College", 1.0),
+        (23, "occupation", "Engineer", 1.0),
+        (35, "investment", "Bond", 1.0),
+    ]
+    assert solution.retire_probability == pytest.approx(1.0)
+
+    # Every state makes the same choices, so a fixed policy run is the solver's policy.
+    lives = simulate_shard(Policy("College", "Engineer", "Bond"), seed=7, shard=0, size=20000,
+                           target=TARGET, catalog=small_catalog)
+    retire_age = np.where(lives["retire_age"] >= 0, lives["retire_age"], 100)
+    assert solution.expected_age == pytest.approx(retire_age.mean(), abs=0.05)
+
+    other = simulate_shard(Policy("High School", "Clerk", "Bond"), seed=7, shard=0, size=20000,
+                           target=TARGET, catalog=small_catalog)
+    assert solution.expected_age < other["retire_age"].mean() - 5
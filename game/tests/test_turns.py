@@ -0,0 +1,58 @@
+import copy
+
+import numpy as np
+import pytest
+
+from handle import fast_forward, handle_turn, handle_turns, preview
+from portfolio import Portfolio
+
+
+def assert_same_player(a, b, rtol=0.0):
+    for key in ("age", "bank", "income", "health", "happiness"):
+        assert a[key] == pytest.approx(b[key], rel=rtol, abs=0.0), key
+    assert Portfolio.of(a).ids == Portfolio.of(b).ids
+    np.testing.assert_allclose(Portfolio.of(a).value, Portfolio.of(b).value, rtol=rtol)
+    np.testing.assert_allclose(a["history"].to_array(), b["history"].to_array(), rtol=rtol)
+
+
+def test_handle_turns_matches_handle_turn(catalog, make_player):
+    players = [make_player(seed) for seed in range(12)]
+    batched = copy.deepcopy(players)
+    for _ in range(45):  # long enough for every catalog investment to mature
+        for player in players:
+            handle_turn(player, catalog)
+        handle_turns(batched, catalog)
+    for player, other in zip(players, batched):
+        assert player.to_dict() == other.to_dict()
+
+
+def test_failed_batch_changes_nobody(catalog, make_player, monkeypatch):
+    players = [make_player(seed) for seed in range(3)]
+    before = copy.deepcopy(players)
+
+    def broken(keys):
+        raise ValueError("broken impacts")
+    monkeypatch.setattr(catalog.event_table, "impact_matrix", broken)
+    with pytest.raises(ValueError):
+        handle_turns(players, catalog)
+    for player, old in zip(players, before):
+        assert player.to_dict() == old.to_dict()
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_fast_forward_matches_turn_loop(catalog, make_player, seed):
+    player = make_player(seed)
+    played, skipped = copy.deepcopy(player), copy.deepcopy(player)
+    for _ in range(60):
+        handle_turn(played, catalog)
+    fast_forward(skipped, 60, catalog)
+    assert_same_player(played, skipped, rtol=1e-9)
+    assert skipped["history"].total == 60
+
+
+def test_preview_leaves_the_player_alone(catalog, make_player):
+    player = make_player(1)
+    before = player.to_dict()
+    ahead = preview(player, 20, catalog)
+    assert ahead["age"] == player["age"] + 20
+    assert player.to_dict() == before